@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Micro-benchmark for feature flag rollout bucketing.
+
+Compares the original per-request md5 hex parsing with ``core.bucketing``
+for a typical request: one user evaluated against every flag.
+
+Usage:
+    python scripts/bench_bucketing.py [--users 1000] [--flags 20]
+"""
+import argparse
+import hashlib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.bucketing import _bucket, clear_bucket_cache  # noqa: E402
+
+
+def legacy_bucket(user_id, flag_name):
+    """Bucketing as previously done inline in core/api.py."""
+    user_hash = hashlib.md5(f"{user_id}{flag_name}".encode()).hexdigest()
+    return int(user_hash[:8], 16) % 100 + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--flags', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    users = [str(user_id) for user_id in range(args.users)]
+    flags = [f'WAGTAIL_FLAG_{index}' for index in range(args.flags)]
+
+    # Both implementations must agree on every bucket
+    for user_id in users:
+        for flag in flags:
+            assert legacy_bucket(user_id, flag) == _bucket.__wrapped__(user_id, flag)
+
+    def run(bucket):
+        for user_id in users:
+            for flag in flags:
+                bucket(user_id, flag)
+
+    def best(statement):
+        return min(timeit.repeat(statement, number=1, repeat=args.repeat))
+
+    legacy = best(lambda: run(legacy_bucket))
+    raw = best(lambda: run(_bucket.__wrapped__))
+    clear_bucket_cache()
+    run(_bucket)
+    cached = best(lambda: run(_bucket))
+
+    requests = len(users)
+    print(f'{requests} requests x {len(flags)} flags')
+    for label, seconds in [
+        ('legacy md5 hexdigest', legacy),
+        ('raw digest bytes', raw),
+        ('raw digest bytes + LRU (warm)', cached),
+    ]:
+        print(
+            f'  {label:<32} {seconds / requests * 1e6:8.2f} us/request '
+            f'({legacy / seconds:5.2f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,10 @@
-"""ASGI config for LaunchLine Starter project."""
+"""ASGI config for LaunchLine Starter project.
+
+The application is served through this module (gunicorn with uvicorn
+workers in the Docker image, ``make runserver`` in development). The feature
+flag event stream (/api/feature-flags/stream/) holds one connection open per
+client and is refused with a 501 under a WSGI server.
+"""
 import os
 
 from django.core.asgi import get_asgi_application
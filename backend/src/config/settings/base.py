@@ -148,6 +148,33 @@ WAGTAIL_CONTENT_LANGUAGES = LANGUAGES = [
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 WAGTAILADMIN_BASE_URL = "http://example.com"
 
+# Seconds pages API responses are cached for anonymous requests; publishing,
+# unpublishing and moving pages invalidates them early (0 disables)
+PAGES_API_CACHE_TIMEOUT = int(os.environ.get("PAGES_API_CACHE_TIMEOUT", 60 * 60 * 24))
+# Rendition of the featured images listed with the posts of a blog index
+PAGES_BLOG_POST_IMAGE_FILTER = os.environ.get("PAGES_BLOG_POST_IMAGE_FILTER", "fill-800x450")
+# Serialized StreamField blocks kept in each worker's memory, and seconds
+# they are kept in the shared cache
+PAGES_BLOCK_CACHE_SIZE = int(os.environ.get("PAGES_BLOCK_CACHE_SIZE", 2048))
+PAGES_BLOCK_CACHE_TIMEOUT = int(os.environ.get("PAGES_BLOCK_CACHE_TIMEOUT", 60 * 60 * 24 * 7))
+
+# Responsive renditions pre-generated for every image by the
+# generate_renditions command: each width in each format ("original" keeps
+# the format of the upload), plus renditions used by name elsewhere
+IMAGE_RENDITION_WIDTHS = [
+    int(width)
+    for width in os.environ.get("IMAGE_RENDITION_WIDTHS", "480,800,1200,1600").split(",")
+]
+IMAGE_RENDITION_FORMATS = os.environ.get(
+    "IMAGE_RENDITION_FORMATS", "original,webp,avif"
+).split(",")
+IMAGE_RENDITION_EXTRA_FILTERS = ["width-1200", PAGES_BLOG_POST_IMAGE_FILTER]
+# Images processed per batch and attempts per image before giving up
+IMAGE_RENDITION_BATCH_SIZE = int(os.environ.get("IMAGE_RENDITION_BATCH_SIZE", 20))
+IMAGE_RENDITION_MAX_ATTEMPTS = int(os.environ.get("IMAGE_RENDITION_MAX_ATTEMPTS", 3))
+# Seconds a worker has to render a claimed batch before other workers retry it
+IMAGE_RENDITION_LEASE = int(os.environ.get("IMAGE_RENDITION_LEASE", 10 * 60))
+
 # Django REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
@@ -159,12 +186,67 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
-        "user": "1000/hour"
+        "user": "1000/hour",
+        "lead_submit": os.environ.get("LEAD_SUBMIT_THROTTLE_RATE", "100/hour"),
     },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
 
+# Feature flags
+# Flag changes bump a shared generation counter that makes every worker
+# rebuild its snapshot, so the TTL is only a safety net
+FEATURE_FLAG_SNAPSHOT_TTL = int(os.environ.get("FEATURE_FLAG_SNAPSHOT_TTL", 60 * 60 * 6))
+# Maximum number of users accepted by the batch evaluation endpoint
+FEATURE_FLAG_BATCH_MAX_USERS = int(os.environ.get("FEATURE_FLAG_BATCH_MAX_USERS", 10000))
+# Seconds between checks for flag changes made by other processes, and
+# between keepalive comments on idle server-sent event streams
+FEATURE_FLAG_STREAM_POLL_INTERVAL = int(os.environ.get("FEATURE_FLAG_STREAM_POLL_INTERVAL", 5))
+FEATURE_FLAG_STREAM_KEEPALIVE = int(os.environ.get("FEATURE_FLAG_STREAM_KEEPALIVE", 15))
+# Dedicated key for the HMAC signature of the exported flag ruleset, shared
+# with edge workers that verify it; never reuse SECRET_KEY here. The export is
+# left unsigned while it is unset. Also how long shared caches may keep it
+FEATURE_FLAG_RULESET_SIGNING_KEY = os.environ.get("FEATURE_FLAG_RULESET_SIGNING_KEY", "")
+FEATURE_FLAG_RULESET_MAX_AGE = int(os.environ.get("FEATURE_FLAG_RULESET_MAX_AGE", 60))
+
+# Lead notifications
+# Notifications are queued in an outbox and delivered by the
+# send_lead_notifications worker; disable LEAD_NOTIFICATION_ASYNC to send
+# them during the request instead
+LEAD_NOTIFICATION_EMAIL = os.environ.get("LEAD_NOTIFICATION_EMAIL", "admin@example.com")
+LEAD_NOTIFICATION_ASYNC = os.environ.get("LEAD_NOTIFICATION_ASYNC", "True").lower() == "true"
+LEAD_NOTIFICATION_BATCH_SIZE = int(os.environ.get("LEAD_NOTIFICATION_BATCH_SIZE", 100))
+# Seconds a worker has to send a claimed batch before other workers retry it
+LEAD_NOTIFICATION_LEASE = int(os.environ.get("LEAD_NOTIFICATION_LEASE", 5 * 60))
+# Failed deliveries are retried after 1, 2, 4, ... minutes up to an hour
+LEAD_NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get("LEAD_NOTIFICATION_MAX_ATTEMPTS", 8))
+LEAD_NOTIFICATION_RETRY_DELAY = int(os.environ.get("LEAD_NOTIFICATION_RETRY_DELAY", 60))
+LEAD_NOTIFICATION_MAX_RETRY_DELAY = int(os.environ.get("LEAD_NOTIFICATION_MAX_RETRY_DELAY", 60 * 60))
+
+# Bulk lead import
+# Rows validated and inserted per chunk, and the number of invalid rows
+# reported back in detail
+LEAD_IMPORT_BATCH_SIZE = int(os.environ.get("LEAD_IMPORT_BATCH_SIZE", 1000))
+LEAD_IMPORT_MAX_ERRORS = int(os.environ.get("LEAD_IMPORT_MAX_ERRORS", 1000))
+# Rows fetched per round trip by the streaming lead export
+LEAD_EXPORT_CHUNK_SIZE = int(os.environ.get("LEAD_EXPORT_CHUNK_SIZE", 2000))
+# Leads changed per statement by the bulk update endpoint
+LEAD_BULK_UPDATE_CHUNK_SIZE = int(os.environ.get("LEAD_BULK_UPDATE_CHUNK_SIZE", 1000))
+# Seconds the estimated lead count of the management API is cached
+LEAD_COUNT_CACHE_TTL = int(os.environ.get("LEAD_COUNT_CACHE_TTL", 60))
+# Proxies in front of Django that append to X-Forwarded-For (1 behind the
+# nginx in ops/); lead client IPs for throttling and metadata are taken that
+# many hops from the end. 0 ignores the header, which clients can forge
+LEAD_NUM_PROXIES = int(os.environ.get("LEAD_NUM_PROXIES", 0))
+# Repeated submissions with the same email and message within this many
+# seconds only bump the duplicate counter of the first lead (0 disables)
+LEAD_DUPLICATE_WINDOW = int(os.environ.get("LEAD_DUPLICATE_WINDOW", 60 * 60))
+# archive_leads moves processed leads older than this many days out of the
+# live table, in transactions of LEAD_ARCHIVE_BATCH_SIZE leads
+LEAD_ARCHIVE_AFTER_DAYS = int(os.environ.get("LEAD_ARCHIVE_AFTER_DAYS", 180))
+LEAD_ARCHIVE_BATCH_SIZE = int(os.environ.get("LEAD_ARCHIVE_BATCH_SIZE", 1000))
+LEAD_ARCHIVE_DIR = os.environ.get("LEAD_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = False  # Override in dev/prod as needed
 
@@ -46,6 +46,9 @@ CORS_ALLOW_HEADERS = [
 # Email backend for development (console)
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Print lead notifications right away instead of running the worker
+LEAD_NOTIFICATION_ASYNC = False
+
 # Database for development (SQLite for local development)
 if not os.environ.get("DATABASE_URL"):
     DATABASES = {
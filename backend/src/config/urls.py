@@ -10,7 +10,6 @@ from wagtail.api.v2.router import WagtailAPIRouter
 from wagtail.documents import urls as wagtaildocs_urls
 
 from core.views import PageSitemap, BlogSitemap, robots_txt, security_txt
-from leads.urls import urlpatterns as leads_urls
 from pages.api import CustomPagesAPIViewSet
 
 # Sitemaps
@@ -30,7 +29,7 @@ urlpatterns = [
     path("cms/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
     path("api/v2/", api_router.urls),
-    path("api/leads/", include(leads_urls)),
+    path("api/leads/", include("leads.urls")),
     path("", include("core.urls")),
 
     # SEO URLs
@@ -1,4 +1,6 @@
 """Wagtail admin configuration for core app."""
+from django.core.exceptions import ValidationError
+from wagtail.admin.forms import WagtailAdminModelForm
 from wagtail.admin.panels import (
     FieldPanel,
     MultiFieldPanel,
@@ -10,6 +12,7 @@ from wagtail.admin.viewsets.model import ModelViewSet
 from wagtail.permission_policies.base import ModelPermissionPolicy
 
 from .models import FeatureFlag
+from .stats import get_flag_statistics
 
 
 class FeatureFlagPermissionPolicy(ModelPermissionPolicy):
@@ -17,6 +20,21 @@ class FeatureFlagPermissionPolicy(ModelPermissionPolicy):
     model = FeatureFlag
 
 
+class FeatureFlagForm(WagtailAdminModelForm):
+    """Admin form that rejects circular feature flag dependencies."""
+
+    def clean_dependencies(self):
+        dependencies = self.cleaned_data['dependencies']
+
+        cycle = self.instance.find_dependency_cycle(dependencies)
+        if cycle:
+            raise ValidationError(
+                f"These dependencies would create a cycle: {' -> '.join(cycle)}"
+            )
+
+        return dependencies
+
+
 class FeatureFlagCreateView(CreateView):
     """Custom create view for feature flags."""
     pass
@@ -67,13 +85,10 @@ class FeatureFlagIndexView(IndexView):
         ]
 
         # Add counts for dashboard
-        context['total_flags'] = FeatureFlag.objects.count()
-        context['enabled_flags'] = FeatureFlag.objects.filter(
-            is_enabled=True
-        ).count()
-        context['deprecated_flags'] = FeatureFlag.objects.filter(
-            is_deprecated=True
-        ).count()
+        stats = get_flag_statistics()
+        context['total_flags'] = stats['total']
+        context['enabled_flags'] = stats['enabled']
+        context['deprecated_flags'] = stats['deprecated']
 
         return context
 
@@ -121,6 +136,7 @@ class FeatureFlagViewSet(ModelViewSet):
                 FieldPanel("is_enabled"),
                 FieldPanel("environment"),
                 FieldPanel("rollout_percentage"),
+                FieldPanel("rollout_salt"),
                 FieldPanel("start_date"),
                 FieldPanel("end_date"),
             ], heading="Activation Settings"),
@@ -133,7 +149,7 @@ class FeatureFlagViewSet(ModelViewSet):
                 FieldPanel("deprecation_notes"),
             ], heading="Dependencies & Migration"),
         ], heading="Advanced"),
-    ])
+    ], base_form_class=FeatureFlagForm)
 
 
 # Register the viewset
@@ -1,15 +1,34 @@
 """API views for core app including feature flags."""
-import hashlib
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views import View
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from .flags import get_snapshot
 from .models import FeatureFlag
+from .ruleset import get_ruleset
+from .stats import get_flag_statistics
+from .streams import flag_events
+
+
+def _not_modified(request, etag):
+    """Return a 304 response if the client already holds ``etag``."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def _with_etag(response, etag):
+    """Tag a flags response so clients can revalidate it with If-None-Match."""
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
 
 
 class FeatureFlagsAPIView(View):
@@ -17,79 +36,119 @@ class FeatureFlagsAPIView(View):
 
     def get(self, request):
         """Get all active feature flags."""
-        # Apply caching only in production (not in DEBUG mode)
-        if not settings.DEBUG:
-            # Use method_decorator to apply caching dynamically
-            cached_get = method_decorator(cache_page(60 * 5))(self._get_flags)
-            return cached_get(request)
-        else:
-            # No caching in development
-            return self._get_flags(request)
-
-    def _get_flags(self, request):
-        """Internal method to get feature flags without caching."""
-        flags = {}
-
-        # Get all feature flags
-        feature_flags = FeatureFlag.objects.all()
-
-        for flag in feature_flags:
-            # Basic flag data
-            flag_data = {
-                'name': flag.name,
-                'display_name': flag.display_name,
-                'description': flag.description,
-                'category': flag.category,
-                'is_enabled': flag.is_enabled,
-                'is_active': flag.is_active,
-                'environment': flag.environment,
-                'rollout_percentage': flag.rollout_percentage,
-                'is_deprecated': flag.is_deprecated,
-                'deprecation_notes': flag.deprecation_notes,
-                'dependencies_met': flag.get_dependencies_status(),
-            }
+        snapshot = get_snapshot()
+        now = timezone.now()
+
+        # Answer revalidation without building the response body
+        etag = snapshot.etag(now)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
 
-            # Check if user should see this flag
-            user_id = request.GET.get('user_id')
-            if user_id:
-                # Create a consistent hash for the user
-                user_hash = hashlib.md5(
-                    f"{user_id}{flag.name}".encode()).hexdigest()
-                user_number = int(user_hash[:8], 16) % 100 + 1
-                flag_data['should_show_for_user'] = user_number <= flag.rollout_percentage
-            else:
-                flag_data['should_show_for_user'] = flag.rollout_percentage == 100
-
-            # Only include if dependencies are met and flag should show
-            if flag_data['dependencies_met'] and flag_data['should_show_for_user']:
-                flags[flag.name] = flag_data['is_active']
+        # Evaluate rollouts and dependencies against the compiled snapshot
+        flags = snapshot.evaluate(user_id=request.GET.get('user_id'), now=now)
 
         # Add metadata
         response_data = {
             'flags': flags,
             'metadata': {
                 'total_flags': len(flags),
-                'cache_ttl': 0 if settings.DEBUG else 300,  # No cache in DEBUG mode
+                'version': snapshot.generation,
+                'cache_ttl': settings.FEATURE_FLAG_SNAPSHOT_TTL,
                 'environment': 'development' if settings.DEBUG else 'production',
-                'caching_enabled': not settings.DEBUG,
+                'caching_enabled': True,
             }
         }
 
-        return JsonResponse(response_data)
+        return _with_etag(JsonResponse(response_data), etag)
+
+
+@csrf_exempt
+@api_view(['POST'])
+def feature_flags_batch(request):
+    """Evaluate feature flags for a batch of users."""
+    user_ids = request.data.get('user_ids') if isinstance(request.data, dict) else None
+    max_users = settings.FEATURE_FLAG_BATCH_MAX_USERS
+
+    # bool is an int subclass, but true/false are not user ids
+    if not isinstance(user_ids, list) or not all(
+        isinstance(user_id, (str, int)) and not isinstance(user_id, bool)
+        for user_id in user_ids
+    ):
+        return Response({
+            'error': 'user_ids must be a list of strings or integers'
+        }, status=400)
+
+    if len(user_ids) > max_users:
+        return Response({
+            'error': f'A batch may contain at most {max_users} users',
+            'max_users': max_users,
+        }, status=400)
+
+    snapshot = get_snapshot()
+
+    return Response({
+        'version': snapshot.generation,
+        'flags': [rule.name for rule in snapshot.rules],
+        'users': user_ids,
+        'matrix': snapshot.evaluate_many([str(user_id) for user_id in user_ids]),
+    })
+
+
+def feature_flags_ruleset(request):
+    """Export the signed flag ruleset for client-side evaluation."""
+    snapshot = get_snapshot()
+
+    etag = f'"ruleset-{snapshot.generation}"'
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    body, signature = get_ruleset(snapshot)
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    if signature:
+        response['X-Ruleset-Signature'] = signature
+    patch_cache_control(
+        response, public=True, max_age=settings.FEATURE_FLAG_RULESET_MAX_AGE
+    )
+    return response
+
+
+async def feature_flags_stream(request):
+    """Stream feature flag changes as server-sent events (requires ASGI)."""
+    # A WSGI server would drain the endless stream before sending anything
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'error': 'The feature flag stream requires an ASGI server'
+        }, status=501)
+
+    response = StreamingHttpResponse(
+        flag_events(request.GET.get('user_id')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @api_view(['GET'])
 def feature_flag_detail(request, flag_name):
     """Get detailed information about a specific feature flag."""
-    try:
-        flag = FeatureFlag.objects.get(name=flag_name)
-    except FeatureFlag.DoesNotExist:
+    snapshot = get_snapshot()
+    flag = snapshot.get(flag_name)
+    if flag is None:
         return Response({
             'error': 'Feature flag not found',
             'flag_name': flag_name
         }, status=404)
 
-    user_id = request.GET.get('user_id')
+    now = timezone.now()
+    etag = snapshot.etag(now)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
 
     # Create detailed response
     response_data = {
@@ -98,42 +157,44 @@ def feature_flag_detail(request, flag_name):
         'description': flag.description,
         'category': flag.category,
         'is_enabled': flag.is_enabled,
-        'is_active': flag.is_active,
+        'is_active': flag.is_active(now),
         'environment': flag.environment,
         'rollout_percentage': flag.rollout_percentage,
+        'rollout_salt': flag.rollout_salt,
         'start_date': flag.start_date,
         'end_date': flag.end_date,
         'is_deprecated': flag.is_deprecated,
         'deprecation_notes': flag.deprecation_notes,
-        'dependencies': [dep.name for dep in flag.dependencies.all()],
-        'dependencies_met': flag.get_dependencies_status(),
+        'dependencies': list(flag.dependencies),
+        'dependencies_met': snapshot.dependencies_met(flag, now),
         'created_at': flag.created_at,
         'updated_at': flag.updated_at,
     }
 
     # Check user-specific rollout
-    if user_id:
-        user_hash = hashlib.md5(f"{user_id}{flag.name}".encode()).hexdigest()
-        user_number = int(user_hash[:8], 16) % 100 + 1
-        response_data['should_show_for_user'] = user_number <= flag.rollout_percentage
-    else:
-        response_data['should_show_for_user'] = flag.rollout_percentage == 100
+    response_data['should_show_for_user'] = snapshot.should_show_for_user(
+        flag, request.GET.get('user_id'))
 
-    return Response(response_data)
+    return _with_etag(Response(response_data), etag)
 
 
 @api_view(['GET'])
 def feature_flags_by_category(request, category):
     """Get feature flags filtered by category."""
-    flags = FeatureFlag.objects.filter(category=category)
+    snapshot = get_snapshot()
+    now = timezone.now()
+    etag = snapshot.etag(now)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
 
     response_data = {
         'category': category,
         'flags': {}
     }
 
-    for flag in flags:
-        if flag.is_active and flag.get_dependencies_status():
+    for flag in snapshot.by_category(category):
+        if snapshot.is_effective(flag, now):
             response_data['flags'][flag.name] = {
                 'display_name': flag.display_name,
                 'description': flag.description,
@@ -141,7 +202,7 @@ def feature_flags_by_category(request, category):
                 'is_deprecated': flag.is_deprecated,
             }
 
-    return Response(response_data)
+    return _with_etag(Response(response_data), etag)
 
 
 @csrf_exempt
@@ -175,36 +236,27 @@ def toggle_feature_flag(request, flag_name):
 @api_view(['GET'])
 def wagtail_transition_status(request):
     """Get overall status of Wagtail transition."""
-    all_flags = FeatureFlag.objects.all()
-
-    # Group by category
-    categories = {}
-    for flag in all_flags:
-        if flag.category not in categories:
-            categories[flag.category] = {
-                'total': 0,
-                'enabled': 0,
-                'deprecated': 0,
-                'flags': []
-            }
+    stats = get_flag_statistics()
+    snapshot = get_snapshot()
 
-        categories[flag.category]['total'] += 1
-        if flag.is_enabled:
-            categories[flag.category]['enabled'] += 1
-        if flag.is_deprecated:
-            categories[flag.category]['deprecated'] += 1
-
-        categories[flag.category]['flags'].append({
-            'name': flag.name,
-            'display_name': flag.display_name,
-            'is_enabled': flag.is_enabled,
-            'is_deprecated': flag.is_deprecated,
-        })
+    # Per-category counts come from the statistics, flag details from the snapshot
+    categories = {
+        category: {**counts, 'flags': []}
+        for category, counts in stats['categories'].items()
+    }
+    for flag in snapshot.rules:
+        if flag.category in categories:
+            categories[flag.category]['flags'].append({
+                'name': flag.name,
+                'display_name': flag.display_name,
+                'is_enabled': flag.is_enabled,
+                'is_deprecated': flag.is_deprecated,
+            })
 
     # Calculate overall progress
-    total_flags = all_flags.count()
-    enabled_flags = all_flags.filter(is_enabled=True).count()
-    deprecated_flags = all_flags.filter(is_deprecated=True).count()
+    total_flags = stats['total']
+    enabled_flags = stats['enabled']
+    deprecated_flags = stats['deprecated']
 
     progress_percentage = (enabled_flags / total_flags *
                            100) if total_flags > 0 else 0
@@ -7,4 +7,8 @@ class CoreConfig(AppConfig):
     
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
-    verbose_name = "Core"
\ No newline at end of file
+    verbose_name = "Core"
+
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,37 @@
+"""Generation counters for versioned caches.
+
+A generation is a monotonically increasing number stored in the shared
+cache. Cached data is tagged with the generation it was built from, and
+bumping the generation invalidates every copy across all workers at once.
+"""
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY = 'generation:{namespace}'
+
+
+def _initial_generation():
+    # Seed from the clock so a flushed cache never hands out an old number
+    return int(time.time() * 1000)
+
+
+def get_generation(namespace: str) -> int:
+    """Return the current generation of ``namespace``."""
+    key = GENERATION_KEY.format(namespace=namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace: str) -> int:
+    """Advance the generation of ``namespace`` and return the new value."""
+    key = GENERATION_KEY.format(namespace=namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key is missing (never set or evicted), start a fresh generation
+        cache.add(key, _initial_generation(), timeout=None)
+        return get_generation(namespace)
@@ -0,0 +1,318 @@
+"""Compiled feature flag snapshot for in-process evaluation.
+
+Every ``FeatureFlag`` row and its dependency edges are loaded in a single
+query and resolved into immutable rules. Evaluating flags for a request then
+only touches the in-memory snapshot, never the database.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .bucketing import in_rollout
+from .cache import bump_generation, get_generation
+from .models import FeatureFlag
+
+logger = logging.getLogger(__name__)
+
+# Generation counter shared by all workers, see core.cache
+GENERATION_NAMESPACE = 'feature_flags'
+
+# Bounds of the time window an effective state is valid for
+EARLIEST = datetime.min.replace(tzinfo=UTC)
+LATEST = datetime.max.replace(tzinfo=UTC)
+
+# Columns copied from each FeatureFlag row into its compiled rule
+RULE_FIELDS = (
+    'id',
+    'name',
+    'display_name',
+    'description',
+    'category',
+    'is_enabled',
+    'environment',
+    'rollout_percentage',
+    'rollout_salt',
+    'start_date',
+    'end_date',
+    'is_deprecated',
+    'deprecation_notes',
+    'created_at',
+    'updated_at',
+)
+
+
+@dataclass(frozen=True)
+class FlagRule:
+    """Immutable, pre-resolved view of a single feature flag."""
+
+    id: int
+    name: str
+    display_name: str
+    description: str
+    category: str
+    is_enabled: bool
+    environment: str
+    rollout_percentage: int
+    rollout_salt: str
+    start_date: datetime | None
+    end_date: datetime | None
+    is_deprecated: bool
+    deprecation_notes: str
+    created_at: datetime
+    updated_at: datetime
+    dependencies: tuple[str, ...] = ()
+
+    def is_active(self, now: datetime) -> bool:
+        """Mirror ``FeatureFlag.is_active`` for a given point in time."""
+        if self.start_date and now < self.start_date:
+            return False
+        if self.end_date and now > self.end_date:
+            return False
+        return self.is_enabled
+
+    @property
+    def bucket_key(self) -> str:
+        """Key hashed together with the user id to pick a rollout bucket."""
+        return self.rollout_salt or self.name
+
+
+class FlagSnapshot:
+    """Immutable collection of compiled flag rules.
+
+    The dependency graph is resolved into topological order when the
+    snapshot is built. The effective state of every flag (active and all of
+    its transitive dependencies effective) only changes when a start or end
+    date is crossed, so it is computed once per such time window and every
+    later lookup is a dictionary access.
+    """
+
+    def __init__(self, rules, generation=None):
+        self.rules = tuple(rules)
+        self._by_name = {rule.name: rule for rule in self.rules}
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.order, self.cyclic = self._resolve_order()
+        self._boundaries = sorted(self._time_boundaries())
+        self._states = None
+
+    def _resolve_order(self):
+        """Sort flags so every flag comes after its dependencies.
+
+        Flags that are part of a dependency cycle, or depend on one, cannot
+        be ordered; they are returned separately and are never effective.
+        """
+        dependents = {rule.name: [] for rule in self.rules}
+        pending = {}
+        for rule in self.rules:
+            deps = [dep for dep in rule.dependencies if dep in self._by_name]
+            pending[rule.name] = len(deps)
+            for dep in deps:
+                dependents[dep].append(rule.name)
+
+        ready = deque(name for name, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        cyclic = frozenset(name for name, count in pending.items() if count > 0)
+        if cyclic:
+            logger.warning(
+                'Feature flag dependency cycle involving %s', ', '.join(sorted(cyclic))
+            )
+        return tuple(order), cyclic
+
+    def dependency_closure(self) -> dict[str, tuple[str, ...]]:
+        """Return all direct and transitive dependencies of every orderable flag."""
+        closure = {}
+        for name in self.order:
+            names = set()
+            for dep in self._by_name[name].dependencies:
+                if dep in closure:
+                    names.add(dep)
+                    names.update(closure[dep])
+            closure[name] = tuple(sorted(names))
+        return closure
+
+    def _time_boundaries(self):
+        """Yield the instants at which the activity of some flag changes."""
+        for rule in self.rules:
+            if rule.start_date:
+                yield rule.start_date
+            if rule.end_date:
+                # Flags stay active up to and including their end date
+                yield rule.end_date + timedelta(microseconds=1)
+
+    def _effective_states(self, now: datetime):
+        """Return ``(active, dependencies_met)`` maps valid at ``now``."""
+        states = self._states
+        if states is not None and states[0] <= now < states[1]:
+            return states[2], states[3]
+
+        boundaries = self._boundaries
+        index = bisect_right(boundaries, now)
+        valid_from = boundaries[index - 1] if index else EARLIEST
+        valid_until = boundaries[index] if index < len(boundaries) else LATEST
+
+        effective = dict.fromkeys(self.cyclic, False)
+        dependencies_met = dict.fromkeys(self.cyclic, False)
+        for name in self.order:
+            rule = self._by_name[name]
+            met = all(effective.get(dep, True) for dep in rule.dependencies)
+            dependencies_met[name] = met
+            effective[name] = met and rule.is_active(now)
+
+        self._states = (valid_from, valid_until, effective, dependencies_met)
+        return effective, dependencies_met
+
+    def __len__(self):
+        return len(self.rules)
+
+    def etag(self, now: datetime | None = None) -> str:
+        """Return a strong ETag for responses built from this snapshot.
+
+        Responses only change with the flag-set generation or when a start or
+        end date boundary is crossed, so both identify the response body.
+        """
+        window = bisect_right(self._boundaries, now or timezone.now())
+        return f'"{self.generation}-{window}"'
+
+    def get(self, name: str) -> FlagRule | None:
+        """Return the rule for ``name`` or ``None`` if it does not exist."""
+        return self._by_name.get(name)
+
+    def by_category(self, category: str) -> list[FlagRule]:
+        """Return all rules of a category in snapshot order."""
+        return [rule for rule in self.rules if rule.category == category]
+
+    def dependencies_met(self, rule: FlagRule, now: datetime | None = None) -> bool:
+        """Check if all transitive dependencies of ``rule`` are active."""
+        return self._effective_states(now or timezone.now())[1][rule.name]
+
+    def is_effective(self, rule: FlagRule, now: datetime | None = None) -> bool:
+        """Check if ``rule`` is active and all of its dependencies are met."""
+        return self._effective_states(now or timezone.now())[0][rule.name]
+
+    def should_show_for_user(self, rule: FlagRule, user_id=None) -> bool:
+        """Apply the percentage rollout of ``rule`` to a user."""
+        if user_id:
+            return in_rollout(user_id, rule.bucket_key, rule.rollout_percentage)
+        return rule.rollout_percentage == 100
+
+    def evaluate(self, user_id=None, now: datetime | None = None) -> dict[str, bool]:
+        """Return the visible flags for a user as ``{name: is_active}``."""
+        effective, dependencies_met = self._effective_states(now or timezone.now())
+        flags = {}
+        for rule in self.rules:
+            if dependencies_met[rule.name] and self.should_show_for_user(rule, user_id):
+                flags[rule.name] = effective[rule.name]
+        return flags
+
+    def evaluate_many(self, user_ids, now: datetime | None = None) -> list[str]:
+        """Evaluate all flags for many users at once.
+
+        Returns one string per user with a ``1`` or ``0`` per flag in snapshot
+        order, where ``1`` means the flag is visible and active. Flags that do
+        not depend on the user are resolved once for the whole batch; only
+        partial rollouts are bucketed per user.
+        """
+        effective, _ = self._effective_states(now or timezone.now())
+        columns = []
+        for rule in self.rules:
+            if not effective[rule.name]:
+                columns.append('0' * len(user_ids))
+            elif rule.rollout_percentage >= 100:
+                columns.append('1' * len(user_ids))
+            elif rule.rollout_percentage <= 0:
+                columns.append('0' * len(user_ids))
+            else:
+                key, percentage = rule.bucket_key, rule.rollout_percentage
+                columns.append([
+                    '1' if user_id and in_rollout(user_id, key, percentage) else '0'
+                    for user_id in user_ids
+                ])
+        if not columns:
+            return [''] * len(user_ids)
+        return [''.join(row) for row in zip(*columns, strict=True)]
+
+
+def build_snapshot(generation=None) -> FlagSnapshot:
+    """Load all flags and their dependencies in one query and compile them."""
+    rows = FeatureFlag.objects.values_list(*RULE_FIELDS, 'dependencies__name')
+
+    columns = {}
+    dependencies = {}
+    for row in rows:
+        flag_id = row[0]
+        if flag_id not in columns:
+            columns[flag_id] = row[:-1]
+            dependencies[flag_id] = []
+        if row[-1] is not None:
+            dependencies[flag_id].append(row[-1])
+
+    rules = [
+        FlagRule(
+            **dict(zip(RULE_FIELDS, values, strict=True)),
+            dependencies=tuple(sorted(dependencies[flag_id])),
+        )
+        for flag_id, values in columns.items()
+    ]
+    return FlagSnapshot(rules, generation=generation)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _is_current(snapshot, generation, ttl):
+    return (
+        snapshot is not None
+        and snapshot.generation == generation
+        and time.monotonic() - snapshot.built_at < ttl
+    )
+
+
+def get_snapshot() -> FlagSnapshot:
+    """Return the process-wide snapshot, rebuilding it when it is stale.
+
+    A snapshot is stale once the shared flag generation moves on or after
+    ``FEATURE_FLAG_SNAPSHOT_TTL`` seconds as a safety net. Checking the
+    generation costs one cache read and no database queries.
+    """
+    global _snapshot
+
+    ttl = getattr(settings, 'FEATURE_FLAG_SNAPSHOT_TTL', 60 * 60 * 6)
+    generation = get_generation(GENERATION_NAMESPACE)
+    snapshot = _snapshot
+    if _is_current(snapshot, generation, ttl):
+        return snapshot
+
+    with _snapshot_lock:
+        # Another thread may have rebuilt it while we waited for the lock
+        snapshot = _snapshot
+        if not _is_current(snapshot, generation, ttl):
+            snapshot = _snapshot = build_snapshot(generation)
+        return snapshot
+
+
+def invalidate_snapshot():
+    """Drop the process-wide snapshot so the next request rebuilds it."""
+    global _snapshot
+    _snapshot = None
+
+
+def bump_flag_generation():
+    """Invalidate the flag snapshot of every worker."""
+    invalidate_snapshot()
+    bump_generation(GENERATION_NAMESPACE)
@@ -0,0 +1,76 @@
+"""Management command to pre-generate queued image renditions."""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+
+from core.renditions import generate_pending, queue_images, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Generate the responsive renditions of queued images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.IMAGE_RENDITION_BATCH_SIZE,
+            help='Maximum number of images claimed per batch',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Queue every image first, e.g. after changing the rendition settings',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll the queue for new images',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls of an empty queue (with --loop)',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Only print the queue depth',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_stats()
+            return
+
+        if options['all']:
+            queue_images(get_image_model().objects.values_list('pk', flat=True))
+
+        batch_size = options['batch_size']
+        while True:
+            done, failed = self.drain(batch_size)
+            if done or failed:
+                self.stdout.write(
+                    f'Generated renditions of {done} image(s), {failed} failed'
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.write_stats()
+
+    def drain(self, batch_size):
+        """Process batches until the queue is empty."""
+        total_done = total_failed = 0
+        while True:
+            done, failed = generate_pending(batch_size)
+            total_done += done
+            total_failed += failed
+            if done + failed < batch_size:
+                return total_done, total_failed
+
+    def write_stats(self):
+        stats = queue_stats()
+        self.stdout.write(f"Queue: {stats['pending']} pending, {stats['failed']} failed")
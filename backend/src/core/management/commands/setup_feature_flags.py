@@ -242,30 +242,29 @@ class Command(BaseCommand):
         """Set up feature flag dependencies."""
         self.stdout.write('Setting up dependencies...')
 
+        # Fetch every flag involved in one query instead of one per lookup
+        flags = FeatureFlag.objects.in_bulk([
+            'WAGTAIL_LAYOUT', 'WAGTAIL_NAVBAR', 'WAGTAIL_FOOTER',
+            'WAGTAIL_SEO', 'WAGTAIL_META',
+            'WAGTAIL_CACHING', 'WAGTAIL_LAZY_LOADING',
+        ], field_name='name')
+
         try:
             # Layout depends on navbar and footer
-            layout_flag = FeatureFlag.objects.get(name='WAGTAIL_LAYOUT')
-            navbar_flag = FeatureFlag.objects.get(name='WAGTAIL_NAVBAR')
-            footer_flag = FeatureFlag.objects.get(name='WAGTAIL_FOOTER')
-
-            layout_flag.dependencies.add(navbar_flag, footer_flag)
+            flags['WAGTAIL_LAYOUT'].dependencies.add(
+                flags['WAGTAIL_NAVBAR'], flags['WAGTAIL_FOOTER']
+            )
             self.stdout.write('  ✓ Layout depends on navbar and footer')
 
             # SEO depends on meta
-            seo_flag = FeatureFlag.objects.get(name='WAGTAIL_SEO')
-            meta_flag = FeatureFlag.objects.get(name='WAGTAIL_META')
-
-            seo_flag.dependencies.add(meta_flag)
+            flags['WAGTAIL_SEO'].dependencies.add(flags['WAGTAIL_META'])
             self.stdout.write('  ✓ SEO depends on meta tags')
 
             # Caching depends on lazy loading
-            caching_flag = FeatureFlag.objects.get(name='WAGTAIL_CACHING')
-            lazy_flag = FeatureFlag.objects.get(name='WAGTAIL_LAZY_LOADING')
-
-            caching_flag.dependencies.add(lazy_flag)
+            flags['WAGTAIL_CACHING'].dependencies.add(flags['WAGTAIL_LAZY_LOADING'])
             self.stdout.write('  ✓ Caching depends on lazy loading')
 
-        except FeatureFlag.DoesNotExist as e:
+        except KeyError as e:
             self.stdout.write(
                 self.style.WARNING(f'Could not set up some dependencies: {e}')
             )
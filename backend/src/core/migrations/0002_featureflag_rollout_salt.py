@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="featureflag",
+            name="rollout_salt",
+            field=models.CharField(
+                blank=True,
+                help_text="Optional salt for rollout bucketing. Changing it reshuffles which users fall inside the rollout percentage",
+                max_length=100,
+            ),
+        ),
+    ]
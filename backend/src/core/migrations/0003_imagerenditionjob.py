@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_featureflag_rollout_salt"),
+        ("wagtailimages", "0027_image_description"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageRenditionJob",
+            fields=[
+                (
+                    "image",
+                    models.OneToOneField(
+                        help_text="Image to generate renditions of",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="wagtailimages.image",
+                    ),
+                ),
+                (
+                    "requested_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the image was last queued",
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Image Rendition Job",
+                "verbose_name_plural": "Image Rendition Jobs",
+                "ordering": ["requested_at"],
+            },
+        ),
+    ]
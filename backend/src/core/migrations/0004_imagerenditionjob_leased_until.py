@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_imagerenditionjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imagerenditionjob",
+            name="leased_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Until when a worker is generating the renditions",
+                null=True,
+            ),
+        ),
+    ]
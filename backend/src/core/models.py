@@ -1,8 +1,11 @@
 """Core models for LineLaunchStarter."""
+from collections import defaultdict, deque
+
 from django.db import models
 from django.utils import timezone
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.api import APIField
+from wagtail.images import get_image_model_string
 
 
 class FeatureFlag(models.Model):
@@ -105,6 +108,13 @@ class FeatureFlag(models.Model):
         help_text="Percentage of users who should see this feature (0-100)"
     )
 
+    rollout_salt = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Optional salt for rollout bucketing. Changing it reshuffles "
+                  "which users fall inside the rollout percentage"
+    )
+
     start_date = models.DateTimeField(
         null=True,
         blank=True,
@@ -186,6 +196,51 @@ class FeatureFlag(models.Model):
 
         return all(dep.is_active for dep in self.dependencies.all())
 
+    def find_dependency_cycle(self, dependencies):
+        """Return the cycle this flag would close by depending on ``dependencies``.
+
+        ``dependencies`` replaces the current dependencies of this flag. The
+        cycle is returned as a list of flag names starting and ending with
+        this flag, or ``None`` if the dependency graph stays acyclic.
+        """
+        if self.pk is None:
+            return None
+
+        graph = defaultdict(list)
+        edges = FeatureFlag.dependencies.through.objects.exclude(
+            from_featureflag_id=self.pk
+        ).values_list('from_featureflag_id', 'to_featureflag_id')
+        for from_id, to_id in edges:
+            graph[from_id].append(to_id)
+        graph[self.pk] = [getattr(dep, 'pk', dep) for dep in dependencies]
+
+        # Breadth-first search for a path leading back to this flag
+        parents = {}
+        queue = deque()
+        for dep_id in graph[self.pk]:
+            if dep_id not in parents:
+                parents[dep_id] = self.pk
+                queue.append(dep_id)
+        while queue and self.pk not in parents:
+            node = queue.popleft()
+            for next_id in graph[node]:
+                if next_id not in parents:
+                    parents[next_id] = node
+                    queue.append(next_id)
+
+        if self.pk not in parents:
+            return None
+
+        path = [self.pk]
+        node = parents[self.pk]
+        while node != self.pk:
+            path.append(node)
+            node = parents[node]
+        path.append(self.pk)
+
+        names = FeatureFlag.objects.in_bulk(set(path))
+        return [names[flag_id].name for flag_id in reversed(path)]
+
     panels = [
         MultiFieldPanel([
             FieldPanel("name"),
@@ -198,6 +253,7 @@ class FeatureFlag(models.Model):
             FieldPanel("is_enabled"),
             FieldPanel("environment"),
             FieldPanel("rollout_percentage"),
+            FieldPanel("rollout_salt"),
             FieldPanel("start_date"),
             FieldPanel("end_date"),
         ], heading="Activation Settings"),
@@ -217,8 +273,40 @@ class FeatureFlag(models.Model):
         APIField("is_enabled"),
         APIField("environment"),
         APIField("rollout_percentage"),
+        APIField("rollout_salt"),
         APIField("start_date"),
         APIField("end_date"),
         APIField("is_deprecated"),
         APIField("deprecation_notes"),
     ]
+
+
+class ImageRenditionJob(models.Model):
+    """Image whose responsive renditions still have to be generated."""
+
+    image = models.OneToOneField(
+        get_image_model_string(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        help_text="Image to generate renditions of"
+    )
+    requested_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the image was last queued"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    leased_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Until when a worker is generating the renditions"
+    )
+
+    class Meta:
+        ordering = ['requested_at']
+        verbose_name = "Image Rendition Job"
+        verbose_name_plural = "Image Rendition Jobs"
+
+    def __str__(self):
+        return f"Renditions of image {self.image_id}"
@@ -0,0 +1,234 @@
+"""Pre-generated responsive image renditions.
+
+Every image gets a configured set of renditions: one for each width in
+``IMAGE_RENDITION_WIDTHS`` in each of ``IMAGE_RENDITION_FORMATS``, plus the
+``IMAGE_RENDITION_EXTRA_FILTERS``. Uploading an image or publishing a page
+queues the images concerned as ``ImageRenditionJob`` rows, and the
+``generate_renditions`` command creates the renditions in the background.
+
+Requests only ever read renditions that already exist and fall back to the
+original file, so no request waits for an image to be resized. Data built
+from existing renditions is tagged with the rendition generation, which moves
+on whenever renditions are generated or images change.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from wagtail import blocks
+from wagtail.fields import StreamField
+from wagtail.images import get_image_model
+from wagtail.images.blocks import ImageChooserBlock
+from wagtail.images.models import Filter
+
+from .cache import bump_generation
+from .models import ImageRenditionJob
+
+logger = logging.getLogger(__name__)
+
+# Format name of renditions that keep the format of the original image
+ORIGINAL_FORMAT = 'original'
+
+# Rendition used for Open Graph images
+OG_IMAGE_FILTER = 'width-1200'
+
+# Generation counter shared by all workers, see core.cache
+GENERATION_NAMESPACE = 'image_renditions'
+
+
+def responsive_filters():
+    """Return ``(format, filter_spec)`` for every responsive rendition."""
+    return [
+        (
+            image_format,
+            f'width-{width}' if image_format == ORIGINAL_FORMAT
+            else f'width-{width}|format-{image_format}',
+        )
+        for image_format in settings.IMAGE_RENDITION_FORMATS
+        for width in settings.IMAGE_RENDITION_WIDTHS
+    ]
+
+
+def rendition_specs():
+    """Return the filter specs of all renditions generated for every image."""
+    specs = [spec for _, spec in responsive_filters()]
+    specs.extend(settings.IMAGE_RENDITION_EXTRA_FILTERS)
+    return list(dict.fromkeys(specs))
+
+
+def existing_rendition_url(image, filter_spec):
+    """Return the URL of an existing rendition of ``image``.
+
+    Falls back to the URL of the original file when the rendition has not
+    been generated yet, and returns ``None`` without an image.
+    """
+    if image is None:
+        return None
+    try:
+        return image.find_existing_rendition(Filter(filter_spec)).url
+    except image.get_rendition_model().DoesNotExist:
+        return image.file.url
+
+
+def image_manifest(image):
+    """Return the compact ``srcset`` manifest of an image.
+
+    ``srcset`` maps each format to a ``srcset`` attribute value listing the
+    renditions generated so far; missing renditions are left out, never
+    created. ``src`` is the original file.
+    """
+    if image is None:
+        return None
+
+    filters = [(image_format, Filter(spec)) for image_format, spec in responsive_filters()]
+    found = image.find_existing_renditions(*(image_filter for _, image_filter in filters))
+
+    widths = {}
+    for image_format, image_filter in filters:
+        rendition = found.get(image_filter)
+        if rendition is not None:
+            # Images narrower than a width yield the same rendition twice
+            widths.setdefault(image_format, {}).setdefault(rendition.width, rendition.url)
+
+    return {
+        'id': image.pk,
+        'width': image.width,
+        'height': image.height,
+        'src': image.file.url,
+        'srcset': {
+            image_format: ', '.join(f'{url} {width}w' for width, url in sorted(urls.items()))
+            for image_format, urls in widths.items()
+        },
+    }
+
+
+def _block_image_ids(block, value):
+    """Yield the ids of the images chosen in a StreamField block value."""
+    if value is None:
+        return
+    if isinstance(block, ImageChooserBlock):
+        yield value.pk
+    elif isinstance(block, blocks.StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from _block_image_ids(child_block, value.get(name))
+    elif isinstance(block, blocks.ListBlock):
+        for item in value:
+            yield from _block_image_ids(block.child_block, item)
+    elif isinstance(block, blocks.StreamBlock):
+        for child in value:
+            yield from _block_image_ids(child.block, child.value)
+
+
+def page_image_ids(page):
+    """Return the ids of the images a page uses in fields and StreamFields."""
+    image_model = get_image_model()
+    ids = set()
+    for field in page._meta.concrete_fields:
+        if isinstance(field, models.ForeignKey) and field.related_model is image_model:
+            ids.add(getattr(page, field.attname))
+        elif isinstance(field, StreamField):
+            ids.update(_block_image_ids(field.stream_block, getattr(page, field.name)))
+    ids.discard(None)
+    return ids
+
+
+def queue_images(image_ids):
+    """Queue renditions of ``image_ids`` for generation, resetting failed jobs."""
+    now = timezone.now()
+    ImageRenditionJob.objects.bulk_create(
+        [
+            ImageRenditionJob(image_id=image_id, requested_at=now)
+            for image_id in set(image_ids)
+        ],
+        update_conflicts=True,
+        unique_fields=['image'],
+        update_fields=['requested_at', 'attempts', 'last_error'],
+    )
+
+
+def generate_renditions(image):
+    """Create the missing renditions of ``image``."""
+    image.get_renditions(*rendition_specs())
+
+
+def claim_jobs(batch_size, now):
+    """Lease the next batch of queued images to the calling worker.
+
+    The rows are only locked while ``leased_until`` is set
+    ``IMAGE_RENDITION_LEASE`` ahead, so other workers skip them while the
+    renditions are created outside the transaction. Jobs of a worker that
+    dies mid-batch are picked up again once the lease runs out.
+    """
+    with transaction.atomic():
+        jobs = list(
+            ImageRenditionJob.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('image')
+            .filter(attempts__lt=settings.IMAGE_RENDITION_MAX_ATTEMPTS)
+            .filter(Q(leased_until__isnull=True) | Q(leased_until__lte=now))
+            .order_by('requested_at')[:batch_size]
+        )
+        ImageRenditionJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            leased_until=now + timedelta(seconds=settings.IMAGE_RENDITION_LEASE)
+        )
+    return jobs
+
+
+def generate_pending(batch_size=None):
+    """Generate the renditions of the next batch of queued images.
+
+    The batch is leased in a short transaction and rendered without holding
+    any locks, so several workers can run side by side. Finished jobs are
+    removed unless the image was queued again meanwhile; failed ones are
+    retried until ``IMAGE_RENDITION_MAX_ATTEMPTS`` is reached. Returns the
+    number of images processed and failed.
+    """
+    batch_size = batch_size or settings.IMAGE_RENDITION_BATCH_SIZE
+
+    jobs = claim_jobs(batch_size, timezone.now())
+    if not jobs:
+        return 0, 0
+
+    done = failed = 0
+    for job in jobs:
+        pending = ImageRenditionJob.objects.filter(pk=job.pk)
+        try:
+            generate_renditions(job.image)
+        except Exception as exc:
+            logger.exception('Generating renditions of image %s failed', job.image_id)
+            pending.update(
+                attempts=F('attempts') + 1, last_error=str(exc), leased_until=None
+            )
+            failed += 1
+        else:
+            # An image queued again while rendering is released, not removed
+            pending.filter(requested_at=job.requested_at).delete()
+            pending.update(leased_until=None)
+            done += 1
+
+    if done:
+        bump_rendition_generation()
+    return done, failed
+
+
+def bump_rendition_generation():
+    """Invalidate data built from the renditions existing so far."""
+    bump_generation(GENERATION_NAMESPACE)
+
+
+def queue_stats():
+    """Return the depth of the rendition queue."""
+    now = timezone.now()
+    failed = Q(attempts__gte=settings.IMAGE_RENDITION_MAX_ATTEMPTS)
+
+    stats = ImageRenditionJob.objects.aggregate(
+        pending=Count('pk', filter=~failed),
+        failed=Count('pk', filter=failed),
+        oldest_pending=Min('requested_at', filter=~failed),
+    )
+    oldest = stats.pop('oldest_pending')
+    stats['oldest_pending_age'] = (now - oldest).total_seconds() if oldest else None
+    return stats
@@ -1,11 +1,12 @@
 """SEO helper utilities for LaunchLine Starter."""
 from django.conf import settings
-from django.contrib.sites.models import Site
 from django.template.loader import render_to_string
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from wagtail.models import Page
 
+from .renditions import OG_IMAGE_FILTER, existing_rendition_url
+
 
 def get_canonical_url(page: Page, request=None) -> str:
     """Get canonical URL for a page."""
@@ -40,23 +41,19 @@ def get_meta_description(page: Page) -> str:
 
 
 def get_og_image_url(page: Page, request=None) -> str:
-    """Get Open Graph image URL for a page."""
-    if hasattr(page, 'og_image') and page.og_image:
-        if request:
-            return page.og_image.get_rendition('width-1200').url
-        return page.og_image.file.url
-    
-    # Fallback to featured image for blog posts
-    if hasattr(page, 'featured_image') and page.featured_image:
-        if request:
-            return page.featured_image.get_rendition('width-1200').url
-        return page.featured_image.file.url
-    
-    # Fallback to hero background image for home page
-    if hasattr(page, 'hero_background_image') and page.hero_background_image:
-        if request:
-            return page.hero_background_image.get_rendition('width-1200').url
-        return page.hero_background_image.file.url
+    """Get Open Graph image URL for a page.
+    
+    With a request, the pre-generated Open Graph rendition is used once it
+    exists; the request never waits for it to be created.
+    """
+    for field in ('og_image', 'featured_image', 'hero_background_image'):
+        # Fall back to the featured image of blog posts and the hero
+        # background image of the home page
+        image = getattr(page, field, None)
+        if image:
+            if request:
+                return existing_rendition_url(image, OG_IMAGE_FILTER)
+            return image.file.url
     
     return ""
 
@@ -0,0 +1,78 @@
+"""Signal handlers for the core app."""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.signals import page_published
+
+from .flags import bump_flag_generation
+from .models import FeatureFlag
+from .renditions import bump_rendition_generation, page_image_ids, queue_images
+from .streams import broadcaster
+
+
+def publish_flag_change():
+    """Invalidate flag snapshots everywhere and push the change to streams."""
+    bump_flag_generation()
+    broadcaster.notify()
+
+
+@receiver(post_save, sender=FeatureFlag)
+@receiver(post_delete, sender=FeatureFlag)
+def feature_flag_changed(sender, **kwargs):
+    """Invalidate flag snapshots once a flag save or delete is committed."""
+    transaction.on_commit(publish_flag_change)
+
+
+@receiver(m2m_changed, sender=FeatureFlag.dependencies.through)
+def feature_flag_dependencies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Reject dependency cycles and invalidate flag snapshots on change."""
+    if action == 'pre_add':
+        _check_dependency_cycles(instance, reverse, pk_set)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(publish_flag_change)
+
+
+def _check_dependency_cycles(instance, reverse, pk_set):
+    """Raise ValidationError if adding the pending edges would form a cycle."""
+    if reverse:
+        # ``instance`` becomes a dependency of every flag in ``pk_set``
+        changes = [
+            (flag, [*flag.dependencies.values_list('pk', flat=True), instance.pk])
+            for flag in FeatureFlag.objects.filter(pk__in=pk_set)
+        ]
+    else:
+        changes = [
+            (instance, [*instance.dependencies.values_list('pk', flat=True), *pk_set])
+        ]
+
+    for flag, dependencies in changes:
+        cycle = flag.find_dependency_cycle(dependencies)
+        if cycle:
+            raise ValidationError(
+                f"Feature flag dependency cycle: {' -> '.join(cycle)}"
+            )
+
+
+@receiver(post_save, sender=get_image_model())
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Queue the renditions of an uploaded or edited image."""
+    if raw:
+        return
+    transaction.on_commit(lambda: queue_images([instance.pk]))
+    transaction.on_commit(bump_rendition_generation)
+
+
+@receiver(post_delete, sender=get_image_model())
+def image_deleted(sender, **kwargs):
+    """Drop data built from the renditions of a deleted image."""
+    transaction.on_commit(bump_rendition_generation)
+
+
+@receiver(page_published)
+def page_published_images(sender, instance, **kwargs):
+    """Queue the renditions of all images used by a published page."""
+    image_ids = page_image_ids(instance)
+    if image_ids:
+        transaction.on_commit(lambda: queue_images(image_ids))
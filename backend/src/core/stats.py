@@ -0,0 +1,55 @@
+"""Feature flag statistics shared by the API and the Wagtail admin."""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .cache import get_generation
+from .flags import GENERATION_NAMESPACE
+from .models import FeatureFlag
+
+STATS_CACHE_KEY = 'feature_flags:stats:{generation}'
+
+
+def compute_flag_statistics() -> dict:
+    """Count flags per category with a single conditional-aggregate query."""
+    rows = (
+        FeatureFlag.objects.order_by('category')
+        .values('category')
+        .annotate(
+            total=Count('id'),
+            enabled=Count('id', filter=Q(is_enabled=True)),
+            deprecated=Count('id', filter=Q(is_deprecated=True)),
+        )
+    )
+
+    categories = {
+        row['category']: {
+            'total': row['total'],
+            'enabled': row['enabled'],
+            'deprecated': row['deprecated'],
+        }
+        for row in rows
+    }
+
+    return {
+        'total': sum(data['total'] for data in categories.values()),
+        'enabled': sum(data['enabled'] for data in categories.values()),
+        'deprecated': sum(data['deprecated'] for data in categories.values()),
+        'categories': categories,
+    }
+
+
+def get_flag_statistics() -> dict:
+    """Return flag statistics, cached until the flag set changes.
+
+    The cache key includes the flag-set generation, so every flag save or
+    dependency change makes the next call recompute the counts.
+    """
+    generation = get_generation(GENERATION_NAMESPACE)
+    key = STATS_CACHE_KEY.format(generation=generation)
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_flag_statistics()
+        cache.set(key, stats, timeout=settings.FEATURE_FLAG_SNAPSHOT_TTL)
+    return stats
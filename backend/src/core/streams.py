@@ -0,0 +1,115 @@
+"""Server-sent events for live feature flag changes.
+
+Each process runs a single listener that watches the shared flag
+generation and fans new snapshots out to every connected stream, so idle
+clients cost no queries and all clients together cost one cache read per
+poll interval. Changes made by this process wake the listener right away.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .flags import get_snapshot
+
+
+class FlagChangeBroadcaster:
+    """Fan out flag snapshot changes to all streams of this process."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._loop = None
+        self._task = None
+        self._wakeup = None
+        self._version = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a stream and return the queue it receives snapshots on."""
+        # Streams only care about the latest snapshot, older ones are dropped
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a stream; the listener stops with the last one."""
+        self._subscribers.discard(queue)
+
+    def notify(self):
+        """Wake the listener to pick up a change. Safe to call from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _ensure_listener(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._listen(self._wakeup))
+
+    async def _listen(self, wakeup: asyncio.Event):
+        interval = settings.FEATURE_FLAG_STREAM_POLL_INTERVAL
+        while self._subscribers:
+            await self.refresh()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+            wakeup.clear()
+
+    async def refresh(self):
+        """Publish the current snapshot if the flag set or date window changed."""
+        snapshot = await sync_to_async(get_snapshot)()
+        version = snapshot.etag()
+        if version == self._version:
+            return
+
+        self._version = version
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+
+broadcaster = FlagChangeBroadcaster()
+
+
+def _event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def flag_events(user_id=None):
+    """Yield the flags of a user, then a delta event whenever they change."""
+    keepalive = settings.FEATURE_FLAG_STREAM_KEEPALIVE
+    queue = broadcaster.subscribe()
+    try:
+        snapshot = await sync_to_async(get_snapshot)()
+        flags = snapshot.evaluate(user_id=user_id)
+        yield _event('flags', {'version': snapshot.generation, 'flags': flags})
+
+        while True:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except TimeoutError:
+                # Comment line that keeps proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+
+            current = snapshot.evaluate(user_id=user_id)
+            changed = {
+                name: value for name, value in current.items()
+                if name not in flags or flags[name] != value
+            }
+            removed = [name for name in flags if name not in current]
+            flags = current
+
+            if changed or removed:
+                yield _event('delta', {
+                    'version': snapshot.generation,
+                    'changed': changed,
+                    'removed': removed,
+                })
+    finally:
+        broadcaster.unsubscribe(queue)
@@ -3,7 +3,10 @@ from django.urls import path
 from .api import (
     FeatureFlagsAPIView,
     feature_flag_detail,
+    feature_flags_batch,
     feature_flags_by_category,
+    feature_flags_ruleset,
+    feature_flags_stream,
     toggle_feature_flag,
     wagtail_transition_status,
 )
@@ -13,6 +16,12 @@ app_name = 'core'
 urlpatterns = [
     # Feature flags API
     path('api/feature-flags/', FeatureFlagsAPIView.as_view(), name='feature_flags'),
+    path('api/feature-flags/batch/', feature_flags_batch,
+         name='feature_flags_batch'),
+    path('api/feature-flags/stream/', feature_flags_stream,
+         name='feature_flags_stream'),
+    path('api/feature-flags/ruleset/', feature_flags_ruleset,
+         name='feature_flags_ruleset'),
     path('api/feature-flags/<str:flag_name>/',
          feature_flag_detail, name='feature_flag_detail'),
     path('api/feature-flags/category/<str:category>/',
@@ -2,7 +2,10 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import Lead
+from .export import export_response
+from .models import ArchivedLead, Lead, LeadNotification
+from .rollups import update_processed
+from .search import search_leads
 
 
 @admin.register(Lead)
@@ -11,14 +14,17 @@ class LeadAdmin(admin.ModelAdmin):
     
     list_display = [
         'name', 'email', 'source', 'created_at_formatted', 
-        'is_processed_display', 'is_recent_display'
+        'is_processed_display', 'is_recent_display', 'duplicate_count'
     ]
     list_filter = [
         'source', 'is_processed', 'created_at'
     ]
     search_fields = ['name', 'email', 'message']
     ordering = ['-created_at']
-    readonly_fields = ['created_at', 'ip_address', 'user_agent', 'is_recent_display']
+    readonly_fields = [
+        'created_at', 'ip_address', 'user_agent', 'is_recent_display',
+        'duplicate_count', 'last_submitted_at'
+    ]
     
     fieldsets = [
         ('Contact Information', {
@@ -28,7 +34,10 @@ class LeadAdmin(admin.ModelAdmin):
             'fields': ['message']
         }),
         ('Metadata', {
-            'fields': ['created_at', 'ip_address', 'user_agent'],
+            'fields': [
+                'created_at', 'ip_address', 'user_agent',
+                'duplicate_count', 'last_submitted_at'
+            ],
             'classes': ['collapse']
         }),
         ('Lead Management', {
@@ -36,7 +45,13 @@ class LeadAdmin(admin.ModelAdmin):
         }),
     ]
     
-    actions = ['mark_as_processed', 'mark_as_unprocessed']
+    actions = ['mark_as_processed', 'mark_as_unprocessed', 'export_as_csv']
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the full-text index instead of ``icontains`` scans."""
+        if not search_term.strip():
+            return queryset, False
+        return search_leads(queryset, search_term), False
     
     def created_at_formatted(self, obj):
         """Format the created_at timestamp."""
@@ -65,10 +80,7 @@ class LeadAdmin(admin.ModelAdmin):
     
     def mark_as_processed(self, request, queryset):
         """Mark selected leads as processed."""
-        updated = queryset.filter(is_processed=False).update(
-            is_processed=True,
-            processed_at=timezone.now()
-        )
+        updated = update_processed(queryset, True)
         self.message_user(
             request, 
             f'{updated} lead(s) marked as processed.'
@@ -77,16 +89,72 @@ class LeadAdmin(admin.ModelAdmin):
     
     def mark_as_unprocessed(self, request, queryset):
         """Mark selected leads as unprocessed."""
-        updated = queryset.filter(is_processed=True).update(
-            is_processed=False,
-            processed_at=None
-        )
+        updated = update_processed(queryset, False)
         self.message_user(
             request, 
             f'{updated} lead(s) marked as unprocessed.'
         )
     mark_as_unprocessed.short_description = 'Mark selected leads as unprocessed'
     
+    def export_as_csv(self, request, queryset):
+        """Download the selected leads as CSV."""
+        return export_response(queryset, 'csv')
+    export_as_csv.short_description = 'Export selected leads as CSV'
+    
     def get_queryset(self, request):
         """Optimize queryset for admin list view."""
-        return super().get_queryset(request).select_related()
\ No newline at end of file
+        return super().get_queryset(request).select_related()
+
+
+@admin.register(LeadNotification)
+class LeadNotificationAdmin(admin.ModelAdmin):
+    """Admin interface for the lead notification outbox."""
+    
+    list_display = ['lead', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'lead', 'attempts', 'last_error', 'created_at', 'sent_at'
+    ]
+    list_select_related = ['lead']
+    
+    actions = ['retry_notifications']
+    
+    def retry_notifications(self, request, queryset):
+        """Queue the selected notifications for immediate delivery."""
+        updated = queryset.exclude(status=LeadNotification.STATUS_SENT).update(
+            status=LeadNotification.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now()
+        )
+        self.message_user(
+            request,
+            f'{updated} notification(s) queued for delivery.'
+        )
+    retry_notifications.short_description = 'Retry selected notifications'
+
+
+@admin.register(ArchivedLead)
+class ArchivedLeadAdmin(admin.ModelAdmin):
+    """Read-only admin interface for archived leads."""
+    
+    list_display = ['name', 'email', 'source', 'created_at', 'processed_at', 'archived_at']
+    list_filter = ['source', 'created_at']
+    search_fields = ['name', 'email', 'message']
+    ordering = ['-created_at']
+    actions = ['export_as_csv']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        # Rollups keep counting archived leads, deleting them would skew rebuilds
+        return False
+    
+    def export_as_csv(self, request, queryset):
+        """Download the selected archived leads as CSV."""
+        return export_response(queryset, 'csv')
+    export_as_csv.short_description = 'Export selected leads as CSV'
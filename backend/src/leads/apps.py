@@ -7,4 +7,8 @@ class LeadsConfig(AppConfig):
     
     default_auto_field = "django.db.models.BigAutoField"
     name = "leads"
-    verbose_name = "Leads"
\ No newline at end of file
+    verbose_name = "Leads"
+
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
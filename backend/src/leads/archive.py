@@ -0,0 +1,161 @@
+"""Archival of old processed leads.
+
+Processed leads older than ``LEAD_ARCHIVE_AFTER_DAYS`` are moved out of the
+live ``Lead`` table in batches, either into ``ArchivedLead`` or into gzipped
+JSONL files. Every batch is copied and deleted in one transaction, so an
+interrupted run can simply be started again. Archived leads stay counted in
+the daily rollups.
+
+Leads in JSONL files are offline: the API and admin only reach the
+``ArchivedLead`` table. Their counts are kept in ``OfflineLeadRollup`` so
+that rebuilding the rollups still includes them.
+"""
+import fcntl
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedLead, Lead
+from .rollups import record_offline, rollups_suspended
+
+# Columns copied from a lead into its archived copy
+ARCHIVE_FIELDS = [
+    field.attname for field in ArchivedLead._meta.concrete_fields
+    if field.name != 'archived_at'
+]
+
+
+def archivable_leads(older_than_days=None, now=None):
+    """Return the processed leads submitted before the archive cutoff."""
+    if older_than_days is None:
+        older_than_days = settings.LEAD_ARCHIVE_AFTER_DAYS
+    now = now or timezone.now()
+    return Lead.objects.filter(
+        is_processed=True,
+        created_at__lt=now - timedelta(days=older_than_days),
+    )
+
+
+def _claim(queryset, batch_size):
+    """Lock the next batch of leads, skipping rows other workers hold."""
+    return list(
+        queryset.order_by('id').select_for_update(skip_locked=True)[:batch_size]
+    )
+
+
+def _remove(leads):
+    """Delete archived leads from the live table without touching rollups."""
+    with rollups_suspended():
+        Lead.objects.filter(pk__in=[lead.pk for lead in leads]).delete()
+
+
+def archive_batch(queryset, batch_size):
+    """Move the next batch of ``queryset`` into ``ArchivedLead``.
+
+    Returns the number of archived leads, 0 once nothing is left.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        leads = _claim(queryset, batch_size)
+        if not leads:
+            return 0
+        ArchivedLead.objects.bulk_create(
+            [
+                ArchivedLead(
+                    **{field: getattr(lead, field) for field in ARCHIVE_FIELDS},
+                    archived_at=now,
+                )
+                for lead in leads
+            ],
+            ignore_conflicts=True,
+        )
+        _remove(leads)
+    return len(leads)
+
+
+class JSONLArchive:
+    """Directory of gzipped JSONL files, one per archived batch.
+
+    Archived leads are only counted in ``OfflineLeadRollup`` from then on. A
+    batch is written to a temporary file, the leads are deleted and only
+    after the commit the file gets its final name. ``recover`` settles
+    files left behind by an interrupted run.
+
+    Runs may overlap: each batch holds a shared lock on the directory from
+    creating its temporary file until renaming it, and ``recover`` only
+    touches temporary files while it holds the lock exclusively, i.e. while
+    no batch is in flight.
+    """
+
+    suffix = '.jsonl.gz'
+    lock_name = '.lock'
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or settings.LEAD_ARCHIVE_DIR)
+
+    @contextmanager
+    def _lock(self, operation):
+        """Hold an ``fcntl.flock`` lock on the directory."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / self.lock_name, 'a') as lock:
+            fcntl.flock(lock.fileno(), operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def recover(self):
+        """Keep temporary files whose batch was committed, drop the others.
+
+        Returns ``False`` without touching anything while another run has a
+        batch in flight; its leftovers are settled by a later run.
+        """
+        try:
+            with self._lock(fcntl.LOCK_EX | fcntl.LOCK_NB):
+                for path in self.directory.glob(f'*{self.suffix}.tmp'):
+                    with gzip.open(path, 'rt') as handle:
+                        ids = [json.loads(line)['id'] for line in handle]
+                    if Lead.objects.filter(pk__in=ids).exists():
+                        path.unlink()
+                    else:
+                        os.replace(path, path.with_suffix(''))
+        except BlockingIOError:
+            return False
+        return True
+
+    def archive_batch(self, queryset, batch_size):
+        """Move the next batch of ``queryset`` into a new file.
+
+        Returns the number of archived leads, 0 once nothing is left.
+        """
+        with self._lock(fcntl.LOCK_SH):
+            with transaction.atomic():
+                leads = _claim(queryset, batch_size)
+                if not leads:
+                    return 0
+
+                name = f'leads-{leads[0].pk:012d}-{leads[-1].pk:012d}{self.suffix}'
+                path = self.directory / name
+                temporary = path.with_name(f'{name}.tmp')
+                with open(temporary, 'wb') as raw:
+                    with gzip.GzipFile(fileobj=raw, mode='wb') as handle:
+                        for lead in leads:
+                            row = {field: getattr(lead, field) for field in ARCHIVE_FIELDS}
+                            handle.write(
+                                json.dumps(row, cls=DjangoJSONEncoder).encode() + b'\n'
+                            )
+                    # The file must be durable before the leads are deleted
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                _remove(leads)
+                record_offline(leads)
+            os.replace(temporary, path)
+        return len(leads)
@@ -0,0 +1,56 @@
+"""Bulk state transitions of leads.
+
+Selected leads are walked in primary key order, one chunk of ids at a time.
+Every chunk is changed with single ``UPDATE`` statements in its own
+transaction, so large selections neither hold locks for long nor load all
+leads at once. Processing state changes go through ``update_processed`` and
+keep the daily rollups in step.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .models import Lead
+from .rollups import update_processed
+
+
+def iter_id_chunks(queryset, chunk_size):
+    """Yield the ids of ``queryset`` in ascending chunks of ``chunk_size``.
+
+    Each chunk is fetched with a keyset query starting after the previous
+    one, so leads that stop matching once changed are not skipped.
+    """
+    last_id = 0
+    while True:
+        ids = list(
+            queryset
+            .filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def bulk_update_leads(queryset, is_processed=None, processed_at=None, notes=None,
+                      chunk_size=None):
+    """Apply processing state and note changes to all leads of ``queryset``.
+
+    ``None`` leaves a field unchanged. Returns the number of ``matched``
+    leads, of leads whose processing state was ``transitioned`` and of
+    leads whose notes were ``noted``.
+    """
+    chunk_size = chunk_size or settings.LEAD_BULK_UPDATE_CHUNK_SIZE
+    result = {'matched': 0, 'transitioned': 0, 'noted': 0}
+    for ids in iter_id_chunks(queryset, chunk_size):
+        chunk = Lead.objects.filter(pk__in=ids)
+        with transaction.atomic():
+            if is_processed is not None:
+                result['transitioned'] += update_processed(
+                    chunk, is_processed, processed_at
+                )
+            if notes is not None:
+                result['noted'] += chunk.update(notes=notes)
+        result['matched'] += len(ids)
+    return result
@@ -0,0 +1,72 @@
+"""Detection of repeated lead submissions.
+
+A submission is a duplicate when a lead with the same fingerprint was
+submitted within ``LEAD_DUPLICATE_WINDOW`` seconds. The lookup first probes
+the cache and then falls back to the ``(fingerprint, last_submitted_at)``
+index. Duplicates only bump a counter on the existing lead, so bot floods
+neither create rows nor queue notifications.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .fingerprint import lead_fingerprint, normalize_email
+from .models import Lead
+
+FINGERPRINT_CACHE_KEY = 'leads:fingerprint:{fingerprint}'
+
+
+def submission_fingerprint(email, message):
+    """Return the fingerprint of a submission before it is saved."""
+    return lead_fingerprint(normalize_email(email), message)
+
+
+def find_recent_duplicate(fingerprint, now=None):
+    """Return the id of a lead submitted with ``fingerprint`` in the window."""
+    window = settings.LEAD_DUPLICATE_WINDOW
+    if not window:
+        return None
+
+    lead_id = cache.get(FINGERPRINT_CACHE_KEY.format(fingerprint=fingerprint))
+    if lead_id is not None:
+        return lead_id
+
+    now = now or timezone.now()
+    return (
+        Lead.objects
+        .filter(
+            fingerprint=fingerprint,
+            last_submitted_at__gte=now - timedelta(seconds=window),
+        )
+        .order_by('-last_submitted_at')
+        .values_list('id', flat=True)
+        .first()
+    )
+
+
+def remember_submission(fingerprint, lead_id):
+    """Cache ``lead_id`` as the latest submission of ``fingerprint``."""
+    window = settings.LEAD_DUPLICATE_WINDOW
+    if window:
+        cache.set(FINGERPRINT_CACHE_KEY.format(fingerprint=fingerprint), lead_id, window)
+
+
+def record_duplicate(lead_id, fingerprint, now=None):
+    """Collapse a repeated submission into the counter of ``lead_id``.
+
+    The duplicate window slides with every repeat. Returns ``False`` if the
+    lead no longer exists.
+    """
+    now = now or timezone.now()
+    updated = Lead.objects.filter(pk=lead_id).update(
+        duplicate_count=F('duplicate_count') + 1,
+        last_submitted_at=now,
+    )
+    if updated:
+        remember_submission(fingerprint, lead_id)
+    else:
+        cache.delete(FINGERPRINT_CACHE_KEY.format(fingerprint=fingerprint))
+    return bool(updated)
@@ -0,0 +1,126 @@
+"""Streaming export of leads as CSV or NDJSON.
+
+Rows are read with ``values_list().iterator()``, which uses a server-side
+cursor where the database supports it, and are written to the response as
+they arrive. Exports of any size therefore run in constant memory.
+"""
+import csv
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+EXPORT_FIELDS = [
+    'id', 'name', 'email', 'message', 'source', 'created_at',
+    'ip_address', 'user_agent', 'is_processed', 'processed_at', 'notes',
+    'duplicate_count',
+]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Leading characters that make spreadsheet applications evaluate a CSV cell
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def _parse_bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValidationError(f'Invalid boolean: {value}')
+
+
+def _parse_timestamp(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError(f'Invalid date: {value}')
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_leads(queryset, params):
+    """Apply the ``source``, ``is_processed`` and ``created_*`` filters.
+
+    ``created_after`` and ``created_before`` accept ISO dates or datetimes
+    and are inclusive and exclusive bounds respectively. Raises
+    ``ValidationError`` for malformed values.
+    """
+    if params.get('source'):
+        queryset = queryset.filter(source=params['source'])
+    if params.get('is_processed'):
+        queryset = queryset.filter(is_processed=_parse_bool(params['is_processed']))
+    if params.get('created_after'):
+        queryset = queryset.filter(created_at__gte=_parse_timestamp(params['created_after']))
+    if params.get('created_before'):
+        queryset = queryset.filter(created_at__lt=_parse_timestamp(params['created_before']))
+    return queryset
+
+
+def _rows(querysets):
+    if isinstance(querysets, QuerySet):
+        querysets = [querysets]
+    for queryset in querysets:
+        yield from (
+            queryset
+            .order_by('created_at', 'id')
+            .values_list(*EXPORT_FIELDS)
+            .iterator(chunk_size=settings.LEAD_EXPORT_CHUNK_SIZE)
+        )
+
+
+def escape_formula(value):
+    """Prefix text that spreadsheets would run as a formula with ``'``.
+
+    Exports contain public form input, which must never be evaluated when
+    the file is opened in a spreadsheet application.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(querysets):
+    """Yield the leads of one or more querysets as CSV lines, starting with a header."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _rows(querysets):
+        yield writer.writerow([escape_formula(value) for value in row])
+
+
+def iter_ndjson(querysets):
+    """Yield the leads of one or more querysets as newline-delimited JSON objects."""
+    encoder = DjangoJSONEncoder()
+    for row in _rows(querysets):
+        yield encoder.encode(dict(zip(EXPORT_FIELDS, row, strict=True))) + '\n'
+
+
+def export_response(querysets, file_format='csv'):
+    """Return a streaming download of one or more querysets in the given format.
+
+    Several querysets, e.g. archived and live leads, are written one after
+    the other.
+    """
+    rows = iter_csv(querysets) if file_format == 'csv' else iter_ndjson(querysets)
+    response = StreamingHttpResponse(rows, content_type=CONTENT_TYPES[file_format])
+    filename = f"leads-{timezone.now():%Y%m%d-%H%M%S}.{file_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
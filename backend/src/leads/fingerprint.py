@@ -0,0 +1,24 @@
+"""Normalization and fingerprinting of lead submissions.
+
+Kept free of model imports so migrations can use it as well.
+"""
+import hashlib
+
+
+def normalize_email(email):
+    """Lowercase ``email`` and drop a ``+tag`` from its local part."""
+    local, _, domain = email.strip().lower().rpartition('@')
+    if not local:
+        return domain
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_message(message):
+    """Lowercase ``message`` and collapse all whitespace."""
+    return ' '.join(message.lower().split())
+
+
+def lead_fingerprint(email_normalized, message):
+    """Return the hash identifying repeated submissions of the same lead."""
+    content = f'{email_normalized}\n{normalize_message(message)}'
+    return hashlib.sha256(content.encode()).hexdigest()
@@ -0,0 +1,137 @@
+"""Streaming bulk import of leads from NDJSON or CSV.
+
+Rows are read lazily from the source, validated with ``LeadCreateSerializer``
+and inserted with ``bulk_create`` one chunk at a time, so memory use depends
+on the chunk size and not on the size of the import. Invalid rows are
+reported with their line number and do not abort the rest of the import;
+this includes lines that are not valid UTF-8. Each chunk is inserted in one
+transaction together with its rollups and search index entries.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Lead
+from .rollups import record_created
+from .search import index_leads
+from .serializers import LeadCreateSerializer
+
+FORMATS = ('ndjson', 'csv')
+
+
+class RowError(Exception):
+    """A row that could not be decoded."""
+
+
+def _decode(lines, invalid):
+    """Decode ``lines`` as UTF-8 one at a time.
+
+    Lines that are not valid UTF-8 are decoded with replacement characters
+    so parsing can go on, and their errors are stored in ``invalid`` by line
+    number for the rows they belong to to be reported.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError as exc:
+                invalid[line_number] = exc
+                line = line.decode('utf-8', errors='replace')
+        yield line
+
+
+def _decode_error(exc):
+    return RowError(f'Invalid UTF-8: {exc}')
+
+
+def iter_ndjson(lines):
+    """Yield ``(line_number, row)`` for every non-empty NDJSON line."""
+    invalid = {}
+    for line_number, line in enumerate(_decode(lines, invalid), start=1):
+        if line_number in invalid:
+            yield line_number, _decode_error(invalid.pop(line_number))
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, RowError(f'Invalid JSON: {exc}')
+            continue
+        if not isinstance(row, dict):
+            yield line_number, RowError('Expected a JSON object.')
+            continue
+        yield line_number, row
+
+
+def iter_csv(lines):
+    """Yield ``(line_number, row)`` for every CSV record after the header."""
+    invalid = {}
+    reader = csv.DictReader(_decode(lines, invalid))
+    for row in reader:
+        # A record may span several lines, any of which may be invalid
+        errors = [invalid.pop(number) for number in sorted(invalid)]
+        if errors:
+            yield reader.line_num, _decode_error(errors[0])
+        else:
+            yield reader.line_num, row
+
+
+def iter_rows(lines, file_format):
+    """Yield the rows of ``lines`` in the given format."""
+    if file_format == 'csv':
+        return iter_csv(lines)
+    return iter_ndjson(lines)
+
+
+def import_leads(rows, source=None, batch_size=None, max_errors=None):
+    """Validate and insert leads from ``(line_number, row)`` pairs.
+
+    ``source`` is used for rows that do not name their own. Returns a
+    summary with the number of created and failed rows and the errors of
+    the first ``max_errors`` invalid rows.
+    """
+    batch_size = batch_size or settings.LEAD_IMPORT_BATCH_SIZE
+    if max_errors is None:
+        max_errors = settings.LEAD_IMPORT_MAX_ERRORS
+
+    result = {'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+
+    def fail(line_number, errors):
+        result['failed'] += 1
+        if len(result['errors']) < max_errors:
+            result['errors'].append({'line': line_number, 'errors': errors})
+        else:
+            result['errors_truncated'] = True
+
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        leads = []
+        for line_number, row in chunk:
+            if isinstance(row, RowError):
+                fail(line_number, {'non_field_errors': [str(row)]})
+                continue
+            if source and not row.get('source'):
+                row = {**row, 'source': source}
+            serializer = LeadCreateSerializer(data=row)
+            if serializer.is_valid():
+                lead = Lead(**serializer.validated_data)
+                lead.update_fingerprint()
+                leads.append(lead)
+            else:
+                fail(line_number, serializer.errors)
+
+        with transaction.atomic():
+            Lead.objects.bulk_create(leads, batch_size=batch_size)
+            record_created(leads)
+            index_leads(leads)
+        result['created'] += len(leads)
+
+    return result
@@ -0,0 +1,78 @@
+"""Management command to archive old processed leads."""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from leads.archive import JSONLArchive, archivable_leads, archive_batch
+
+
+class Command(BaseCommand):
+    help = 'Move old processed leads out of the live lead table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=settings.LEAD_ARCHIVE_AFTER_DAYS,
+            help='Archive processed leads submitted more than this many days ago',
+        )
+        parser.add_argument(
+            '--to',
+            choices=['table', 'jsonl'],
+            default='table',
+            help='Archive into the ArchivedLead table or into gzipped JSONL files '
+                 '(offline: no longer shown by the API and admin)',
+        )
+        parser.add_argument(
+            '--path',
+            default=settings.LEAD_ARCHIVE_DIR,
+            help='Directory for JSONL archives',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.LEAD_ARCHIVE_BATCH_SIZE,
+            help='Number of leads moved per transaction',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Stop after archiving about this many leads',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many leads would be archived',
+        )
+
+    def handle(self, *args, **options):
+        queryset = archivable_leads(options['older_than'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} lead(s) would be archived')
+            return
+
+        if options['to'] == 'jsonl':
+            archive = JSONLArchive(options['path'])
+            if not archive.recover():
+                self.stderr.write(
+                    'Another run is archiving, leftover files were not recovered'
+                )
+            move_batch = archive.archive_batch
+        else:
+            move_batch = archive_batch
+
+        total = 0
+        limit = options['limit']
+        while limit is None or total < limit:
+            moved = move_batch(queryset, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            self.stdout.write(f'Archived {total} lead(s)...')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} lead(s)'))
+        if options['to'] == 'jsonl' and total:
+            self.stdout.write(
+                'Leads archived to JSONL are offline: the API and admin no longer '
+                'show them, the rollups keep counting them'
+            )
@@ -0,0 +1,67 @@
+"""Management command to bulk import leads from NDJSON or CSV files."""
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from leads.ingest import FORMATS, import_leads, iter_rows
+from leads.models import Lead
+
+
+class Command(BaseCommand):
+    help = 'Import leads from an NDJSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='File to import, or - to read from standard input',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Input format (default: guessed from the file extension)',
+        )
+        parser.add_argument(
+            '--source',
+            choices=[choice for choice, _ in Lead.SOURCE_CHOICES],
+            help='Source for rows that do not name their own',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.LEAD_IMPORT_BATCH_SIZE,
+            help='Number of rows validated and inserted at a time',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        # Read bytes so lines that are not valid UTF-8 are reported per row
+        if path == '-':
+            result = self.run(sys.stdin.buffer, file_format, options)
+        else:
+            try:
+                stream = open(path, 'rb')
+            except OSError as exc:
+                raise CommandError(f'Cannot open {path}: {exc}') from exc
+            with stream:
+                result = self.run(stream, file_format, options)
+
+        for error in result['errors']:
+            self.stderr.write(f"Line {error['line']}: {dict(error['errors'])}")
+        if result['errors_truncated']:
+            self.stderr.write('Further errors were not reported')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} lead(s), {result['failed']} failed"
+            )
+        )
+
+    def run(self, stream, file_format, options):
+        return import_leads(
+            iter_rows(stream, file_format),
+            source=options['source'],
+            batch_size=options['batch_size'],
+        )
@@ -0,0 +1,25 @@
+"""Management command to rebuild the daily lead rollups."""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from leads.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily lead rollups from the lead table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Only rebuild rollups from this date (YYYY-MM-DD) on',
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError(f"Invalid date: {options['since']}")
+
+        count = rebuild_rollups(since)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} rollup row(s)'))
@@ -0,0 +1,68 @@
+"""Management command to deliver queued lead notifications."""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from leads.notifications import deliver_pending, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Send queued lead notification emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.LEAD_NOTIFICATION_BATCH_SIZE,
+            help='Maximum number of notifications sent per SMTP connection',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll the queue for new notifications',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls of an empty queue (with --loop)',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Only print the queue depth',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_stats()
+            return
+
+        batch_size = options['batch_size']
+        while True:
+            sent, failed = self.drain(batch_size)
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} notification(s), {failed} failed')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.write_stats()
+
+    def drain(self, batch_size):
+        """Deliver batches until no notification is due."""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_pending(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
+
+    def write_stats(self):
+        stats = queue_stats()
+        self.stdout.write(
+            f"Queue: {stats['pending']} pending ({stats['due']} due, "
+            f"{stats['retrying']} retrying), {stats['failed']} failed"
+        )
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="Delivery status",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of failed delivery attempts"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time of the next delivery attempt",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(
+                        blank=True,
+                        help_text="Error of the last failed delivery attempt",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the notification was queued",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the notification was delivered",
+                        null=True,
+                    ),
+                ),
+                (
+                    "lead",
+                    models.ForeignKey(
+                        help_text="Lead this notification is about",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="leads.lead",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lead Notification",
+                "verbose_name_plural": "Lead Notifications",
+                "ordering": ["next_attempt_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="leads_leadn_status_b0c409_idx",
+                    )
+                ],
+            },
+        ),
+    ]
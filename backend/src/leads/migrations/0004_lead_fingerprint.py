@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+from leads.fingerprint import lead_fingerprint, normalize_email
+
+BATCH_SIZE = 1000
+
+
+def backfill_fingerprints(apps, schema_editor):
+    Lead = apps.get_model("leads", "Lead")
+
+    batch = []
+    for lead in Lead.objects.only("id", "email", "message", "created_at").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        lead.email_normalized = normalize_email(lead.email)
+        lead.fingerprint = lead_fingerprint(lead.email_normalized, lead.message)
+        lead.last_submitted_at = lead.created_at
+        batch.append(lead)
+        if len(batch) == BATCH_SIZE:
+            Lead.objects.bulk_update(
+                batch, ["email_normalized", "fingerprint", "last_submitted_at"]
+            )
+            batch = []
+    Lead.objects.bulk_update(
+        batch, ["email_normalized", "fingerprint", "last_submitted_at"]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0003_lead_leads_lead_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="duplicate_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of repeated submissions collapsed into this lead",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="email_normalized",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Lowercased email without +tag",
+                max_length=254,
+            ),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the normalized email and message",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="last_submitted_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When this lead was last submitted, including repeats",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["email_normalized"], name="leads_lead_email_n_ddaf3c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["fingerprint", "last_submitted_at"],
+                name="leads_lead_fingerp_9b2202_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0004_lead_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day the leads were submitted")),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("website", "Website Contact Form"),
+                            ("landing_page", "Landing Page"),
+                            ("newsletter", "Newsletter Signup"),
+                            ("demo_request", "Demo Request"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Source of the leads",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of leads submitted"
+                    ),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of those leads that are processed"
+                    ),
+                ),
+                (
+                    "processing_seconds",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Sum of the time from submission to processing",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lead Daily Rollup",
+                "verbose_name_plural": "Lead Daily Rollups",
+                "ordering": ["date", "source"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "source"),
+                        name="leads_rollup_date_source_unique",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,143 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0005_leaddailyrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedLead",
+            fields=[
+                ("name", models.CharField(help_text="Contact name", max_length=255)),
+                (
+                    "email",
+                    models.EmailField(
+                        help_text="Contact email address", max_length=254
+                    ),
+                ),
+                ("message", models.TextField(help_text="Contact message/inquiry")),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("website", "Website Contact Form"),
+                            ("landing_page", "Landing Page"),
+                            ("newsletter", "Newsletter Signup"),
+                            ("demo_request", "Demo Request"),
+                            ("other", "Other"),
+                        ],
+                        default="website",
+                        help_text="Source of the lead",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the lead was submitted",
+                    ),
+                ),
+                (
+                    "ip_address",
+                    models.GenericIPAddressField(
+                        blank=True, help_text="IP address of the submitter", null=True
+                    ),
+                ),
+                (
+                    "user_agent",
+                    models.TextField(blank=True, help_text="User agent string"),
+                ),
+                (
+                    "email_normalized",
+                    models.CharField(
+                        blank=True,
+                        editable=False,
+                        help_text="Lowercased email without +tag",
+                        max_length=254,
+                    ),
+                ),
+                (
+                    "fingerprint",
+                    models.CharField(
+                        blank=True,
+                        editable=False,
+                        help_text="Hash of the normalized email and message",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "duplicate_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of repeated submissions collapsed into this lead",
+                    ),
+                ),
+                (
+                    "last_submitted_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When this lead was last submitted, including repeats",
+                        null=True,
+                    ),
+                ),
+                (
+                    "is_processed",
+                    models.BooleanField(
+                        default=False, help_text="Has this lead been processed?"
+                    ),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, help_text="When the lead was processed", null=True
+                    ),
+                ),
+                (
+                    "notes",
+                    models.TextField(
+                        blank=True, help_text="Internal notes about this lead"
+                    ),
+                ),
+                (
+                    "id",
+                    models.BigIntegerField(
+                        help_text="Id the lead had in the live table",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the lead was archived",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Lead",
+                "verbose_name_plural": "Archived Leads",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at", "-id"],
+                        name="leads_archive_created_id_idx",
+                    ),
+                    models.Index(
+                        fields=["email_normalized"],
+                        name="leads_archi_email_n_2baedc_idx",
+                    ),
+                    models.Index(
+                        fields=["source"], name="leads_archi_source_23dfe1_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+POSTGRESQL_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE leads_leadsearchindex ADD COLUMN vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED",
+    "CREATE INDEX leads_search_vector_idx ON leads_leadsearchindex USING GIN (vector)",
+    "CREATE INDEX leads_search_trgm_idx ON leads_leadsearchindex "
+    "USING GIN (document gin_trgm_ops)",
+]
+
+# External content FTS5 table kept in sync with the index rows by triggers
+SQLITE_INDEX = [
+    "CREATE VIRTUAL TABLE leads_lead_fts USING fts5("
+    "document, content='leads_leadsearchindex', content_rowid='lead_id')",
+    "CREATE TRIGGER leads_lead_fts_insert AFTER INSERT ON leads_leadsearchindex BEGIN "
+    "INSERT INTO leads_lead_fts(rowid, document) VALUES (new.lead_id, new.document); "
+    "END",
+    "CREATE TRIGGER leads_lead_fts_delete AFTER DELETE ON leads_leadsearchindex BEGIN "
+    "INSERT INTO leads_lead_fts(leads_lead_fts, rowid, document) "
+    "VALUES ('delete', old.lead_id, old.document); "
+    "END",
+    "CREATE TRIGGER leads_lead_fts_update AFTER UPDATE ON leads_leadsearchindex BEGIN "
+    "INSERT INTO leads_lead_fts(leads_lead_fts, rowid, document) "
+    "VALUES ('delete', old.lead_id, old.document); "
+    "INSERT INTO leads_lead_fts(rowid, document) VALUES (new.lead_id, new.document); "
+    "END",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS leads_lead_fts_insert",
+    "DROP TRIGGER IF EXISTS leads_lead_fts_delete",
+    "DROP TRIGGER IF EXISTS leads_lead_fts_update",
+    "DROP TABLE IF EXISTS leads_lead_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = POSTGRESQL_INDEX
+    elif vendor == "sqlite":
+        statements = SQLITE_INDEX
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    # Dropping the table removes the PostgreSQL column and indexes
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+def search_document(name, email, message):
+    # Frozen copy of leads.search.search_document
+    return " ".join(part for part in (name, email, message) if part)
+
+
+def backfill_search_index(apps, schema_editor):
+    Lead = apps.get_model("leads", "Lead")
+    LeadSearchIndex = apps.get_model("leads", "LeadSearchIndex")
+
+    batch = []
+    for lead in Lead.objects.only("id", "name", "email", "message").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        batch.append(
+            LeadSearchIndex(
+                lead_id=lead.id,
+                document=search_document(lead.name, lead.email, lead.message),
+            )
+        )
+        if len(batch) == BATCH_SIZE:
+            LeadSearchIndex.objects.bulk_create(batch)
+            batch = []
+    LeadSearchIndex.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0006_archivedlead"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadSearchIndex",
+            fields=[
+                (
+                    "lead",
+                    models.OneToOneField(
+                        help_text="Lead this document indexes",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="leads.lead",
+                    ),
+                ),
+                (
+                    "document",
+                    models.TextField(help_text="Name, email and message of the lead"),
+                ),
+            ],
+            options={
+                "verbose_name": "Lead Search Index",
+                "verbose_name_plural": "Lead Search Index",
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
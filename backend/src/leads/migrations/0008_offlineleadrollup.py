@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0007_leadsearchindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfflineLeadRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day the leads were submitted")),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("website", "Website Contact Form"),
+                            ("landing_page", "Landing Page"),
+                            ("newsletter", "Newsletter Signup"),
+                            ("demo_request", "Demo Request"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Source of the leads",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of leads archived to files"
+                    ),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of those leads that are processed"
+                    ),
+                ),
+                (
+                    "processing_seconds",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Sum of the time from submission to processing",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Offline Lead Rollup",
+                "verbose_name_plural": "Offline Lead Rollups",
+                "ordering": ["date", "source"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "source"),
+                        name="leads_offline_rollup_date_source_unique",
+                    )
+                ],
+            },
+        ),
+    ]
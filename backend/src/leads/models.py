@@ -2,9 +2,11 @@
 from django.db import models
 from django.utils import timezone
 
+from .fingerprint import lead_fingerprint, normalize_email
 
-class Lead(models.Model):
-    """Model to store lead/contact form submissions."""
+
+class AbstractLead(models.Model):
+    """Fields shared by live and archived leads."""
     
     SOURCE_CHOICES = [
         ('website', 'Website Contact Form'),
@@ -46,6 +48,29 @@ class Lead(models.Model):
         help_text="User agent string"
     )
     
+    # Duplicate detection
+    email_normalized = models.CharField(
+        max_length=254,
+        blank=True,
+        editable=False,
+        help_text="Lowercased email without +tag"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="Hash of the normalized email and message"
+    )
+    duplicate_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of repeated submissions collapsed into this lead"
+    )
+    last_submitted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When this lead was last submitted, including repeats"
+    )
+    
     # Lead management
     is_processed = models.BooleanField(
         default=False,
@@ -61,27 +86,242 @@ class Lead(models.Model):
         help_text="Internal notes about this lead"
     )
     
+    class Meta:
+        abstract = True
+    
+    @property
+    def is_recent(self):
+        """Check if the lead was submitted in the last 24 hours."""
+        return (timezone.now() - self.created_at).days < 1
+
+
+class Lead(AbstractLead):
+    """Model to store lead/contact form submissions."""
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Lead"
         verbose_name_plural = "Leads"
         indexes = [
             models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at', '-id'], name='leads_lead_created_id_idx'),
             models.Index(fields=['email']),
             models.Index(fields=['source']),
             models.Index(fields=['is_processed']),
+            models.Index(fields=['email_normalized']),
+            models.Index(fields=['fingerprint', 'last_submitted_at']),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.email}) - {self.created_at.strftime('%Y-%m-%d')}"
     
+    def save(self, *args, **kwargs):
+        self.update_fingerprint()
+        super().save(*args, **kwargs)
+    
+    def update_fingerprint(self):
+        """Derive the duplicate detection fields from email and message."""
+        self.email_normalized = normalize_email(self.email)
+        self.fingerprint = lead_fingerprint(self.email_normalized, self.message)
+        if self.last_submitted_at is None:
+            self.last_submitted_at = self.created_at
+    
     def mark_as_processed(self):
         """Mark the lead as processed."""
         self.is_processed = True
         self.processed_at = timezone.now()
         self.save(update_fields=['is_processed', 'processed_at'])
+
+class LeadNotification(models.Model):
+    """Outbox entry for a pending lead notification email."""
     
-    @property
-    def is_recent(self):
-        """Check if the lead was submitted in the last 24 hours."""
-        return (timezone.now() - self.created_at).days < 1
\ No newline at end of file
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    lead = models.ForeignKey(
+        Lead,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        help_text="Lead this notification is about"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="Delivery status"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of failed delivery attempts"
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time of the next delivery attempt"
+    )
+    last_error = models.TextField(
+        blank=True,
+        help_text="Error of the last failed delivery attempt"
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the notification was queued"
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the notification was delivered"
+    )
+    
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        verbose_name = "Lead Notification"
+        verbose_name_plural = "Lead Notifications"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"Notification for {self.lead_id} ({self.get_status_display()})"
+
+
+class LeadDailyRollup(models.Model):
+    """Lead counts per day of submission and source.
+    
+    Maintained incrementally as leads are created, processed and deleted,
+    so analytics never have to scan the lead table.
+    """
+    
+    date = models.DateField(
+        help_text="Day the leads were submitted"
+    )
+    source = models.CharField(
+        max_length=50,
+        choices=Lead.SOURCE_CHOICES,
+        help_text="Source of the leads"
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of leads submitted"
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of those leads that are processed"
+    )
+    processing_seconds = models.BigIntegerField(
+        default=0,
+        help_text="Sum of the time from submission to processing"
+    )
+    
+    class Meta:
+        ordering = ['date', 'source']
+        verbose_name = "Lead Daily Rollup"
+        verbose_name_plural = "Lead Daily Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'source'], name='leads_rollup_date_source_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.source}: {self.total}"
+
+
+class ArchivedLead(AbstractLead):
+    """Processed lead moved out of the live table by ``archive_leads``."""
+    
+    id = models.BigIntegerField(
+        primary_key=True,
+        help_text="Id the lead had in the live table"
+    )
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the lead was archived"
+    )
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Archived Lead"
+        verbose_name_plural = "Archived Leads"
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='leads_archive_created_id_idx'),
+            models.Index(fields=['email_normalized']),
+            models.Index(fields=['source']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.email}) - {self.created_at.strftime('%Y-%m-%d')} [archived]"
+
+
+class OfflineLeadRollup(models.Model):
+    """Lead counts per day of submission and source of leads archived to files.
+    
+    JSONL archives are outside the database, so ``rebuild_rollups`` adds
+    these counts to the ones it recomputes from the lead tables.
+    """
+    
+    date = models.DateField(
+        help_text="Day the leads were submitted"
+    )
+    source = models.CharField(
+        max_length=50,
+        choices=Lead.SOURCE_CHOICES,
+        help_text="Source of the leads"
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of leads archived to files"
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of those leads that are processed"
+    )
+    processing_seconds = models.BigIntegerField(
+        default=0,
+        help_text="Sum of the time from submission to processing"
+    )
+    
+    class Meta:
+        ordering = ['date', 'source']
+        verbose_name = "Offline Lead Rollup"
+        verbose_name_plural = "Offline Lead Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'source'], name='leads_offline_rollup_date_source_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.source}: {self.total} offline"
+
+
+class LeadSearchIndex(models.Model):
+    """Searchable text of a lead, kept in sync by ``leads.search``.
+    
+    The migration adds a full-text index over ``document``: a tsvector
+    column with GIN and trigram indexes on PostgreSQL, an FTS5 table on
+    SQLite.
+    """
+    
+    lead = models.OneToOneField(
+        Lead,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index',
+        help_text="Lead this document indexes"
+    )
+    document = models.TextField(
+        help_text="Name, email and message of the lead"
+    )
+    
+    class Meta:
+        verbose_name = "Lead Search Index"
+        verbose_name_plural = "Lead Search Index"
+    
+    def __str__(self):
+        return f"Search index for {self.lead_id}"
@@ -0,0 +1,167 @@
+"""Outbox for lead notification emails.
+
+Creating a lead only queues a ``LeadNotification`` row. The
+``send_lead_notifications`` worker delivers due notifications in batches over
+a single SMTP connection and retries failures with exponential backoff, so
+the request never waits on the mail server.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import LeadNotification
+
+logger = logging.getLogger(__name__)
+
+
+def build_notification_message(lead, connection=None):
+    """Build the notification email for a new lead."""
+    subject = f"New Lead: {lead.name}"
+    message = f"""
+New lead submitted:
+
+Name: {lead.name}
+Email: {lead.email}
+Source: {lead.get_source_display()}
+Submitted: {lead.created_at}
+
+Message:
+{lead.message}
+
+---
+LaunchLine Starter
+    """.strip()
+
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com'),
+        to=[getattr(settings, 'LEAD_NOTIFICATION_EMAIL', 'admin@example.com')],
+        connection=connection,
+    )
+
+
+def queue_notification(lead):
+    """Add a notification for ``lead`` to the outbox."""
+    return LeadNotification.objects.create(lead=lead)
+
+
+def retry_delay(attempts):
+    """Return the backoff before retrying after ``attempts`` failures."""
+    delay = settings.LEAD_NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.LEAD_NOTIFICATION_MAX_RETRY_DELAY))
+
+
+def _record_failure(notification, error, now):
+    notification.attempts += 1
+    notification.last_error = str(error)
+    if notification.attempts >= settings.LEAD_NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = LeadNotification.STATUS_FAILED
+    else:
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+
+
+def deliver_notifications(notifications, now=None):
+    """Send ``notifications`` over one connection and record the outcome.
+
+    Returns the number of notifications sent and failed.
+    """
+    now = now or timezone.now()
+    sent = failed = 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning('Could not connect to the mail server: %s', exc)
+        for notification in notifications:
+            _record_failure(notification, exc, now)
+        failed = len(notifications)
+    else:
+        try:
+            for notification in notifications:
+                try:
+                    build_notification_message(notification.lead, connection).send()
+                except Exception as exc:
+                    logger.warning(
+                        'Lead notification %s failed: %s', notification.pk, exc
+                    )
+                    _record_failure(notification, exc, now)
+                    failed += 1
+                else:
+                    notification.status = LeadNotification.STATUS_SENT
+                    notification.sent_at = now
+                    notification.last_error = ''
+                    sent += 1
+        finally:
+            connection.close()
+
+    LeadNotification.objects.bulk_update(
+        notifications,
+        ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+    )
+    return sent, failed
+
+
+def claim_due(batch_size, now):
+    """Lease the next batch of due notifications to the calling worker.
+
+    The rows are only locked while their next attempt is pushed back by
+    ``LEAD_NOTIFICATION_LEASE``, so other workers skip them while they are
+    sent outside the transaction. Notifications of a worker that dies
+    mid-batch become due again once the lease runs out.
+    """
+    with transaction.atomic():
+        notifications = list(
+            LeadNotification.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('lead')
+            .filter(
+                status=LeadNotification.STATUS_PENDING,
+                next_attempt_at__lte=now,
+            )[:batch_size]
+        )
+        LeadNotification.objects.filter(
+            pk__in=[notification.pk for notification in notifications]
+        ).update(
+            next_attempt_at=now + timedelta(seconds=settings.LEAD_NOTIFICATION_LEASE)
+        )
+    return notifications
+
+
+def deliver_pending(batch_size=None, now=None):
+    """Deliver the next batch of due notifications.
+
+    The batch is leased in a short transaction and sent without holding
+    any locks, so several workers can run side by side without sending a
+    notification twice. Returns the number of notifications sent and failed.
+    """
+    batch_size = batch_size or settings.LEAD_NOTIFICATION_BATCH_SIZE
+    now = now or timezone.now()
+
+    notifications = claim_due(batch_size, now)
+    if not notifications:
+        return 0, 0
+    return deliver_notifications(notifications, now)
+
+
+def queue_stats(now=None):
+    """Return the depth of the notification queue."""
+    now = now or timezone.now()
+    pending = Q(status=LeadNotification.STATUS_PENDING)
+
+    stats = LeadNotification.objects.aggregate(
+        pending=Count('id', filter=pending),
+        due=Count('id', filter=pending & Q(next_attempt_at__lte=now)),
+        retrying=Count('id', filter=pending & Q(attempts__gt=0)),
+        failed=Count('id', filter=Q(status=LeadNotification.STATUS_FAILED)),
+        oldest_pending=Min('created_at', filter=pending),
+    )
+    oldest = stats.pop('oldest_pending')
+    stats['oldest_pending_age'] = (now - oldest).total_seconds() if oldest else None
+    return stats
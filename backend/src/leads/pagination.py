@@ -0,0 +1,164 @@
+"""Pagination for the lead management API."""
+import hashlib
+import json
+from base64 import b64decode, b64encode
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+LEAD_COUNT_CACHE_KEY = 'leads:count_estimate:{digest}'
+
+
+def estimate_count(queryset):
+    """Return an approximate number of rows in ``queryset``, cached for a short while.
+
+    PostgreSQL answers from the planner's row estimate for the filtered
+    query instead of scanning it; other databases fall back to an exact
+    count. Estimates are cached per query.
+    """
+    if queryset.query.is_empty():
+        return 0
+
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    key = LEAD_COUNT_CACHE_KEY.format(
+        digest=hashlib.sha256(f'{sql}:{params!r}'.encode()).hexdigest()
+    )
+    count = cache.get(key)
+    if count is not None:
+        return count
+
+    if connections[queryset.db].vendor == 'postgresql':
+        plan = json.loads(queryset.explain(format='json'))
+        count = int(plan[0]['Plan']['Plan Rows'])
+    else:
+        count = queryset.count()
+
+    cache.set(key, count, settings.LEAD_COUNT_CACHE_TTL)
+    return count
+
+
+class LeadCursorPagination(BasePagination):
+    """Keyset pagination over the ``(created_at, id)`` index.
+
+    Leads are listed newest first. The opaque cursor holds the
+    ``(created_at, id)`` of the first or last lead of the current page, and
+    the next page continues strictly after that tuple, so deep pages and
+    many leads sharing one timestamp cost the same bounded index range scan
+    as the first page, and no ``COUNT(*)`` is run. Pass ``count=true`` to
+    include an estimated total from ``estimate_count``.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.include_count = request.query_params.get('count', '').lower() in ('1', 'true')
+        self.queryset = queryset
+
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            created_at, pk = position
+            if reverse:
+                queryset = queryset.filter(created_at__gte=created_at).filter(
+                    Q(created_at__gt=created_at) | Q(pk__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(pk__lt=pk)
+                )
+        ordering = ('created_at', 'pk') if reverse else ('-created_at', '-pk')
+        results = list(queryset.order_by(*ordering)[:page_size + 1])
+
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving in one direction means there are leads in the other one
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        """Return the ``((created_at, id), reverse)`` encoded in the request."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            params = dict(parse_qsl(b64decode(encoded.encode('ascii')).decode('ascii')))
+            created_at = parse_datetime(params['t'])
+            pk = int(params['i'])
+            reverse = bool(int(params.get('r', 0)))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (created_at, pk), reverse
+
+    def encode_cursor(self, lead, reverse):
+        params = {'t': lead.created_at.isoformat(), 'i': lead.pk}
+        if reverse:
+            params['r'] = 1
+        encoded = b64encode(urlencode(params).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.include_count:
+            payload['count'] = estimate_count(self.queryset)
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+                'count': {'type': 'integer', 'example': 123},
+            },
+        }
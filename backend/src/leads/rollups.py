@@ -0,0 +1,243 @@
+"""Incrementally maintained daily lead rollups.
+
+Every change to a lead is turned into deltas for the ``LeadDailyRollup`` row
+of its submission day and source: one more or one less lead, processed lead
+and second of processing time. Saves and deletes are covered by signal
+handlers; code paths that bypass signals (``bulk_create``, ``update``) call
+``record_created`` and ``update_processed`` explicitly. Leads archived to
+files are counted in ``OfflineLeadRollup`` by ``record_offline``.
+"""
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Sum,
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedLead, Lead, LeadDailyRollup, OfflineLeadRollup
+
+# Lead columns the rollups are derived from
+ROLLUP_FIELDS = ('created_at', 'source', 'is_processed', 'processed_at')
+
+PROCESSING_TIME = ExpressionWrapper(
+    F('processed_at') - F('created_at'), output_field=DurationField()
+)
+
+_local = threading.local()
+
+
+@contextmanager
+def rollups_suspended():
+    """Stop the signal handlers from touching rollups in this thread.
+
+    Used when leads leave the live table without leaving the statistics,
+    i.e. when they are archived.
+    """
+    previous = getattr(_local, 'suspended', False)
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = previous
+
+
+def rollups_active():
+    return not getattr(_local, 'suspended', False)
+
+
+def lead_state(lead):
+    """Return the rollup-relevant columns of a lead instance."""
+    return tuple(getattr(lead, field) for field in ROLLUP_FIELDS)
+
+
+def _processing_seconds(created_at, processed_at):
+    if processed_at is None:
+        return 0
+    return max(int((processed_at - created_at).total_seconds()), 0)
+
+
+def add_state(deltas, state, sign=1):
+    """Add (or with ``sign=-1`` remove) one lead to ``deltas``."""
+    created_at, source, is_processed, processed_at = state
+    delta = deltas[(timezone.localdate(created_at), source)]
+    delta['total'] += sign
+    if is_processed:
+        delta['processed'] += sign
+        delta['processing_seconds'] += sign * _processing_seconds(created_at, processed_at)
+
+
+def apply_deltas(deltas, model=LeadDailyRollup):
+    """Add ``deltas`` of ``{(date, source): Counter}`` to the rollup rows."""
+    for (date, source), delta in deltas.items():
+        changes = {field: value for field, value in delta.items() if value}
+        if not changes:
+            continue
+        rows = model.objects.filter(date=date, source=source)
+        expressions = {field: F(field) + value for field, value in changes.items()}
+        if rows.update(**expressions):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(date=date, source=source, **changes)
+        except IntegrityError:
+            # Created concurrently since the update above
+            rows.update(**expressions)
+
+
+def new_deltas():
+    return defaultdict(Counter)
+
+
+def record_created(leads):
+    """Count leads that were inserted without signals, e.g. by bulk_create."""
+    deltas = new_deltas()
+    for lead in leads:
+        add_state(deltas, lead_state(lead))
+    apply_deltas(deltas)
+
+
+def record_offline(leads):
+    """Count leads that leave the database, e.g. into JSONL archives."""
+    deltas = new_deltas()
+    for lead in leads:
+        add_state(deltas, lead_state(lead))
+    apply_deltas(deltas, OfflineLeadRollup)
+
+
+def update_processed(queryset, is_processed, processed_at=None):
+    """Mark the leads of ``queryset`` as (un)processed and update the rollups.
+
+    Newly processed leads get ``processed_at``, by default the current time.
+    Returns the number of leads that changed state.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            queryset
+            .filter(is_processed=not is_processed)
+            .select_for_update()
+            .values_list('id', *ROLLUP_FIELDS)
+        )
+        if not rows:
+            return 0
+
+        processed_at = (processed_at or now) if is_processed else None
+        Lead.objects.filter(pk__in=[row[0] for row in rows]).update(
+            is_processed=is_processed, processed_at=processed_at
+        )
+
+        deltas = new_deltas()
+        for _, created_at, source, was_processed, old_processed_at in rows:
+            add_state(deltas, (created_at, source, was_processed, old_processed_at), -1)
+            add_state(deltas, (created_at, source, is_processed, processed_at))
+        apply_deltas(deltas)
+    return len(rows)
+
+
+def _aggregate(leads):
+    processed = Q(is_processed=True)
+    return (
+        leads
+        .annotate(date=TruncDate('created_at'))
+        .values('date', 'source')
+        .annotate(
+            total=Count('id'),
+            processed=Count('id', filter=processed),
+            processing_time=Sum(
+                PROCESSING_TIME, filter=processed & Q(processed_at__gte=F('created_at'))
+            ),
+        )
+        .order_by()
+    )
+
+
+def rebuild_rollups(since=None):
+    """Recompute the rollups from the live and archived leads.
+
+    Leads archived to files are added from ``OfflineLeadRollup``. Only days
+    from ``since`` on are rebuilt if it is given. Returns the number of
+    rollup rows written.
+    """
+    querysets = [Lead.objects.all(), ArchivedLead.objects.all()]
+    offline = OfflineLeadRollup.objects.all()
+    rollups = LeadDailyRollup.objects.all()
+    if since:
+        querysets = [leads.filter(created_at__date__gte=since) for leads in querysets]
+        offline = offline.filter(date__gte=since)
+        rollups = rollups.filter(date__gte=since)
+
+    counts = defaultdict(Counter)
+    for leads in querysets:
+        for row in _aggregate(leads).iterator():
+            counts[(row['date'], row['source'])].update({
+                'total': row['total'],
+                'processed': row['processed'],
+                'processing_seconds': int(
+                    (row['processing_time'] or timedelta()).total_seconds()
+                ),
+            })
+    for row in offline.values('date', 'source', 'total', 'processed', 'processing_seconds'):
+        counts[(row.pop('date'), row.pop('source'))].update(row)
+
+    with transaction.atomic():
+        rollups.delete()
+        created = LeadDailyRollup.objects.bulk_create([
+            LeadDailyRollup(date=date, source=source, **values)
+            for (date, source), values in counts.items()
+        ])
+    return len(created)
+
+
+def _summary(total=0, processed=0, processing_seconds=0):
+    return {
+        'total': total,
+        'processed': processed,
+        'unprocessed': total - processed,
+        'avg_processing_seconds': (
+            round(processing_seconds / processed) if processed else None
+        ),
+    }
+
+
+def summarize_rollups(start, end, source=None):
+    """Summarize the rollups of ``start`` through ``end`` (inclusive).
+
+    Returns overall totals, totals per source and one entry per day and
+    source, all read from the rollup table.
+    """
+    rollups = LeadDailyRollup.objects.filter(date__range=(start, end))
+    if source:
+        rollups = rollups.filter(source=source)
+
+    totals = Counter()
+    by_source = defaultdict(Counter)
+    daily = []
+    for rollup in rollups:
+        counts = {
+            'total': rollup.total,
+            'processed': rollup.processed,
+            'processing_seconds': rollup.processing_seconds,
+        }
+        totals.update(counts)
+        by_source[rollup.source].update(counts)
+        daily.append({'date': rollup.date, 'source': rollup.source, **_summary(**counts)})
+
+    return {
+        'start': start,
+        'end': end,
+        'totals': _summary(**totals),
+        'by_source': {
+            name: _summary(**counts) for name, counts in sorted(by_source.items())
+        },
+        'daily': daily,
+    }
@@ -0,0 +1,92 @@
+"""Full-text search over leads.
+
+Every lead has a ``LeadSearchIndex`` row holding its name, email and
+message. Its migration adds a full-text index over that document: a
+tsvector column with GIN and trigram indexes on PostgreSQL, and an FTS5
+table kept in sync by triggers on SQLite. Searches match leads through that
+index instead of scanning the lead table with ``icontains``; other databases
+fall back to a substring match on the document.
+"""
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import LeadSearchIndex
+
+# Words of a query, matching how the full-text indexes split documents
+WORD_RE = re.compile(r'\w+')
+
+POSTGRESQL_MATCH = (
+    "SELECT lead_id FROM leads_leadsearchindex "
+    "WHERE vector @@ to_tsquery('simple', %s) OR document ILIKE %s"
+)
+
+SQLITE_MATCH = "SELECT rowid FROM leads_lead_fts WHERE leads_lead_fts MATCH %s"
+
+
+def search_document(name, email, message):
+    """Return the text a lead is found by in the search index."""
+    return ' '.join(part for part in (name, email, message) if part)
+
+
+def lead_document(lead):
+    """Return the indexed text of ``lead``."""
+    return search_document(lead.name, lead.email, lead.message)
+
+
+def index_lead(lead):
+    """Create or refresh the search index row of a saved lead."""
+    LeadSearchIndex.objects.update_or_create(
+        lead_id=lead.pk, defaults={'document': lead_document(lead)}
+    )
+
+
+def index_leads(leads):
+    """Index freshly created leads, e.g. after ``bulk_create``."""
+    LeadSearchIndex.objects.bulk_create(
+        [
+            LeadSearchIndex(lead_id=lead.pk, document=lead_document(lead))
+            for lead in leads
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _tsquery(query):
+    """Turn ``query`` into a tsquery requiring a prefix match of every word."""
+    return ' & '.join(f"'{word}':*" for word in WORD_RE.findall(query))
+
+
+def _fts_query(query):
+    """Turn ``query`` into an FTS5 query requiring a prefix match of every word."""
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+
+def matching_ids(query):
+    """Return a subquery of the ids of leads matching ``query``, or ``None``."""
+    query = query.strip()
+    if not WORD_RE.search(query):
+        return None
+    if connection.vendor == 'postgresql':
+        return RawSQL(POSTGRESQL_MATCH, [_tsquery(query), f'%{_escape_like(query)}%'])
+    if connection.vendor == 'sqlite':
+        return RawSQL(SQLITE_MATCH, [_fts_query(query)])
+    return LeadSearchIndex.objects.filter(document__icontains=query).values('lead_id')
+
+
+def search_leads(queryset, query):
+    """Narrow a lead queryset to the leads matching ``query``.
+
+    Every word must occur in the name, email or message, as a word prefix.
+    On PostgreSQL a substring of the whole document matches as well, so
+    partial email addresses are found too. A blank query matches nothing.
+    """
+    ids = matching_ids(query)
+    if ids is None:
+        return queryset.none()
+    return queryset.filter(pk__in=ids)
@@ -1,6 +1,6 @@
 """Serializers for the leads app."""
 from rest_framework import serializers
-from .models import Lead
+from .models import ArchivedLead, Lead
 
 
 class LeadCreateSerializer(serializers.ModelSerializer):
@@ -56,9 +56,11 @@ class LeadListSerializer(serializers.ModelSerializer):
         model = Lead
         fields = [
             'id', 'name', 'email', 'source', 'created_at', 
-            'is_processed', 'processed_at', 'is_recent'
+            'is_processed', 'processed_at', 'is_recent', 'duplicate_count'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'processed_at', 'is_recent', 'duplicate_count'
         ]
-        read_only_fields = ['id', 'created_at', 'processed_at', 'is_recent']
 
 
 class LeadDetailSerializer(serializers.ModelSerializer):
@@ -71,8 +73,74 @@ class LeadDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'email', 'message', 'source', 'created_at',
             'ip_address', 'user_agent', 'is_processed', 'processed_at',
-            'notes', 'is_recent'
+            'notes', 'is_recent', 'duplicate_count', 'last_submitted_at'
         ]
         read_only_fields = [
-            'id', 'created_at', 'ip_address', 'user_agent', 'is_recent'
-        ]
\ No newline at end of file
+            'id', 'created_at', 'ip_address', 'user_agent', 'is_recent',
+            'duplicate_count', 'last_submitted_at'
+        ]
+
+
+class ArchivedLeadSerializer(serializers.ModelSerializer):
+    """Read-only serializer for archived leads (admin/internal use)."""
+    
+    is_recent = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = ArchivedLead
+        fields = LeadDetailSerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
+
+
+class LeadBulkUpdateSerializer(serializers.Serializer):
+    """Selection and changes of a bulk lead update (admin/internal use).
+    
+    Leads are selected either by ``ids`` or by a ``filter`` with the
+    ``source``, ``is_processed``, ``created_after``, ``created_before`` and
+    ``q`` keys of the lead list and export.
+    """
+    
+    max_ids = 10000
+    filter_keys = ('source', 'is_processed', 'created_after', 'created_before', 'q')
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=max_ids
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(allow_blank=True),
+        required=False
+    )
+    is_processed = serializers.BooleanField(required=False)
+    processed_at = serializers.DateTimeField(required=False)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate_filter(self, value):
+        """Reject unknown keys and filters that would select every lead."""
+        unknown = sorted(set(value) - set(self.filter_keys))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filter keys: {', '.join(unknown)}. "
+                f"Use {', '.join(self.filter_keys)}."
+            )
+        if not any(value.values()):
+            raise serializers.ValidationError(
+                "Provide at least one filter; use ids to select leads explicitly."
+            )
+        return value
+    
+    def validate(self, attrs):
+        """Require exactly one selection and at least one change."""
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide either ids or filter.")
+        if 'is_processed' not in attrs and 'notes' not in attrs:
+            raise serializers.ValidationError(
+                "Provide is_processed and/or notes to change."
+            )
+        if 'processed_at' in attrs and not attrs.get('is_processed'):
+            raise serializers.ValidationError(
+                "processed_at can only be set together with is_processed=true."
+            )
+        return attrs
@@ -0,0 +1,61 @@
+"""Signal handlers for the leads app."""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Lead
+from .rollups import (
+    ROLLUP_FIELDS,
+    add_state,
+    apply_deltas,
+    lead_state,
+    new_deltas,
+    rollups_active,
+)
+from .search import index_lead
+
+# Lead fields copied into its search document
+SEARCH_FIELDS = frozenset({'name', 'email', 'message'})
+
+
+@receiver(pre_save, sender=Lead)
+def remember_lead_state(sender, instance, raw=False, **kwargs):
+    """Load the stored rollup state of a lead that is about to change."""
+    instance._rollup_state = None
+    if raw or not rollups_active() or instance._state.adding or instance.pk is None:
+        return
+    instance._rollup_state = (
+        Lead.objects.filter(pk=instance.pk).values_list(*ROLLUP_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Lead)
+def lead_saved(sender, instance, created, raw=False, **kwargs):
+    """Move a created or changed lead between daily rollups."""
+    if raw or not rollups_active():
+        return
+    deltas = new_deltas()
+    previous = getattr(instance, '_rollup_state', None)
+    if previous is not None:
+        add_state(deltas, previous, -1)
+    add_state(deltas, lead_state(instance))
+    apply_deltas(deltas)
+
+
+@receiver(post_save, sender=Lead)
+def refresh_search_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the search document of a saved lead up to date."""
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    index_lead(instance)
+
+
+@receiver(post_delete, sender=Lead)
+def lead_deleted(sender, instance, **kwargs):
+    """Remove a deleted lead from its daily rollup."""
+    if not rollups_active():
+        return
+    deltas = new_deltas()
+    add_state(deltas, lead_state(instance), -1)
+    apply_deltas(deltas)
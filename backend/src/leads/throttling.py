@@ -0,0 +1,144 @@
+"""Throttling for the public lead endpoint.
+
+``SlidingWindowThrottle`` approximates a sliding window with two fixed
+counter buckets: the requests counted in the current bucket plus the share
+of the previous bucket that still overlaps the window. Each bucket is a
+single integer advanced with an atomic ``cache.incr``, instead of the
+timestamp list DRF's ``SimpleRateThrottle`` reads and rewrites on every hit.
+Clients that were rejected are remembered in process memory until their
+wait is over, so floods are turned away without touching the shared cache.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Upper bound of rejected clients remembered per process
+LOCAL_BLOCKLIST_SIZE = 10000
+
+
+def get_client_ip(request):
+    """Return the client IP, trusting only ``LEAD_NUM_PROXIES`` proxy hops.
+
+    Each trusted proxy appends the address it received the request from to
+    ``X-Forwarded-For``, so the client is the entry ``LEAD_NUM_PROXIES`` from
+    the end; anything before it may be forged by the client.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    xff = request.META.get('HTTP_X_FORWARDED_FOR')
+    num_proxies = settings.LEAD_NUM_PROXIES
+    if not num_proxies or not xff:
+        return remote_addr
+    addrs = [addr.strip() for addr in xff.split(',')]
+    return addrs[-min(num_proxies, len(addrs))]
+
+
+class LocalBlocklist:
+    """Bounded, thread-safe map of rejected clients to their release time."""
+
+    def __init__(self, size=LOCAL_BLOCKLIST_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def blocked_for(self, key, now):
+        """Return the remaining seconds ``key`` is blocked for, or 0."""
+        until = self._entries.get(key)
+        if until is None:
+            return 0
+        if until <= now:
+            with self._lock:
+                self._entries.pop(key, None)
+            return 0
+        return until - now
+
+    def block(self, key, until):
+        with self._lock:
+            self._entries[key] = until
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Sliding-window rate limit kept in two counters per client.
+
+    Subclasses set ``scope`` to pick their rate from
+    ``DEFAULT_THROTTLE_RATES`` like any other DRF throttle.
+    """
+
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+    # Shared by all scopes, whose keys never collide
+    blocklist = LocalBlocklist()
+
+    def get_ident(self, request):
+        return get_client_ip(request)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = self.timer()
+        self.wait_seconds = self.blocklist.blocked_for(key, now)
+        if self.wait_seconds:
+            return False
+
+        bucket, offset = divmod(now, self.duration)
+        bucket = int(bucket)
+        current_key = f'{key}:{bucket}'
+        previous_key = f'{key}:{bucket - 1}'
+        # Fraction of the previous bucket still inside the sliding window
+        overlap = 1 - offset / self.duration
+
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        if previous * overlap + current >= self.num_requests:
+            return self.reject(key, now, offset, previous, current)
+
+        # Buckets are read for one more window after they are current
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # The bucket expired between add() and incr()
+                self.cache.set(current_key, 1, self.duration * 2)
+        return True
+
+    def reject(self, key, now, offset, previous, current):
+        """Compute the wait, remember it locally and reject the request."""
+        if current >= self.num_requests or not previous:
+            # Blocked until the current bucket becomes the previous one
+            wait = self.duration - offset
+        else:
+            # Blocked until enough of the previous bucket has slid out
+            overlap = (self.num_requests - 1 - current) / previous
+            wait = max(0, (1 - overlap) * self.duration - offset)
+        self.wait_seconds = max(wait, 1)
+        self.blocklist.block(key, now + self.wait_seconds)
+        return False
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class LeadSubmitThrottle(SlidingWindowThrottle):
+    """Rate limit for public lead submissions per client IP."""
+
+    scope = 'lead_submit'
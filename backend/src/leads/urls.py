@@ -11,4 +11,11 @@ urlpatterns = [
     # Admin endpoints for managing leads
     path('manage/', views.LeadListCreateAPIView.as_view(), name='lead_list'),
     path('manage/<int:pk>/', views.LeadDetailAPIView.as_view(), name='lead_detail'),
+    path('manage/bulk/', views.LeadBulkUpdateAPIView.as_view(), name='lead_bulk_update'),
+    path('manage/analytics/', views.LeadAnalyticsAPIView.as_view(), name='lead_analytics'),
+    path('manage/export.<str:file_format>', views.LeadExportAPIView.as_view(),
+         name='lead_export'),
+    path('manage/import/', views.LeadImportAPIView.as_view(), name='lead_import'),
+    path('manage/notifications/', views.LeadNotificationQueueAPIView.as_view(),
+         name='lead_notification_queue'),
 ]
\ No newline at end of file
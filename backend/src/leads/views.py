@@ -1,77 +1,83 @@
 """Views for the leads app."""
-from django.core.mail import send_mail
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.http import parse_header_parameters
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-
-from .models import Lead
-from .serializers import LeadCreateSerializer, LeadListSerializer, LeadDetailSerializer
-
+from rest_framework.generics import (
+    ListCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+    get_object_or_404,
+)
+from rest_framework.views import APIView
 
-def get_client_ip(request):
-    """Get client IP address from request."""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+from .bulk import bulk_update_leads
+from .dedup import (
+    find_recent_duplicate,
+    record_duplicate,
+    remember_submission,
+    submission_fingerprint,
+)
+from .export import CONTENT_TYPES, export_response, filter_leads
+from .ingest import import_leads, iter_rows
+from .models import ArchivedLead, Lead
+from .notifications import deliver_notifications, queue_notification, queue_stats
+from .pagination import LeadCursorPagination
+from .rollups import summarize_rollups
+from .search import search_leads
+from .serializers import (
+    ArchivedLeadSerializer,
+    LeadBulkUpdateSerializer,
+    LeadCreateSerializer,
+    LeadDetailSerializer,
+    LeadListSerializer,
+)
+from .throttling import LeadSubmitThrottle, get_client_ip
 
 
 def send_lead_notification(lead):
-    """Send email notification for new lead."""
-    subject = f"New Lead: {lead.name}"
-    message = f"""
-New lead submitted:
-
-Name: {lead.name}
-Email: {lead.email}
-Source: {lead.get_source_display()}
-Submitted: {lead.created_at}
-
-Message:
-{lead.message}
-
----
-LaunchLine Starter
-    """.strip()
-    
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com'),
-            recipient_list=[getattr(settings, 'LEAD_NOTIFICATION_EMAIL', 'admin@example.com')],
-            fail_silently=True,
-        )
-    except Exception:
-        # Log the error in production
-        pass
+    """Queue the email notification for a new lead.
+
+    The ``send_lead_notifications`` worker delivers queued notifications.
+    With ``LEAD_NOTIFICATION_ASYNC`` disabled it is sent right away instead.
+    """
+    notification = queue_notification(lead)
+    if not settings.LEAD_NOTIFICATION_ASYNC:
+        deliver_notifications([notification])
 
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
-@throttle_classes([AnonRateThrottle])
+@throttle_classes([LeadSubmitThrottle])
 def create_lead(request):
     """Create a new lead from contact form submission."""
     serializer = LeadCreateSerializer(data=request.data)
     
     if serializer.is_valid():
-        # Create the lead with additional metadata
-        lead = serializer.save(
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
+        # Collapse repeated submissions into the existing lead
+        fingerprint = submission_fingerprint(
+            serializer.validated_data['email'], serializer.validated_data['message']
         )
-        
-        # Send notification email
-        send_lead_notification(lead)
+        lead_id = find_recent_duplicate(fingerprint)
+        if lead_id is None or not record_duplicate(lead_id, fingerprint):
+            # Create the lead with additional metadata
+            lead = serializer.save(
+                ip_address=get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            )
+            remember_submission(fingerprint, lead.id)
+            lead_id = lead.id
+            
+            # Send notification email
+            send_lead_notification(lead)
         
         return Response(
             {
-                'id': lead.id,
+                'id': lead_id,
                 'message': 'Thank you for your message. We\'ll get back to you soon!',
                 'success': True
             },
@@ -88,15 +94,36 @@ def create_lead(request):
     )
 
 
+def wants_archived(request, param):
+    """Check if a boolean query parameter asks for archived leads."""
+    return request.query_params.get(param, '').lower() in ('1', 'true')
+
+
 class LeadListCreateAPIView(ListCreateAPIView):
-    """List and create leads (admin/internal use only)."""
+    """List and create leads (admin/internal use only).
+    
+    ``q`` narrows the list to leads matching a full-text search and
+    ``archived=true`` lists the archived leads instead.
+    """
     
     queryset = Lead.objects.all()
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = LeadCursorPagination
+    
+    def get_queryset(self):
+        if self.request.method == 'GET' and wants_archived(self.request, 'archived'):
+            return ArchivedLead.objects.all()
+        queryset = super().get_queryset()
+        query = self.request.query_params.get('q', '').strip()
+        if self.request.method == 'GET' and query:
+            queryset = search_leads(queryset, query)
+        return queryset
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return LeadCreateSerializer
+        if wants_archived(self.request, 'archived'):
+            return ArchivedLeadSerializer
         return LeadListSerializer
     
     def perform_create(self, serializer):
@@ -112,4 +139,145 @@ class LeadDetailAPIView(RetrieveUpdateDestroyAPIView):
     
     queryset = Lead.objects.all()
     serializer_class = LeadDetailSerializer
-    permission_classes = [permissions.IsAdminUser]
\ No newline at end of file
+    permission_classes = [permissions.IsAdminUser]
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Fall back to the archive with ``include_archived=true``."""
+        if wants_archived(request, 'include_archived'):
+            lead = Lead.objects.filter(pk=kwargs['pk']).first()
+            if lead is None:
+                archived = get_object_or_404(ArchivedLead, pk=kwargs['pk'])
+                return Response(ArchivedLeadSerializer(archived).data)
+            return Response(self.get_serializer(lead).data)
+        return super().retrieve(request, *args, **kwargs)
+
+
+class LeadNotificationQueueAPIView(APIView):
+    """Report the depth of the lead notification queue (admin/internal use only)."""
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response(queue_stats())
+
+
+class LeadImportAPIView(APIView):
+    """Bulk import leads from an NDJSON or CSV body (admin/internal use only).
+    
+    Send ``text/csv`` with a header row or newline-delimited JSON objects.
+    The body is streamed, so imports of any size use constant memory. The
+    optional ``source`` query parameter applies to rows without a source.
+    """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def post(self, request):
+        media_type, _ = parse_header_parameters(request.content_type)
+        file_format = 'csv' if media_type == 'text/csv' else 'ndjson'
+        rows = iter_rows(request.stream or (), file_format)
+        result = import_leads(rows, source=request.query_params.get('source'))
+        return Response(result)
+
+
+class LeadBulkUpdateAPIView(APIView):
+    """Change the processing state or notes of many leads (admin/internal use only).
+    
+    Select leads by ``ids`` or by a ``filter`` object and set
+    ``is_processed`` (optionally with ``processed_at``) and/or ``notes``.
+    Leads are updated in chunks of ``LEAD_BULK_UPDATE_CHUNK_SIZE``; the
+    response holds the matched, transitioned and noted counts.
+    """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def post(self, request):
+        serializer = LeadBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'errors': serializer.errors, 'success': False},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        data = serializer.validated_data
+        
+        queryset = Lead.objects.all()
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+        else:
+            try:
+                queryset = filter_leads(queryset, data['filter'])
+            except ValidationError as exc:
+                return Response(
+                    {'errors': exc.messages, 'success': False},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            query = data['filter'].get('q', '').strip()
+            if query:
+                queryset = search_leads(queryset, query)
+        
+        result = bulk_update_leads(
+            queryset,
+            is_processed=data.get('is_processed'),
+            processed_at=data.get('processed_at'),
+            notes=data.get('notes'),
+        )
+        return Response({**result, 'success': True})
+
+
+class LeadExportAPIView(APIView):
+    """Stream all leads as CSV or NDJSON (admin/internal use only).
+    
+    Supports the ``source``, ``is_processed``, ``created_after`` and
+    ``created_before`` query parameters. ``include_archived=true`` adds the
+    archived leads before the live ones.
+    """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request, file_format):
+        if file_format not in CONTENT_TYPES:
+            return Response(
+                {'message': f'Unsupported export format: {file_format}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        querysets = [Lead.objects.all()]
+        if wants_archived(request, 'include_archived'):
+            querysets.insert(0, ArchivedLead.objects.all())
+        try:
+            querysets = [
+                filter_leads(queryset, request.query_params) for queryset in querysets
+            ]
+        except ValidationError as exc:
+            return Response(
+                {'errors': exc.messages, 'success': False},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return export_response(querysets, file_format)
+
+
+class LeadAnalyticsAPIView(APIView):
+    """Lead counts and processing times per day and source (admin/internal use only).
+    
+    Reads only the daily rollups. ``days`` selects the period ending today
+    (default 30, at most 366) and ``source`` limits it to one source.
+    """
+    
+    permission_classes = [permissions.IsAdminUser]
+    default_days = 30
+    max_days = 366
+    
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', self.default_days))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= self.max_days:
+            return Response(
+                {'errors': [f'days must be between 1 and {self.max_days}.'], 'success': False},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        return Response(
+            summarize_rollups(start, end, source=request.query_params.get('source'))
+        )
@@ -0,0 +1,34 @@
+"""Wagtail hooks for leads app."""
+from datetime import timedelta
+
+from django.utils import timezone
+from wagtail import hooks
+from wagtail.admin.ui.components import Component
+
+from .rollups import summarize_rollups
+
+
+class LeadRollupPanel(Component):
+    """Wagtail dashboard panel with lead counts per source from the rollups."""
+
+    name = 'lead_rollups'
+    order = 150
+    template_name = 'leads/admin/lead_rollup_panel.html'
+    days = 30
+
+    def get_context_data(self, parent_context=None):
+        end = timezone.localdate()
+        summary = summarize_rollups(end - timedelta(days=self.days - 1), end)
+        for counts in [summary['totals'], *summary['by_source'].values()]:
+            seconds = counts['avg_processing_seconds']
+            counts['avg_processing_hours'] = (
+                round(seconds / 3600, 1) if seconds is not None else None
+            )
+        return {'days': self.days, 'summary': summary}
+
+
+@hooks.register('construct_homepage_panels')
+def add_lead_rollup_panel(request, panels):
+    """Show the lead rollups on the Wagtail dashboard."""
+    if request.user.has_perm('leads.view_lead'):
+        panels.append(LeadRollupPanel())
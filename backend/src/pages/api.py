@@ -1,17 +1,27 @@
 """Custom Wagtail API configuration."""
-from django.db import models
+from django.conf import settings
 from wagtail.api.v2.views import PagesAPIViewSet
 from wagtail.api.v2.filters import FieldsFilter, OrderingFilter, SearchFilter
-from wagtail.api.v2.pagination import WagtailPagination
 
 from rest_framework.response import Response
 
+from core.renditions import (
+    existing_rendition_url,
+    image_manifest,
+    rendition_specs,
+    responsive_filters,
+)
+from .block_cache import PageSerializer
+from .cache import get_cached_data, is_cacheable, response_key, set_cached_data
+from .images import with_renditions
 from .models import HomePage, BlogIndexPage, BlogPage
 
 
 class CustomPagesAPIViewSet(PagesAPIViewSet):
     """Custom pages API with enhanced filtering and serialization."""
     
+    base_serializer_class = PageSerializer
+    
     filter_backends = [
         FieldsFilter,
         OrderingFilter,
@@ -25,45 +35,63 @@ class CustomPagesAPIViewSet(PagesAPIViewSet):
         """Return only live pages."""
         return super().get_queryset().live().public()
     
-    def list_view(self, request):
-        """Enhanced list view with better filtering for blog pages."""
-        response = super().list_view(request)
+    def get_object(self):
+        """Return the requested page, loading it only once per request."""
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+    
+    def cached_response(self, request, view, *args):
+        """Serve the response of ``view`` from the pages API cache if possible.
         
+        Cache hits are answered without any database query; only successful
+        responses are stored.
+        """
+        if not is_cacheable(request):
+            return view(request, *args)
+        key = response_key(request)
+        data = get_cached_data(key)
+        if data is not None:
+            return Response(data)
+        response = view(request, *args)
         if response.status_code == 200:
-            # Handle blog page filtering
-            page_type = request.GET.get('type')
-            if page_type == 'pages.BlogPage':
-                # Filter to only blog pages and order by date
-                queryset = BlogPage.objects.live().public().order_by('-date')
-                
-                # Apply search if provided
-                search_query = request.GET.get('search')
-                if search_query:
-                    queryset = queryset.filter(
-                        models.Q(title__icontains=search_query) |
-                        models.Q(intro__icontains=search_query) |
-                        models.Q(content__icontains=search_query)
-                    )
-                
-                # Apply pagination
-                paginator = self.get_paginator(queryset, request)
-                page = paginator.get_page(request)
-                
-                # Serialize the results
-                serializer = self.get_serializer(page, many=True)
-                
-                response.data = {
-                    'items': serializer.data,
-                    'meta': {
-                        'total_count': paginator.count,
-                        'next': self.get_next_link(page) if page.has_next() else None,
-                        'previous': self.get_previous_link(page) if page.has_previous() else None,
-                    }
-                }
-        
+            set_cached_data(key, response.data)
         return response
     
+    def listing_view(self, request):
+        """Cached listing view."""
+        return self.cached_response(request, self.uncached_listing_view)
+    
     def detail_view(self, request, pk):
+        """Cached detail view."""
+        return self.cached_response(request, self.uncached_detail_view, pk)
+    
+    def uncached_listing_view(self, request):
+        """Listing view with a dedicated path for blog pages."""
+        if request.GET.get('type') == 'pages.BlogPage':
+            return self.blog_listing_view(request)
+        return super().listing_view(request)
+    
+    def blog_listing_view(self, request):
+        """List blog pages, newest first unless ``order`` is given.
+        
+        Runs one count and one paginated query for the posts, with their
+        featured and social images joined in, and one query per image field
+        for the renditions, instead of queries per image.
+        """
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        specs = [spec for _, spec in responsive_filters()]
+        queryset = with_renditions(queryset, 'featured_image', *specs)
+        queryset = with_renditions(queryset, 'og_image', *specs)
+        if 'order' not in request.GET:
+            queryset = queryset.order_by('-date', '-pk')
+        queryset = self.filter_queryset(queryset)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    def uncached_detail_view(self, request, pk):
         """Enhanced detail view with additional context."""
         response = super().detail_view(request, pk)
         
@@ -73,17 +101,7 @@ class CustomPagesAPIViewSet(PagesAPIViewSet):
             
             # Add blog posts for BlogIndexPage
             if isinstance(page, BlogIndexPage):
-                blog_posts = BlogPage.objects.child_of(page).live().public().order_by("-first_published_at")[:10]
-                response.data["blog_posts"] = [
-                    {
-                        "id": post.id,
-                        "title": post.title,
-                        "slug": post.slug,
-                        "intro": post.intro,
-                        "date": post.date,
-                        "featured_image": post.featured_image.file.url if post.featured_image else None,
-                    } for post in blog_posts
-                ]
+                response.data["blog_posts"] = self.get_blog_posts_data(page)
             
             # Add SEO data
             response.data["seo"] = {
@@ -93,5 +111,29 @@ class CustomPagesAPIViewSet(PagesAPIViewSet):
             }
         
         return response
-
-
+    
+    def get_blog_posts_data(self, page):
+        """Summarize the latest posts of a blog index.
+        
+        The posts and their featured images come from one query, and the
+        existing renditions of those images from another, whatever the
+        number of posts.
+        """
+        image_filter = settings.PAGES_BLOG_POST_IMAGE_FILTER
+        blog_posts = with_renditions(
+            BlogPage.objects.child_of(page).live().public(),
+            "featured_image",
+            image_filter,
+            *rendition_specs(),
+        ).order_by("-first_published_at")[:10]
+        return [
+            {
+                "id": post.id,
+                "title": post.title,
+                "slug": post.slug,
+                "intro": post.intro,
+                "date": post.date,
+                "featured_image": existing_rendition_url(post.featured_image, image_filter),
+                "featured_image_renditions": image_manifest(post.featured_image),
+            } for post in blog_posts
+        ]
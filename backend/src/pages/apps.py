@@ -7,4 +7,8 @@ class PagesConfig(AppConfig):
     
     default_auto_field = "django.db.models.BigAutoField"
     name = "pages"
-    verbose_name = "Pages"
\ No newline at end of file
+    verbose_name = "Pages"
+
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
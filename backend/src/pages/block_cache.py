@@ -0,0 +1,155 @@
+"""Cache of the API representation of StreamField blocks.
+
+The API representation of a top-level block only depends on its raw JSON
+value, on the block definition and on the renditions of the images it shows.
+Serialized blocks are memoized under a hash of the raw value and of the block
+schema, first in a bounded per-process LRU and then in the shared cache, so a
+block that stays the same across revisions or is reused on other pages is
+serialized only once.
+
+Keys also carry the image rendition generation (see ``core.renditions``),
+which moves on whenever new renditions are generated or images are deleted.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.migrations.serializer import serializer_factory
+from wagtail import fields
+from wagtail.api.v2 import serializers
+
+from core.cache import get_generation
+from core.renditions import GENERATION_NAMESPACE as RENDITION_GENERATION_NAMESPACE
+
+# Bump when the get_api_representation of any block changes
+SCHEMA_VERSION = 1
+
+BLOCK_KEY = 'pages_block:{schema}:{generation}:{digest}'
+
+_missing = object()
+
+
+class LocalBlockCache:
+    """Bounded least-recently-used memo of serialized blocks."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key, _missing)
+            if value is not _missing:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.PAGES_BLOCK_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalBlockCache()
+
+
+def schema_version(block):
+    """Return a digest of the definition of ``block``.
+
+    The definition is serialized the way migrations write it, so any change
+    to the block or its children yields a new version. It is computed once
+    per block instance.
+    """
+    version = getattr(block, '_api_schema_version', None)
+    if version is None:
+        definition, _ = serializer_factory(block).serialize()
+        version = hashlib.sha256(
+            f'{SCHEMA_VERSION}:{block.name}:{definition}'.encode()
+        ).hexdigest()[:16]
+        block._api_schema_version = version
+    return version
+
+
+def block_key(block, raw_value, generation):
+    """Return the cache key of the API representation of a block value."""
+    digest = hashlib.sha256(
+        json.dumps(raw_value, sort_keys=True, separators=(',', ':')).encode()
+    ).hexdigest()
+    return BLOCK_KEY.format(
+        schema=schema_version(block), generation=generation, digest=digest
+    )
+
+
+def stream_api_representation(stream_value, context=None):
+    """Return the API representation of a StreamField value.
+
+    Matches ``StreamBlock.get_api_representation``, but only blocks missing
+    from both caches are converted and serialized, and the shared cache is
+    read and written once per stream.
+    """
+    if stream_value is None:
+        return []
+
+    child_blocks = stream_value.stream_block.child_blocks
+    generation = get_generation(RENDITION_GENERATION_NAMESPACE)
+
+    entries = []
+    for index, raw in enumerate(stream_value.raw_data):
+        block = child_blocks.get(raw['type'])
+        if block is not None:
+            entries.append((index, raw, block_key(block, raw['value'], generation)))
+
+    values = {}
+    for _, _, key in entries:
+        value = local_cache.get(key)
+        if value is not _missing:
+            values[key] = value
+
+    missing = [key for _, _, key in entries if key not in values]
+    if missing:
+        found = cache.get_many(missing)
+        for key, value in found.items():
+            local_cache.set(key, value)
+        values.update(found)
+
+    serialized = {}
+    for index, _, key in entries:
+        if key not in values:
+            child = stream_value[index]
+            value = child.block.get_api_representation(child.value, context=context)
+            values[key] = serialized[key] = value
+            local_cache.set(key, value)
+    if serialized:
+        cache.set_many(serialized, settings.PAGES_BLOCK_CACHE_TIMEOUT)
+
+    return [
+        {'type': raw['type'], 'value': values[key], 'id': raw.get('id')}
+        for _, raw, key in entries
+    ]
+
+
+class CachedStreamField(serializers.StreamField):
+    """API field serializing StreamField blocks through the block cache."""
+
+    def to_representation(self, value):
+        return stream_api_representation(value, self.context)
+
+
+class PageSerializer(serializers.PageSerializer):
+    """Page serializer using ``CachedStreamField`` for all StreamFields."""
+
+    serializer_field_mapping = {
+        **serializers.PageSerializer.serializer_field_mapping,
+        fields.StreamField: CachedStreamField,
+    }
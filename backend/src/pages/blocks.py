@@ -2,6 +2,8 @@
 from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 
+from core.renditions import image_manifest
+
 
 class HeroBlock(blocks.StructBlock):
     """Hero block with heading, subheading, CTA and background image."""
@@ -162,6 +164,12 @@ class ImageBlock(blocks.StructBlock):
         help_text="Image alignment"
     )
 
+    def get_api_representation(self, value, context=None):
+        """Add the srcset manifest of the image."""
+        representation = super().get_api_representation(value, context)
+        representation["renditions"] = image_manifest(value.get("image"))
+        return representation
+
     class Meta:
         template = "blocks/image_block.html"
         icon = "image"
@@ -742,6 +750,14 @@ class GalleryBlock(blocks.StructBlock):
         help_text="Number of columns (grid layout)"
     )
 
+    def get_api_representation(self, value, context=None):
+        """Add the srcset manifests of the images."""
+        representation = super().get_api_representation(value, context)
+        representation["renditions"] = [
+            image_manifest(image) for image in value.get("images") or []
+        ]
+        return representation
+
     class Meta:
         template = "blocks/gallery_block.html"
         icon = "image"
@@ -0,0 +1,37 @@
+"""Image helpers for the pages API.
+
+API responses only ever use renditions that already exist, see
+``core.renditions``; they never generate one while a request waits.
+"""
+from django.db.models import Prefetch
+from rest_framework import serializers
+from wagtail.images import get_image_model
+
+from core.renditions import image_manifest
+
+
+def with_renditions(queryset, field, *filter_specs):
+    """Join the image ``field`` into ``queryset`` and prefetch its renditions.
+
+    Only renditions for ``filter_specs`` are loaded, in one query for the
+    whole queryset.
+    """
+    Rendition = get_image_model().get_rendition_model()
+    return queryset.select_related(field).prefetch_related(
+        Prefetch(
+            f'{field}__renditions',
+            queryset=Rendition.objects.filter(filter_spec__in=filter_specs),
+            to_attr='prefetched_renditions',
+        )
+    )
+
+
+class ImageManifestField(serializers.Field):
+    """Read-only API field with the ``srcset`` manifest of an image."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, image):
+        return image_manifest(image)
@@ -35,6 +35,7 @@ from .blocks import (
     MapBlock,
     ProgressBarBlock,
 )
+from .images import ImageManifestField
 
 
 class SEOMixin(models.Model):
@@ -57,6 +58,7 @@ class SEOMixin(models.Model):
 
     api_fields = [
         APIField("og_image"),
+        APIField("og_image_renditions", serializer=ImageManifestField(source="og_image")),
     ]
 
     @property
@@ -387,6 +389,10 @@ class BlogPage(SEOMixin, Page):
         APIField("date"),
         APIField("intro"),
         APIField("featured_image"),
+        APIField(
+            "featured_image_renditions",
+            serializer=ImageManifestField(source="featured_image"),
+        ),
         APIField("content"),
     ] + SEOMixin.api_fields
 
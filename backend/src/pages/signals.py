@@ -0,0 +1,34 @@
+"""Signal handlers for the pages app."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.models import Page, PageViewRestriction
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from .cache import bump_pages_generation
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+def page_content_changed(sender, **kwargs):
+    """Invalidate cached API responses once a page change is committed."""
+    transaction.on_commit(bump_pages_generation)
+
+
+@receiver(post_delete, sender=Page)
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def page_visibility_changed(sender, **kwargs):
+    """Invalidate cached API responses when pages are deleted or restricted."""
+    transaction.on_commit(bump_pages_generation)
+
+
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def image_changed(sender, raw=False, **kwargs):
+    """Invalidate cached API responses that may embed an edited or deleted image."""
+    if raw:
+        return
+    transaction.on_commit(bump_pages_generation)
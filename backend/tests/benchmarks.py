@@ -0,0 +1,48 @@
+"""Shared helpers for the benchmark tests.
+
+Benchmark test cases collect one row of measurements per request pattern.
+The rows are only printed when the ``BENCHMARK_REPORT`` environment variable
+is set, e.g. ``BENCHMARK_REPORT=1 pytest -s tests/test_pages_api_benchmarks.py``.
+"""
+import os
+
+REPORT_ENV = 'BENCHMARK_REPORT'
+
+
+class BenchmarkMixin:
+    """Collect measurements per test case class and report them on request.
+
+    ``report_columns`` lists ``(heading, alignment, value format)`` for each
+    value of the rows passed to ``record``.
+    """
+
+    report_columns = ()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if os.environ.get(REPORT_ENV):
+            print(cls.format_report())
+
+    @classmethod
+    def format_report(cls):
+        """Return the collected measurements as a table."""
+        lines = ['', cls.__doc__.splitlines()[0]]
+        lines.append(''.join(
+            f'{heading:{align}}' for heading, align, _ in cls.report_columns
+        ))
+        for row in cls.results:
+            lines.append(''.join(
+                f'{value:{align}{spec}}'
+                for value, (_, align, spec) in zip(row, cls.report_columns, strict=True)
+            ))
+        return '\n'.join(lines)
+
+    def record(self, *row):
+        """Add one row of measurements to the report."""
+        self.results.append(row)
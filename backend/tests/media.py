@@ -0,0 +1,26 @@
+"""Shared helpers for tests that store uploaded files."""
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+
+class TemporaryMediaMixin:
+    """Store the files uploaded by a test case class in a temporary MEDIA_ROOT.
+
+    The directory is created once per class and removed with everything in
+    it after the last test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
@@ -0,0 +1,137 @@
+"""Latency and query-budget benchmarks for the feature flag endpoints.
+
+Each endpoint is measured against 20, 200 and 2,000 flags linked in
+dependency chains, once with a cold snapshot and averaged over warm
+requests. The tests fail when an endpoint issues more queries than its
+budget; latencies are reported with ``BENCHMARK_REPORT=1 pytest -s``.
+"""
+import time
+
+from benchmarks import BenchmarkMixin
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.flags import invalidate_snapshot
+from core.models import FeatureFlag
+
+SIZES = (20, 200, 2000)
+CHAIN_LENGTH = 5
+WARM_REQUESTS = 10
+
+# Maximum queries per request as (cold, warm); they must not grow with the flag count
+QUERY_BUDGETS = {
+    'feature_flags': (1, 0),
+    'feature_flag_detail': (1, 0),
+    'feature_flags_by_category': (1, 0),
+    'wagtail_transition_status': (2, 0),
+}
+
+
+class FeatureFlagQueryBudgetTest(BenchmarkMixin, TestCase):
+    """Benchmark the feature flag endpoints and enforce their query budgets."""
+
+    report_columns = (
+        ('endpoint', '<28', ''),
+        ('flags', '>7', ''),
+        ('cold ms', '>10', '.2f'),
+        ('warm ms', '>10', '.2f'),
+        ('queries', '>10', ''),
+    )
+
+    def tearDown(self):
+        """Drop the snapshot so it does not leak rows between tests."""
+        invalidate_snapshot()
+
+    def seed_flags(self, count):
+        """Replace all flags with ``count`` flags in dependency chains."""
+        FeatureFlag.objects.all().delete()
+
+        categories = [choice for choice, _ in FeatureFlag.CATEGORY_CHOICES]
+        flags = FeatureFlag.objects.bulk_create([
+            FeatureFlag(
+                name=f'BENCH_FLAG_{index:05d}',
+                display_name=f'Benchmark Flag {index}',
+                category=categories[index % len(categories)],
+                is_enabled=index % 3 != 0,
+                is_deprecated=index % 7 == 0,
+                rollout_percentage=50 if index % 4 == 0 else 100,
+            )
+            for index in range(count)
+        ])
+
+        # Every flag depends on the previous one within its chain
+        through = FeatureFlag.dependencies.through
+        through.objects.bulk_create([
+            through(from_featureflag=flag, to_featureflag=flags[index - 1])
+            for index, flag in enumerate(flags)
+            if index % CHAIN_LENGTH
+        ])
+        return flags
+
+    def measure(self, endpoint, url, size, params=None):
+        """Request ``url`` cold and warm and check the query budget."""
+        cold_budget, warm_budget = QUERY_BUDGETS[endpoint]
+
+        cache.clear()
+        invalidate_snapshot()
+        with CaptureQueriesContext(connection) as cold_queries:
+            start = time.perf_counter()
+            response = self.client.get(url, params)
+            cold = time.perf_counter() - start
+        self.assertEqual(response.status_code, 200)
+
+        with CaptureQueriesContext(connection) as warm_queries:
+            start = time.perf_counter()
+            responses = [self.client.get(url, params) for _ in range(WARM_REQUESTS)]
+            warm = (time.perf_counter() - start) / WARM_REQUESTS
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+
+        warm_per_request = len(warm_queries) / WARM_REQUESTS
+        self.record(endpoint, size, cold * 1000, warm * 1000, len(cold_queries))
+
+        self.assertLessEqual(
+            len(cold_queries), cold_budget,
+            f'{endpoint} with {size} flags: {len(cold_queries)} cold queries',
+        )
+        self.assertLessEqual(
+            warm_per_request, warm_budget,
+            f'{endpoint} with {size} flags: {warm_per_request} warm queries',
+        )
+
+    def test_feature_flags_budget(self):
+        """Benchmark FeatureFlagsAPIView."""
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.seed_flags(size)
+                self.measure(
+                    'feature_flags', reverse('core:feature_flags'), size,
+                    {'user_id': '42'},
+                )
+
+    def test_feature_flag_detail_budget(self):
+        """Benchmark feature_flag_detail on the end of a dependency chain."""
+        for size in SIZES:
+            with self.subTest(size=size):
+                flags = self.seed_flags(size)
+                url = reverse('core:feature_flag_detail', args=[flags[CHAIN_LENGTH - 1].name])
+                self.measure('feature_flag_detail', url, size, {'user_id': '42'})
+
+    def test_feature_flags_by_category_budget(self):
+        """Benchmark feature_flags_by_category."""
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.seed_flags(size)
+                url = reverse('core:feature_flags_by_category', args=['CONTENT'])
+                self.measure('feature_flags_by_category', url, size)
+
+    def test_wagtail_transition_status_budget(self):
+        """Benchmark wagtail_transition_status."""
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.seed_flags(size)
+                url = reverse('core:wagtail_transition_status')
+                self.measure('wagtail_transition_status', url, size)
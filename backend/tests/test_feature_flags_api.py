@@ -0,0 +1,668 @@
+"""Tests for the feature flags API."""
+import asyncio
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from core.api import feature_flags_stream
+from core.bucketing import in_rollout, user_bucket
+from core.cache import bump_generation, get_generation
+from core.flags import (
+    GENERATION_NAMESPACE,
+    build_snapshot,
+    get_snapshot,
+    invalidate_snapshot,
+)
+from core.models import FeatureFlag
+from core.stats import compute_flag_statistics, get_flag_statistics
+from core.streams import flag_events
+
+User = get_user_model()
+
+
+class FeatureFlagBaseTest(TestCase):
+    """Base test class for feature flag tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        invalidate_snapshot()
+
+        self.navbar = FeatureFlag.objects.create(
+            name='WAGTAIL_NAVBAR',
+            display_name='Wagtail Managed Navbar',
+            category='NAVIGATION',
+            is_enabled=True,
+        )
+        self.footer = FeatureFlag.objects.create(
+            name='WAGTAIL_FOOTER',
+            display_name='Wagtail Managed Footer',
+            category='NAVIGATION',
+            is_enabled=False,
+        )
+        self.layout = FeatureFlag.objects.create(
+            name='WAGTAIL_LAYOUT',
+            display_name='Wagtail Layout System',
+            category='NAVIGATION',
+            is_enabled=True,
+        )
+        self.layout.dependencies.add(self.navbar, self.footer)
+        self.blog = FeatureFlag.objects.create(
+            name='WAGTAIL_BLOG',
+            display_name='Wagtail Blog System',
+            category='CONTENT',
+            is_enabled=True,
+            rollout_percentage=50,
+        )
+
+    def tearDown(self):
+        """Drop the snapshot so it does not leak rows between tests."""
+        invalidate_snapshot()
+
+
+class FlagSnapshotTest(FeatureFlagBaseTest):
+    """Test the compiled flag snapshot."""
+
+    def test_build_snapshot_single_query(self):
+        """Test that the snapshot loads flags and dependencies in one query."""
+        with self.assertNumQueries(1):
+            snapshot = build_snapshot()
+
+        self.assertEqual(len(snapshot), 4)
+        self.assertEqual(
+            snapshot.get('WAGTAIL_LAYOUT').dependencies,
+            ('WAGTAIL_FOOTER', 'WAGTAIL_NAVBAR'),
+        )
+        self.assertEqual(snapshot.get('WAGTAIL_NAVBAR').dependencies, ())
+
+    def test_dependencies_met(self):
+        """Test dependency resolution against the snapshot."""
+        snapshot = build_snapshot()
+
+        self.assertFalse(snapshot.dependencies_met(snapshot.get('WAGTAIL_LAYOUT')))
+        self.assertTrue(snapshot.dependencies_met(snapshot.get('WAGTAIL_NAVBAR')))
+
+    def test_date_window(self):
+        """Test that start and end dates are applied at evaluation time."""
+        now = timezone.now()
+        self.navbar.start_date = now + timedelta(days=1)
+        self.navbar.save()
+
+        rule = build_snapshot().get('WAGTAIL_NAVBAR')
+
+        self.assertFalse(rule.is_active(now))
+        self.assertTrue(rule.is_active(now + timedelta(days=2)))
+
+    def test_rollout_matches_md5_bucketing(self):
+        """Test that user rollouts keep the historical md5 buckets."""
+        snapshot = build_snapshot()
+        rule = snapshot.get('WAGTAIL_BLOG')
+
+        for user_id in ['1', '42', 'abc', 'user-9000']:
+            user_hash = hashlib.md5(f"{user_id}WAGTAIL_BLOG".encode()).hexdigest()
+            expected = int(user_hash[:8], 16) % 100 + 1 <= 50
+            self.assertEqual(snapshot.should_show_for_user(rule, user_id), expected)
+
+    def test_snapshot_invalidated_on_save(self):
+        """Test that saving a flag bumps the generation and rebuilds the snapshot."""
+        snapshot = get_snapshot()
+        self.assertIs(get_snapshot(), snapshot)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.footer.is_enabled = True
+            self.footer.save()
+
+        self.assertEqual(
+            get_generation(GENERATION_NAMESPACE), snapshot.generation + 1
+        )
+        self.assertIsNot(get_snapshot(), snapshot)
+        self.assertTrue(get_snapshot().get('WAGTAIL_FOOTER').is_enabled)
+
+    def test_snapshot_rebuilt_after_remote_bump(self):
+        """Test that a generation bump from another worker rebuilds the snapshot."""
+        snapshot = get_snapshot()
+
+        # Another worker changed a flag: only the shared counter moves
+        bump_generation(GENERATION_NAMESPACE)
+
+        self.assertIsNot(get_snapshot(), snapshot)
+
+    def test_snapshot_invalidated_on_dependency_change(self):
+        """Test that changing dependencies rebuilds the snapshot."""
+        get_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.layout.dependencies.remove(self.footer)
+
+        self.assertEqual(
+            get_snapshot().get('WAGTAIL_LAYOUT').dependencies,
+            ('WAGTAIL_NAVBAR',),
+        )
+
+
+class FlagDependencyGraphTest(FeatureFlagBaseTest):
+    """Test dependency resolution of the flag snapshot."""
+
+    def setUp(self):
+        """Add a dependency chain on top of the base flags."""
+        super().setUp()
+        self.footer.is_enabled = True
+        self.footer.save()
+        # SEO -> META -> LAYOUT -> (NAVBAR, FOOTER)
+        self.meta = FeatureFlag.objects.create(
+            name='WAGTAIL_META', display_name='Wagtail Meta Tags', is_enabled=True
+        )
+        self.seo = FeatureFlag.objects.create(
+            name='WAGTAIL_SEO', display_name='Wagtail SEO Management', is_enabled=True
+        )
+        self.meta.dependencies.add(self.layout)
+        self.seo.dependencies.add(self.meta)
+
+    def test_topological_order(self):
+        """Test that every flag is ordered after its dependencies."""
+        snapshot = build_snapshot()
+        position = {name: index for index, name in enumerate(snapshot.order)}
+
+        for rule in snapshot.rules:
+            for dep in rule.dependencies:
+                self.assertLess(position[dep], position[rule.name])
+
+    def test_transitive_dependencies(self):
+        """Test that a disabled flag deep in the chain disables its dependents."""
+        self.navbar.is_enabled = False
+        self.navbar.save()
+        snapshot = build_snapshot()
+
+        for name in ['WAGTAIL_LAYOUT', 'WAGTAIL_META', 'WAGTAIL_SEO']:
+            self.assertFalse(snapshot.dependencies_met(snapshot.get(name)))
+        self.assertTrue(snapshot.get('WAGTAIL_SEO').is_active(timezone.now()))
+
+    def test_effective_state_follows_date_windows(self):
+        """Test that memoized states are recomputed when a date boundary passes."""
+        now = timezone.now()
+        self.navbar.end_date = now + timedelta(hours=1)
+        self.navbar.save()
+        snapshot = build_snapshot()
+        seo = snapshot.get('WAGTAIL_SEO')
+
+        self.assertTrue(snapshot.is_effective(seo, now))
+        self.assertTrue(snapshot.is_effective(seo, now + timedelta(hours=1)))
+        self.assertFalse(snapshot.is_effective(seo, now + timedelta(hours=2)))
+        self.assertTrue(snapshot.is_effective(seo, now))
+
+    def test_evaluation_without_queries(self):
+        """Test that transitive evaluation never touches the database."""
+        snapshot = build_snapshot()
+
+        with self.assertNumQueries(0):
+            flags = snapshot.evaluate(user_id='42')
+
+        self.assertTrue(flags['WAGTAIL_SEO'])
+
+    def test_cycle_rejected_on_add(self):
+        """Test that closing a dependency cycle raises a validation error."""
+        # add() does not use a savepoint, so isolate the failing calls
+        with self.assertRaises(ValidationError), transaction.atomic():
+            self.navbar.dependencies.add(self.seo)
+
+        with self.assertRaises(ValidationError), transaction.atomic():
+            self.seo.featureflag_set.add(self.navbar)
+
+        self.assertFalse(self.navbar.dependencies.exists())
+
+    def test_find_dependency_cycle(self):
+        """Test that the reported cycle names every flag on it."""
+        self.assertEqual(
+            self.navbar.find_dependency_cycle([self.seo]),
+            ['WAGTAIL_NAVBAR', 'WAGTAIL_SEO', 'WAGTAIL_META',
+             'WAGTAIL_LAYOUT', 'WAGTAIL_NAVBAR'],
+        )
+        self.assertIsNone(self.navbar.find_dependency_cycle([self.blog]))
+        self.assertEqual(
+            self.navbar.find_dependency_cycle([self.navbar]),
+            ['WAGTAIL_NAVBAR', 'WAGTAIL_NAVBAR'],
+        )
+
+    def test_existing_cycle_disables_flags(self):
+        """Test that cycles already stored in the database never evaluate as met."""
+        through = FeatureFlag.dependencies.through
+        # bulk_create bypasses the m2m_changed guard
+        through.objects.bulk_create([
+            through(from_featureflag=self.navbar, to_featureflag=self.seo),
+        ])
+        snapshot = build_snapshot()
+
+        self.assertIn('WAGTAIL_NAVBAR', snapshot.cyclic)
+        self.assertFalse(snapshot.dependencies_met(snapshot.get('WAGTAIL_SEO')))
+        self.assertTrue(snapshot.dependencies_met(snapshot.get('WAGTAIL_BLOG')))
+
+
+class RolloutBucketingTest(TestCase):
+    """Test rollout bucketing."""
+
+    def test_buckets_match_legacy_md5_parsing(self):
+        """Test that no user switches cohorts compared to the hex parsing scheme."""
+        for user_id in range(500):
+            user_hash = hashlib.md5(f"{user_id}WAGTAIL_BLOG".encode()).hexdigest()
+            expected = int(user_hash[:8], 16) % 100 + 1
+            self.assertEqual(user_bucket(user_id, 'WAGTAIL_BLOG'), expected)
+
+    def test_in_rollout_bounds(self):
+        """Test that 0% and 100% rollouts never depend on the bucket."""
+        self.assertTrue(in_rollout('42', 'WAGTAIL_BLOG', 100))
+        self.assertFalse(in_rollout('42', 'WAGTAIL_BLOG', 0))
+
+    def test_salt_reshuffles_buckets(self):
+        """Test that a flag salt replaces the name as bucketing key."""
+        flag = FeatureFlag.objects.create(
+            name='WAGTAIL_BLOG',
+            display_name='Wagtail Blog System',
+            is_enabled=True,
+            rollout_percentage=50,
+            rollout_salt='blog-relaunch',
+        )
+        rule = build_snapshot().get(flag.name)
+
+        self.assertEqual(rule.bucket_key, 'blog-relaunch')
+        buckets = [user_bucket(user_id, rule.bucket_key) for user_id in range(100)]
+        self.assertNotEqual(
+            buckets, [user_bucket(user_id, flag.name) for user_id in range(100)]
+        )
+
+
+class FeatureFlagsAPITest(FeatureFlagBaseTest):
+    """Test the feature flag API endpoints."""
+
+    def test_feature_flags_list(self):
+        """Test listing feature flags for anonymous users."""
+        response = self.client.get(reverse('core:feature_flags'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        # Layout is hidden because footer is disabled, blog is only partially rolled out
+        self.assertEqual(data['flags'], {'WAGTAIL_FOOTER': False, 'WAGTAIL_NAVBAR': True})
+
+    def test_feature_flags_list_without_queries(self):
+        """Test that a warm snapshot serves the flags without database access."""
+        get_snapshot()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('core:feature_flags'), {'user_id': '7'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_toggle_visible_immediately(self):
+        """Test that a toggle is served on the next request without waiting for a TTL."""
+        url = reverse('core:feature_flags')
+        self.assertNotIn('WAGTAIL_LAYOUT', self.client.get(url).json()['flags'])
+
+        staff = User.objects.create_user('staff', password='secret', is_staff=True)
+        self.client.force_login(staff)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('core:toggle_feature_flag', args=['WAGTAIL_FOOTER'])
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertTrue(self.client.get(url).json()['flags']['WAGTAIL_LAYOUT'])
+
+    def test_feature_flag_detail(self):
+        """Test retrieving a single feature flag."""
+        url = reverse('core:feature_flag_detail', args=['WAGTAIL_LAYOUT'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data['name'], 'WAGTAIL_LAYOUT')
+        self.assertTrue(data['is_active'])
+        self.assertFalse(data['dependencies_met'])
+        self.assertEqual(data['dependencies'], ['WAGTAIL_FOOTER', 'WAGTAIL_NAVBAR'])
+
+    def test_feature_flag_detail_not_found(self):
+        """Test retrieving an unknown feature flag."""
+        url = reverse('core:feature_flag_detail', args=['MISSING'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_feature_flags_by_category(self):
+        """Test listing active flags of a category."""
+        url = reverse('core:feature_flags_by_category', args=['NAVIGATION'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.json()['flags']), ['WAGTAIL_NAVBAR'])
+
+
+class FeatureFlagsConditionalGetTest(FeatureFlagBaseTest):
+    """Test ETag revalidation of the feature flag endpoints."""
+
+    def test_etag_revalidation(self):
+        """Test that every flags endpoint answers a matching If-None-Match with 304."""
+        urls = [
+            reverse('core:feature_flags'),
+            reverse('core:feature_flag_detail', args=['WAGTAIL_LAYOUT']),
+            reverse('core:feature_flags_by_category', args=['NAVIGATION']),
+        ]
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+
+    def test_etag_changes_with_flag_set(self):
+        """Test that a flag change invalidates previously issued ETags."""
+        url = reverse('core:feature_flags')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.footer.is_enabled = True
+            self.footer.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_changes_at_date_boundary(self):
+        """Test that crossing a start date produces a new ETag."""
+        now = timezone.now()
+        self.footer.start_date = now + timedelta(hours=1)
+        self.footer.save()
+        snapshot = build_snapshot(generation=1)
+
+        self.assertEqual(snapshot.etag(now), snapshot.etag(now + timedelta(minutes=30)))
+        self.assertNotEqual(snapshot.etag(now), snapshot.etag(now + timedelta(hours=2)))
+
+
+class FeatureFlagsStreamTest(FeatureFlagBaseTest):
+    """Test the server-sent event stream of flag changes."""
+
+    def enable_footer(self):
+        """Enable the footer and publish the change like a committed save."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.footer.is_enabled = True
+            self.footer.save()
+
+    async def test_stream_pushes_deltas(self):
+        """Test that a flag change is pushed to connected streams as a delta."""
+        events = flag_events()
+        try:
+            first = await anext(events)
+            self.assertTrue(first.startswith('event: flags\n'))
+            self.assertEqual(
+                json.loads(first.split('data: ')[1])['flags'],
+                {'WAGTAIL_FOOTER': False, 'WAGTAIL_NAVBAR': True},
+            )
+
+            await sync_to_async(self.enable_footer)()
+
+            delta = await asyncio.wait_for(anext(events), timeout=5)
+            self.assertTrue(delta.startswith('event: delta\n'))
+            self.assertEqual(
+                json.loads(delta.split('data: ')[1])['changed'],
+                {'WAGTAIL_FOOTER': True, 'WAGTAIL_LAYOUT': True},
+            )
+        finally:
+            await events.aclose()
+
+    async def test_stream_response(self):
+        """Test that the stream endpoint serves an unbuffered event stream."""
+        request = AsyncRequestFactory().get(reverse('core:feature_flags_stream'))
+
+        response = await feature_flags_stream(request)
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['X-Accel-Buffering'], 'no')
+        await response.streaming_content.aclose()
+
+    def test_stream_refused_under_wsgi(self):
+        """Test that the stream is refused instead of hanging a WSGI worker."""
+        response = self.client.get(reverse('core:feature_flags_stream'))
+
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertFalse(response.streaming)
+
+
+class FlagStatisticsTest(FeatureFlagBaseTest):
+    """Test the shared flag statistics service."""
+
+    def test_statistics_single_query(self):
+        """Test that all counts come from one aggregate query."""
+        with self.assertNumQueries(1):
+            stats = compute_flag_statistics()
+
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['enabled'], 3)
+        self.assertEqual(stats['deprecated'], 0)
+        self.assertEqual(
+            stats['categories'],
+            {
+                'CONTENT': {'total': 1, 'enabled': 1, 'deprecated': 0},
+                'NAVIGATION': {'total': 3, 'enabled': 2, 'deprecated': 0},
+            },
+        )
+
+    def test_statistics_cached_until_change(self):
+        """Test that statistics are cached and recomputed after a flag change."""
+        get_flag_statistics()
+        with self.assertNumQueries(0):
+            get_flag_statistics()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog.is_deprecated = True
+            self.blog.save()
+
+        self.assertEqual(get_flag_statistics()['deprecated'], 1)
+
+    def test_wagtail_transition_status(self):
+        """Test the transition status endpoint built from statistics."""
+        get_flag_statistics()
+        get_snapshot()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('core:wagtail_transition_status'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data['overall_progress']['total_flags'], 4)
+        self.assertEqual(data['overall_progress']['progress_percentage'], 75.0)
+        navigation = data['categories']['NAVIGATION']
+        self.assertEqual(navigation['enabled'], 2)
+        self.assertEqual(
+            [flag['name'] for flag in navigation['flags']],
+            ['WAGTAIL_FOOTER', 'WAGTAIL_LAYOUT', 'WAGTAIL_NAVBAR'],
+        )
+
+
+class FeatureFlagsBatchAPITest(FeatureFlagBaseTest):
+    """Test the batch feature flag evaluation endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.url = reverse('core:feature_flags_batch')
+
+    def test_batch_matches_single_user_endpoint(self):
+        """Test that the matrix agrees with per-user evaluation."""
+        user_ids = [str(user_id) for user_id in range(50)] + [123]
+
+        response = self.client.post(
+            self.url, {'user_ids': user_ids}, content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data['users'], user_ids)
+        self.assertEqual(len(data['matrix']), len(user_ids))
+
+        for user_id, row in zip(user_ids, data['matrix'], strict=True):
+            single = self.client.get(
+                reverse('core:feature_flags'), {'user_id': user_id}
+            ).json()['flags']
+            expected = ''.join(
+                '1' if single.get(name) else '0' for name in data['flags']
+            )
+            self.assertEqual(row, expected)
+
+    def test_batch_requires_user_list(self):
+        """Test that malformed payloads are rejected."""
+        for payload in ({'user_ids': 'abc'}, [1, 2], {'user_ids': [1, True]}):
+            with self.subTest(payload=payload):
+                response = self.client.post(
+                    self.url, payload, content_type='application/json'
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_size_limit(self):
+        """Test that oversized batches are rejected."""
+        with self.settings(FEATURE_FLAG_BATCH_MAX_USERS=2):
+            response = self.client.post(
+                self.url, {'user_ids': ['1', '2', '3']}, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+def evaluate_ruleset(document, user_id=None, now=None):
+    """Evaluate an exported ruleset the way a client would."""
+    now = now or timezone.now()
+    rows = [dict(zip(document['fields'], flag, strict=True)) for flag in document['flags']]
+
+    def is_active(row):
+        if row['start'] and now < datetime.fromisoformat(row['start']):
+            return False
+        if row['end'] and now > datetime.fromisoformat(row['end']):
+            return False
+        return row['enabled']
+
+    active = {row['name']: is_active(row) for row in rows}
+    flags = {}
+    for row in rows:
+        if not all(active.get(dep, True) for dep in row['deps']):
+            continue
+        if user_id:
+            digest = hashlib.md5(f"{user_id}{row['key']}".encode()).digest()
+            visible = int.from_bytes(digest[:4], 'big') % 100 + 1 <= row['rollout']
+        else:
+            visible = row['rollout'] == 100
+        if visible:
+            flags[row['name']] = active[row['name']]
+    return flags
+
+
+class FeatureFlagsRulesetTest(FeatureFlagBaseTest):
+    """Test the signed ruleset export for client-side evaluation."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.url = reverse('core:feature_flags_ruleset')
+        self.hero = FeatureFlag.objects.create(
+            name='WAGTAIL_HERO',
+            display_name='Wagtail Hero',
+            category='CONTENT',
+            is_enabled=True,
+            rollout_salt='hero-v2',
+            rollout_percentage=30,
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.hero.dependencies.add(self.layout)
+
+    @override_settings(FEATURE_FLAG_RULESET_SIGNING_KEY='ruleset-key')
+    def test_ruleset_is_signed(self):
+        """Test that the signature covers the exact response body."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = hmac.new(
+            settings.FEATURE_FLAG_RULESET_SIGNING_KEY.encode(),
+            response.content,
+            hashlib.sha256,
+        ).hexdigest()
+        self.assertEqual(response['X-Ruleset-Signature'], f'sha256={expected}')
+        self.assertIn('public', response['Cache-Control'])
+
+    @override_settings(FEATURE_FLAG_RULESET_SIGNING_KEY='')
+    def test_ruleset_unsigned_without_key(self):
+        """Test that the ruleset is never signed with another key."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Ruleset-Signature', response)
+
+    def test_ruleset_resolves_dependencies_transitively(self):
+        """Test that dependencies are exported with their transitive closure."""
+        document = self.client.get(self.url).json()
+        rows = {
+            flag[0]: dict(zip(document['fields'], flag, strict=True)) for flag in document['flags']
+        }
+
+        self.assertEqual(
+            rows['WAGTAIL_HERO']['deps'],
+            ['WAGTAIL_FOOTER', 'WAGTAIL_LAYOUT', 'WAGTAIL_NAVBAR'],
+        )
+        self.assertEqual(rows['WAGTAIL_HERO']['key'], 'hero-v2')
+        self.assertEqual(rows['WAGTAIL_BLOG']['key'], 'WAGTAIL_BLOG')
+
+    def test_client_evaluation_matches_server(self):
+        """Test that local evaluation agrees with the flags endpoint."""
+        self.footer.is_enabled = True
+        self.footer.save()
+        document = self.client.get(self.url).json()
+
+        for user_id in [None] + [str(user_id) for user_id in range(100)]:
+            params = {'user_id': user_id} if user_id else {}
+            server = self.client.get(reverse('core:feature_flags'), params).json()
+            self.assertEqual(evaluate_ruleset(document, user_id), server['flags'])
+
+    def test_ruleset_version_and_revalidation(self):
+        """Test that the ETag follows the flag-set version."""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        self.assertEqual(etag, f'"ruleset-{response.json()["version"]}"')
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog.rollout_percentage = 80
+            self.blog.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_cyclic_flags_are_left_out(self):
+        """Test that flags in a dependency cycle are not exported."""
+        FeatureFlag.dependencies.through.objects.create(
+            from_featureflag=self.navbar, to_featureflag=self.hero
+        )
+        bump_generation(GENERATION_NAMESPACE)
+
+        document = self.client.get(self.url).json()
+        names = {flag[0] for flag in document['flags']}
+
+        self.assertEqual(names, {'WAGTAIL_BLOG', 'WAGTAIL_FOOTER'})
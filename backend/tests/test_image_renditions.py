@@ -0,0 +1,249 @@
+"""Tests for the pre-generated image rendition pipeline."""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from media import TemporaryMediaMixin
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from core import renditions
+from core.models import ImageRenditionJob
+from core.renditions import (
+    claim_jobs,
+    generate_pending,
+    image_manifest,
+    page_image_ids,
+    queue_images,
+    queue_stats,
+    rendition_specs,
+)
+from core.seo import get_og_image_url
+from pages.models import BlogIndexPage, BlogPage
+
+Rendition = Image.get_rendition_model()
+
+
+@override_settings(
+    IMAGE_RENDITION_WIDTHS=[40, 80],
+    IMAGE_RENDITION_FORMATS=['original', 'webp', 'avif'],
+    IMAGE_RENDITION_EXTRA_FILTERS=['width-1200'],
+    PAGES_API_CACHE_TIMEOUT=0,
+)
+class ImageRenditionTestCase(TemporaryMediaMixin, TestCase):
+    """Render small test images with a reduced set of renditions."""
+
+    def setUp(self):
+        """Clear cached renditions."""
+        cache.clear()
+
+    def make_image(self, title='Image'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Image.objects.create(title=title, file=get_test_image_file())
+
+
+class RenditionQueueTest(ImageRenditionTestCase):
+    """Test queueing and generating renditions."""
+
+    def test_upload_queues_image(self):
+        """Test that saving an image queues its renditions."""
+        image = self.make_image()
+
+        self.assertTrue(ImageRenditionJob.objects.filter(image=image).exists())
+        self.assertFalse(Rendition.objects.exists())
+
+    def test_generate_pending(self):
+        """Test that queued images get every configured rendition."""
+        image = self.make_image()
+
+        self.assertEqual(generate_pending(), (1, 0))
+
+        specs = set(Rendition.objects.filter(image=image).values_list('filter_spec', flat=True))
+        self.assertEqual(specs, set(rendition_specs()))
+        self.assertIn('width-80|format-avif', specs)
+        self.assertFalse(ImageRenditionJob.objects.exists())
+        self.assertEqual(generate_pending(), (0, 0))
+
+    def test_failures_retried_then_given_up(self):
+        """Test that images failing to render are retried a limited number of times."""
+        image = self.make_image()
+        image.file.storage.delete(image.file.name)
+
+        with self.settings(IMAGE_RENDITION_MAX_ATTEMPTS=2):
+            self.assertEqual(generate_pending(), (0, 1))
+            self.assertEqual(generate_pending(), (0, 1))
+            self.assertEqual(generate_pending(), (0, 0))
+
+            job = ImageRenditionJob.objects.get(image=image)
+            self.assertEqual(job.attempts, 2)
+            self.assertTrue(job.last_error)
+            self.assertEqual(queue_stats()['failed'], 1)
+
+        # Queueing the image again resets the job
+        queue_images([image.pk])
+        self.assertEqual(ImageRenditionJob.objects.get(image=image).attempts, 0)
+
+    def test_claimed_batch_leased(self):
+        """Test that claimed images are skipped by other workers until the lease ends."""
+        for title in ('First', 'Second', 'Third'):
+            self.make_image(title)
+        now = timezone.now()
+
+        self.assertEqual(len(claim_jobs(2, now)), 2)
+        self.assertEqual(len(claim_jobs(10, now)), 1)
+        self.assertEqual(claim_jobs(10, now + timedelta(seconds=599)), [])
+
+        # A worker that died mid-batch leaves its images to others
+        self.assertEqual(len(claim_jobs(10, now + timedelta(seconds=600))), 3)
+
+    def test_queued_again_while_generating(self):
+        """Test that an image queued during generation is generated again."""
+        image = self.make_image()
+
+        def requeue(image):
+            queue_images([image.pk])
+
+        with mock.patch.object(renditions, 'generate_renditions', side_effect=requeue):
+            self.assertEqual(generate_pending(), (1, 0))
+
+        job = ImageRenditionJob.objects.get(image=image)
+        self.assertIsNone(job.leased_until)
+        self.assertEqual(generate_pending(), (1, 0))
+        self.assertFalse(ImageRenditionJob.objects.exists())
+
+    def test_command(self):
+        """Test that the command can queue and process every image."""
+        self.make_image()
+        ImageRenditionJob.objects.all().delete()
+        out = StringIO()
+
+        call_command('generate_renditions', all=True, stdout=out)
+
+        self.assertIn('Generated renditions of 1 image(s), 0 failed', out.getvalue())
+        self.assertIn('Queue: 0 pending, 0 failed', out.getvalue())
+        self.assertTrue(Rendition.objects.exists())
+
+    def test_manifest(self):
+        """Test that the manifest lists generated renditions per format."""
+        image = self.make_image()
+        self.assertEqual(image_manifest(image)['srcset'], {})
+
+        generate_pending()
+        manifest = image_manifest(Image.objects.get(pk=image.pk))
+
+        self.assertEqual(manifest['src'], image.file.url)
+        self.assertEqual(set(manifest['srcset']), {'original', 'webp', 'avif'})
+        webp = manifest['srcset']['webp'].split(', ')
+        self.assertEqual(len(webp), 2)
+        self.assertTrue(webp[0].endswith('.webp 40w'))
+        self.assertTrue(webp[1].endswith('.webp 80w'))
+
+    def test_og_image_url_never_generates(self):
+        """Test that the Open Graph URL falls back to the original file."""
+        page = BlogPage(featured_image=self.make_image())
+        request = RequestFactory().get('/')
+
+        self.assertEqual(get_og_image_url(page, request), page.featured_image.file.url)
+        self.assertFalse(Rendition.objects.exists())
+
+        generate_pending()
+        rendition = Rendition.objects.get(filter_spec='width-1200')
+        self.assertEqual(get_og_image_url(page, request), rendition.url)
+
+
+class PageRenditionTest(ImageRenditionTestCase):
+    """Test renditions of images used by pages."""
+
+    def setUp(self):
+        """Set up a blog post using images in fields and blocks."""
+        super().setUp()
+        self.featured = self.make_image('Featured')
+        self.og = self.make_image('Social')
+        self.block_image = self.make_image('Block')
+        self.gallery = [self.make_image('Gallery 1'), self.make_image('Gallery 2')]
+        ImageRenditionJob.objects.all().delete()
+
+        root = Site.objects.get(is_default_site=True).root_page
+        blog_index = root.add_child(instance=BlogIndexPage(title='Blog', slug='blog'))
+        self.post = blog_index.add_child(instance=BlogPage(
+            title='Post',
+            slug='post',
+            intro='Post with images',
+            featured_image=self.featured,
+            og_image=self.og,
+            content=[
+                ('image', {'image': self.block_image, 'caption': 'Block'}),
+                ('text', {'content': '<p>Body</p>'}),
+            ],
+        ))
+
+    def test_page_image_ids(self):
+        """Test that images in fields and StreamField blocks are found."""
+        self.assertEqual(
+            page_image_ids(self.post),
+            {self.featured.pk, self.og.pk, self.block_image.pk},
+        )
+
+    def test_publish_queues_page_images(self):
+        """Test that publishing a page queues all of its images."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save_revision().publish()
+
+        self.assertEqual(
+            set(ImageRenditionJob.objects.values_list('image_id', flat=True)),
+            {self.featured.pk, self.og.pk, self.block_image.pk},
+        )
+
+    def test_api_embeds_manifests_without_generating(self):
+        """Test that API responses embed manifests of existing renditions only."""
+        url = reverse('wagtailapi:pages:detail', args=[self.post.pk])
+
+        data = self.client.get(url).json()
+
+        self.assertFalse(Rendition.objects.exists())
+        self.assertEqual(data['featured_image_renditions']['srcset'], {})
+        self.assertEqual(data['content'][0]['value']['renditions']['id'], self.block_image.pk)
+
+        queue_images(page_image_ids(self.post))
+        generate_pending()
+        data = self.client.get(url).json()
+
+        self.assertIn('webp', data['featured_image_renditions']['srcset'])
+        self.assertIn('avif', data['og_image_renditions']['srcset'])
+        self.assertIn('original', data['content'][0]['value']['renditions']['srcset'])
+
+    def test_cached_responses_pick_up_generated_renditions(self):
+        """Test that responses cached before the worker ran are not served after it."""
+        url = reverse('wagtailapi:pages:detail', args=[self.post.pk])
+
+        with self.settings(PAGES_API_CACHE_TIMEOUT=3600):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post.save_revision().publish()
+            data = self.client.get(url).json()
+            self.assertEqual(data['featured_image_renditions']['srcset'], {})
+
+            generate_pending()
+            data = self.client.get(url).json()
+
+        self.assertIn('webp', data['featured_image_renditions']['srcset'])
+        self.assertIn('avif', data['og_image_renditions']['srcset'])
+
+    def test_gallery_block_manifests(self):
+        """Test that gallery blocks embed one manifest per image."""
+        from pages.blocks import GalleryBlock
+
+        block = GalleryBlock()
+        value = block.to_python({'images': [image.pk for image in self.gallery]})
+
+        representation = block.get_api_representation(value)
+
+        self.assertEqual(
+            [manifest['id'] for manifest in representation['renditions']],
+            [image.pk for image in self.gallery],
+        )
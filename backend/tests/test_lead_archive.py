@@ -0,0 +1,192 @@
+"""Tests for lead archival."""
+import fcntl
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.archive import JSONLArchive, archivable_leads
+from leads.models import ArchivedLead, Lead, LeadDailyRollup
+from leads.rollups import rebuild_rollups
+
+User = get_user_model()
+
+
+class LeadArchiveTestMixin:
+    """Create old processed, old unprocessed and recent leads."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        old = timezone.now() - timedelta(days=400)
+        self.old_processed = baker.make(
+            Lead, is_processed=True, processed_at=old + timedelta(hours=1),
+            created_at=old, _quantity=5,
+        )
+        self.old_open = baker.make(Lead, created_at=old)
+        self.recent = baker.make(Lead, is_processed=True, processed_at=timezone.now())
+
+
+class LeadArchiveCommandTest(LeadArchiveTestMixin, TestCase):
+    """Test the archive_leads command."""
+
+    def test_archive_to_table(self):
+        """Test that only old processed leads are moved, in batches."""
+        rollups = list(LeadDailyRollup.objects.values_list('date', 'total', 'processed'))
+        out = StringIO()
+
+        call_command('archive_leads', older_than=365, batch_size=2, stdout=out)
+
+        self.assertIn('Archived 5 lead(s)', out.getvalue())
+        self.assertEqual(
+            set(Lead.objects.values_list('pk', flat=True)),
+            {self.old_open.pk, self.recent.pk},
+        )
+        archived = ArchivedLead.objects.get(pk=self.old_processed[0].pk)
+        self.assertEqual(archived.email, self.old_processed[0].email)
+        self.assertEqual(archived.fingerprint, self.old_processed[0].fingerprint)
+
+        # Archived leads stay in the statistics
+        self.assertEqual(
+            list(LeadDailyRollup.objects.values_list('date', 'total', 'processed')),
+            rollups,
+        )
+        rebuild_rollups()
+        self.assertEqual(
+            list(LeadDailyRollup.objects.values_list('date', 'total', 'processed')),
+            rollups,
+        )
+
+    def test_archive_limit_and_resume(self):
+        """Test that a limited run can be continued later."""
+        call_command('archive_leads', older_than=365, batch_size=2, limit=2, stdout=StringIO())
+        self.assertEqual(ArchivedLead.objects.count(), 2)
+
+        call_command('archive_leads', older_than=365, batch_size=2, stdout=StringIO())
+        self.assertEqual(ArchivedLead.objects.count(), 5)
+        self.assertFalse(archivable_leads(365).exists())
+
+    def test_archive_to_jsonl(self):
+        """Test archiving into gzipped JSONL files."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        rollups = list(LeadDailyRollup.objects.values_list('date', 'total', 'processed'))
+        out = StringIO()
+
+        call_command(
+            'archive_leads', older_than=365, to='jsonl', path=directory,
+            batch_size=3, stdout=out,
+        )
+
+        files = sorted(Path(directory).glob('*.jsonl.gz'))
+        self.assertEqual(len(files), 2)
+        rows = []
+        for path in files:
+            with gzip.open(path, 'rt') as handle:
+                rows.extend(json.loads(line) for line in handle)
+        self.assertEqual(
+            [row['id'] for row in rows], sorted(lead.pk for lead in self.old_processed)
+        )
+        self.assertFalse(archivable_leads(365).exists())
+        self.assertIn('Leads archived to JSONL are offline', out.getvalue())
+
+        # Leads archived to files stay in the statistics, rebuilds included
+        rebuild_rollups()
+        self.assertEqual(
+            list(LeadDailyRollup.objects.values_list('date', 'total', 'processed')),
+            rollups,
+        )
+
+    def test_jsonl_recovery(self):
+        """Test that interrupted batches are settled on the next run."""
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        uncommitted = directory / 'leads-1.jsonl.gz.tmp'
+        committed = directory / 'leads-2.jsonl.gz.tmp'
+        with gzip.open(uncommitted, 'wt') as handle:
+            handle.write(json.dumps({'id': self.old_processed[0].pk}) + '\n')
+        with gzip.open(committed, 'wt') as handle:
+            handle.write(json.dumps({'id': 999999}) + '\n')
+
+        JSONLArchive(directory).recover()
+
+        self.assertFalse(uncommitted.exists())
+        self.assertFalse(committed.exists())
+        self.assertTrue((directory / 'leads-2.jsonl.gz').exists())
+
+    def test_jsonl_recovery_skips_runs_in_flight(self):
+        """Test that temporary files of a concurrent run are left alone."""
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        archive = JSONLArchive(directory)
+        in_flight = directory / 'leads-1.jsonl.gz.tmp'
+        with gzip.open(in_flight, 'wt') as handle:
+            handle.write(json.dumps({'id': self.old_processed[0].pk}) + '\n')
+
+        with archive._lock(fcntl.LOCK_SH):
+            self.assertFalse(archive.recover())
+            self.assertTrue(in_flight.exists())
+
+        self.assertTrue(archive.recover())
+        self.assertFalse(in_flight.exists())
+
+    def test_archived_leads_cannot_be_deleted_in_admin(self):
+        """Test that the archive admin is read-only."""
+        model_admin = site._registry[ArchivedLead]
+        request = RequestFactory().get('/')
+        request.user = baker.make(User, is_staff=True, is_superuser=True)
+
+        self.assertFalse(model_admin.has_delete_permission(request))
+
+
+class ArchivedLeadAPITest(LeadArchiveTestMixin, APITestCase):
+    """Test reaching archived leads through the API."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        call_command('archive_leads', older_than=365, stdout=StringIO())
+        self.client.force_authenticate(baker.make(User, is_staff=True, is_superuser=True))
+        self.archived_pk = self.old_processed[0].pk
+
+    def test_detail_falls_back_to_archive(self):
+        """Test that archived leads are only found when asked for."""
+        url = reverse('leads:lead_detail', kwargs={'pk': self.archived_pk})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('archived_at', response.json())
+
+    def test_list_archived(self):
+        """Test listing the archive."""
+        response = self.client.get(reverse('leads:lead_list'), {'archived': 'true'})
+
+        ids = [lead['id'] for lead in response.json()['results']]
+        self.assertEqual(sorted(ids), sorted(lead.pk for lead in self.old_processed))
+
+    def test_export_includes_archive(self):
+        """Test that the export can include archived leads."""
+        url = reverse('leads:lead_export', args=['ndjson'])
+
+        live = b''.join(self.client.get(url).streaming_content).splitlines()
+        everything = b''.join(
+            self.client.get(url, {'include_archived': 'true'}).streaming_content
+        ).splitlines()
+
+        self.assertEqual(len(live), 2)
+        self.assertEqual(len(everything), 7)
@@ -0,0 +1,176 @@
+"""Tests for bulk lead state transitions."""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.bulk import bulk_update_leads
+from leads.models import Lead, LeadDailyRollup
+from leads.rollups import rebuild_rollups
+
+User = get_user_model()
+
+
+def rollup_counts():
+    return set(
+        LeadDailyRollup.objects.values_list(
+            'date', 'source', 'total', 'processed', 'processing_seconds'
+        )
+    )
+
+
+class BulkUpdateLeadsTest(TestCase):
+    """Test the chunked bulk update of leads."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.leads = baker.make(Lead, source='website', _quantity=7)
+        self.done = baker.make(
+            Lead, source='referral', is_processed=True, processed_at=timezone.now()
+        )
+
+    def test_transition_in_chunks(self):
+        """Test that every chunk is changed with one statement."""
+        with CaptureQueriesContext(connection) as queries:
+            result = bulk_update_leads(Lead.objects.all(), is_processed=True, chunk_size=3)
+
+        self.assertEqual(result, {'matched': 8, 'transitioned': 7, 'noted': 0})
+        self.assertFalse(Lead.objects.filter(is_processed=False).exists())
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "leads_lead"')
+        ]
+        self.assertEqual(len(updates), 3)
+
+    def test_selection_shrinking_while_updated(self):
+        """Test that leads leaving the selection do not cause skipped chunks."""
+        result = bulk_update_leads(
+            Lead.objects.filter(is_processed=False), is_processed=True, chunk_size=2
+        )
+
+        self.assertEqual(result['transitioned'], 7)
+
+    def test_notes_and_processed_at(self):
+        """Test that notes and an explicit processing time are applied."""
+        processed_at = timezone.now() - timedelta(hours=1)
+        ids = [lead.pk for lead in self.leads[:2]]
+
+        result = bulk_update_leads(
+            Lead.objects.filter(pk__in=ids), is_processed=True,
+            processed_at=processed_at, notes='Synced from CRM',
+        )
+
+        self.assertEqual(result, {'matched': 2, 'transitioned': 2, 'noted': 2})
+        for lead in Lead.objects.filter(pk__in=ids):
+            self.assertEqual(lead.processed_at, processed_at)
+            self.assertEqual(lead.notes, 'Synced from CRM')
+
+    def test_rollups_follow_transitions(self):
+        """Test that the rollups match a full rebuild afterwards."""
+        bulk_update_leads(Lead.objects.all(), is_processed=True, chunk_size=3)
+        bulk_update_leads(Lead.objects.filter(source='referral'), is_processed=False)
+        counts = rollup_counts()
+
+        rebuild_rollups()
+
+        self.assertEqual(rollup_counts(), counts)
+
+
+class LeadBulkUpdateAPITest(APITestCase):
+    """Test the bulk update endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.url = reverse('leads:lead_bulk_update')
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='adminpass123'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.website = baker.make(Lead, source='website', _quantity=3)
+        self.referral = baker.make(Lead, source='referral')
+
+    def test_update_by_ids(self):
+        """Test selecting leads by id."""
+        response = self.client.post(self.url, {
+            'ids': [lead.pk for lead in self.website[:2]],
+            'is_processed': True,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['matched'], 2)
+        self.assertEqual(response.data['transitioned'], 2)
+        self.assertEqual(Lead.objects.filter(is_processed=True).count(), 2)
+
+    @override_settings(LEAD_BULK_UPDATE_CHUNK_SIZE=2)
+    def test_update_by_filter(self):
+        """Test selecting leads with the export filters."""
+        response = self.client.post(self.url, {
+            'filter': {'source': 'website', 'is_processed': 'false'},
+            'is_processed': True,
+            'notes': 'Contacted',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['transitioned'], 3)
+        self.assertEqual(response.data['noted'], 3)
+        self.assertFalse(Lead.objects.get(pk=self.referral.pk).is_processed)
+
+    def test_update_by_search_filter(self):
+        """Test selecting leads with a full-text query."""
+        lead = self.website[0]
+
+        response = self.client.post(self.url, {
+            'filter': {'q': lead.email},
+            'notes': 'Found',
+        }, format='json')
+
+        self.assertEqual(response.data['noted'], 1)
+        self.assertEqual(Lead.objects.get(pk=lead.pk).notes, 'Found')
+
+    def test_invalid_requests(self):
+        """Test that incomplete or ambiguous requests are rejected."""
+        ids = [self.referral.pk]
+        for payload in (
+            {'is_processed': True},
+            {'ids': ids, 'filter': {}, 'is_processed': True},
+            {'ids': ids},
+            {'ids': ids, 'processed_at': timezone.now().isoformat()},
+            {'filter': {'created_after': 'yesterday'}, 'is_processed': True},
+        ):
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertFalse(response.data['success'])
+
+    def test_filter_must_narrow_selection(self):
+        """Test that empty or unknown filters never update every lead."""
+        for lead_filter in (
+            {},
+            {'source': ''},
+            {'sorce': 'website'},
+            {'source': 'website', 'x': '1'},
+        ):
+            with self.subTest(filter=lead_filter):
+                response = self.client.post(self.url, {
+                    'filter': lead_filter,
+                    'is_processed': True,
+                }, format='json')
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('filter', response.data['errors'])
+        self.assertFalse(Lead.objects.filter(is_processed=True).exists())
+
+    def test_requires_admin(self):
+        """Test that the endpoint is restricted to admins."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(self.url, {'ids': [1], 'notes': ''}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
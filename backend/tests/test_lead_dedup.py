@@ -0,0 +1,104 @@
+"""Tests for duplicate lead detection."""
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.dedup import find_recent_duplicate, submission_fingerprint
+from leads.fingerprint import normalize_email
+from leads.models import Lead, LeadNotification
+
+
+class LeadFingerprintTest(TestCase):
+    """Test the fingerprint derived from email and message."""
+
+    def test_normalize_email(self):
+        """Test that case, whitespace and +tags are ignored."""
+        self.assertEqual(normalize_email(' Jane.Doe+promo@Example.COM '), 'jane.doe@example.com')
+        self.assertEqual(normalize_email('jane@example.com'), 'jane@example.com')
+
+    def test_fingerprint_set_on_save(self):
+        """Test that saving a lead stores its fingerprint."""
+        lead = baker.make(Lead, email='Jane+x@Example.com', message='Hello   there')
+
+        self.assertEqual(lead.email_normalized, 'jane@example.com')
+        self.assertEqual(
+            lead.fingerprint, submission_fingerprint('jane@example.com', 'hello there')
+        )
+        self.assertEqual(lead.last_submitted_at, lead.created_at)
+
+    def test_lookup_falls_back_to_index(self):
+        """Test that duplicates are found without the cache."""
+        lead = baker.make(Lead, email='jane@example.com', message='Hello there')
+        cache.clear()
+
+        self.assertEqual(find_recent_duplicate(lead.fingerprint), lead.id)
+        self.assertIsNone(
+            find_recent_duplicate(lead.fingerprint, now=timezone.now() + timedelta(days=1))
+        )
+
+
+@override_settings(LEAD_NOTIFICATION_ASYNC=True, LEAD_DUPLICATE_WINDOW=600)
+class LeadDuplicateSubmissionTest(APITestCase):
+    """Test that repeated submissions are collapsed."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.url = reverse('leads:create_lead')
+        self.payload = {
+            'name': 'Jane Smith',
+            'email': 'jane@example.com',
+            'message': 'I am interested in your services. Please contact me.',
+            'source': 'website'
+        }
+
+    def submit(self, **changes):
+        return self.client.post(
+            self.url,
+            data=json.dumps({**self.payload, **changes}),
+            content_type='application/json'
+        )
+
+    def test_repeat_is_collapsed(self):
+        """Test that a repeat bumps the counter instead of creating a lead."""
+        first = self.submit()
+        second = self.submit(email='JANE+spam@example.com', message=self.payload['message'].upper())
+
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json()['id'], first.json()['id'])
+
+        lead = Lead.objects.get()
+        self.assertEqual(lead.duplicate_count, 1)
+        self.assertEqual(LeadNotification.objects.count(), 1)
+
+    def test_different_message_is_new_lead(self):
+        """Test that a new message from the same email is kept."""
+        self.submit()
+        self.submit(message='A different question about your pricing plans.')
+
+        self.assertEqual(Lead.objects.count(), 2)
+
+    def test_repeat_after_window_is_new_lead(self):
+        """Test that submissions outside the window are not duplicates."""
+        self.submit()
+        Lead.objects.update(last_submitted_at=timezone.now() - timedelta(minutes=11))
+        cache.clear()
+
+        self.submit()
+
+        self.assertEqual(Lead.objects.count(), 2)
+
+    @override_settings(LEAD_DUPLICATE_WINDOW=0)
+    def test_detection_can_be_disabled(self):
+        """Test that a zero window disables duplicate detection."""
+        self.submit()
+        self.submit()
+
+        self.assertEqual(Lead.objects.count(), 2)
@@ -0,0 +1,134 @@
+"""Tests for the streaming lead export."""
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.export import EXPORT_FIELDS
+from leads.models import Lead
+
+User = get_user_model()
+
+
+def read_csv(response):
+    return list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+
+
+class LeadExportAPITest(APITestCase):
+    """Test the lead export endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin_user = baker.make(User, is_staff=True, is_superuser=True)
+        now = timezone.now()
+        self.old = baker.make(
+            Lead, email='old@example.com', source='newsletter',
+            created_at=now - timedelta(days=10),
+        )
+        self.new = baker.make(
+            Lead, email='new@example.com', source='website', is_processed=True,
+            message='Line one,\n"quoted" line two', created_at=now,
+        )
+        self.csv_url = reverse('leads:lead_export', args=['csv'])
+
+    def test_export_requires_admin(self):
+        """Test that exporting leads requires admin permission."""
+        response = self.client.get(self.csv_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_csv(self):
+        """Test the CSV export is streamed in creation order."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.csv_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = read_csv(response)
+        self.assertEqual([row['email'] for row in rows], ['old@example.com', 'new@example.com'])
+        self.assertEqual(list(rows[0]), EXPORT_FIELDS)
+        self.assertEqual(rows[1]['message'], self.new.message)
+
+    def test_export_csv_escapes_formulas(self):
+        """Test that cells starting like a formula are not evaluated by spreadsheets."""
+        self.client.force_authenticate(user=self.admin_user)
+        self.new.name = '=HYPERLINK("http://example.com")'
+        self.new.notes = '-1+2'
+        self.new.save()
+
+        rows = read_csv(self.client.get(self.csv_url))
+
+        self.assertEqual(rows[1]['name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(rows[1]['notes'], "'-1+2")
+        self.assertEqual(rows[1]['email'], 'new@example.com')
+
+    def test_export_ndjson(self):
+        """Test the NDJSON export."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(reverse('leads:lead_export', args=['ndjson']))
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [self.old.id, self.new.id])
+        self.assertTrue(rows[1]['is_processed'])
+
+    def test_export_filters(self):
+        """Test the source, is_processed and created_at filters."""
+        self.client.force_authenticate(user=self.admin_user)
+        yesterday = (timezone.now() - timedelta(days=1)).date().isoformat()
+
+        cases = [
+            ({'source': 'newsletter'}, ['old@example.com']),
+            ({'is_processed': 'true'}, ['new@example.com']),
+            ({'created_after': yesterday}, ['new@example.com']),
+            ({'created_before': yesterday}, ['old@example.com']),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                rows = read_csv(self.client.get(self.csv_url, params))
+                self.assertEqual([row['email'] for row in rows], expected)
+
+    def test_export_rejects_invalid_filters(self):
+        """Test that malformed filters are rejected."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.csv_url, {'created_after': 'yesterday'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unknown_format(self):
+        """Test that unknown formats are not found."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(reverse('leads:lead_export', args=['xlsx']))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class LeadAdminExportTest(TestCase):
+    """Test the CSV export admin action."""
+
+    def test_export_action(self):
+        """Test that the action streams only the selected leads."""
+        leads = baker.make(Lead, _quantity=3)
+        request = RequestFactory().post('/admin/leads/lead/')
+        request.user = baker.make(User, is_staff=True, is_superuser=True)
+
+        model_admin = site._registry[Lead]
+        response = model_admin.export_as_csv(
+            request, Lead.objects.filter(pk__in=[leads[0].pk, leads[2].pk])
+        )
+
+        rows = read_csv(response)
+        self.assertEqual([int(row['id']) for row in rows], [leads[0].pk, leads[2].pk])
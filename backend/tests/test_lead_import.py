@@ -0,0 +1,193 @@
+"""Tests for the bulk lead import."""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.ingest import import_leads, iter_csv, iter_ndjson
+from leads.models import Lead
+
+User = get_user_model()
+
+VALID_MESSAGE = 'Interested in a demo for our marketing team.'
+
+
+def ndjson(*rows):
+    return '\n'.join(json.dumps(row) for row in rows) + '\n'
+
+
+class LeadImportTest(TestCase):
+    """Test the streaming import pipeline."""
+
+    def test_ndjson_rows(self):
+        """Test that valid rows are created and invalid rows reported."""
+        body = ndjson(
+            {'name': 'Ada Lovelace', 'email': 'ada@example.com', 'message': VALID_MESSAGE},
+            {'name': 'B', 'email': 'not-an-email', 'message': VALID_MESSAGE},
+        ) + 'not json\n\n' + ndjson(
+            {'name': 'Grace Hopper', 'email': 'grace@example.com',
+             'message': VALID_MESSAGE, 'source': 'demo_request'},
+        )
+
+        result = import_leads(iter_ndjson(StringIO(body)), batch_size=2)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['failed'], 2)
+        self.assertEqual([error['line'] for error in result['errors']], [2, 3])
+        self.assertIn('email', result['errors'][0]['errors'])
+        self.assertEqual(
+            Lead.objects.get(email='grace@example.com').source, 'demo_request'
+        )
+
+    def test_csv_rows_with_default_source(self):
+        """Test CSV input and the source applied to rows without one."""
+        body = (
+            'name,email,message,source\n'
+            f'Ada Lovelace,ada@example.com,{VALID_MESSAGE},\n'
+            f'Grace Hopper,grace@example.com,{VALID_MESSAGE},newsletter\n'
+        )
+
+        result = import_leads(iter_csv(StringIO(body)), source='landing_page')
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(Lead.objects.get(email='ada@example.com').source, 'landing_page')
+        self.assertEqual(Lead.objects.get(email='grace@example.com').source, 'newsletter')
+
+    def test_inserts_in_batches(self):
+        """Test that rows are inserted with one query per batch."""
+        rows = [
+            (index, {'name': f'Lead {index}', 'email': f'lead{index}@example.com',
+                     'message': VALID_MESSAGE})
+            for index in range(10)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = import_leads(rows, batch_size=4)
+
+        inserts = [
+            query for query in queries
+            if query['sql'].startswith('INSERT INTO "leads_lead"')
+        ]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(result['created'], 10)
+
+    def test_invalid_utf8_reported_per_row(self):
+        """Test that undecodable lines fail alone without aborting the import."""
+        valid = f'Ada Lovelace,ada@example.com,{VALID_MESSAGE}\n'.encode()
+        lines = [b'name,email,message\n', b'Bad \xff,bad@example.com,x\n', valid]
+
+        result = import_leads(iter_csv(lines))
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'][0]['line'], 2)
+        self.assertIn('Invalid UTF-8', result['errors'][0]['errors']['non_field_errors'][0])
+
+    def test_error_report_is_capped(self):
+        """Test that only the first errors are reported in detail."""
+        rows = [(index, {'name': 'X'}) for index in range(5)]
+
+        result = import_leads(rows, max_errors=2)
+
+        self.assertEqual(result['failed'], 5)
+        self.assertEqual(len(result['errors']), 2)
+        self.assertTrue(result['errors_truncated'])
+
+    def test_import_leads_command(self):
+        """Test the import_leads management command."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('name,email,message\n')
+            handle.write(f'Ada Lovelace,ada@example.com,{VALID_MESSAGE}\n')
+            handle.write('X,bad,short\n')
+        with open(handle.name, 'ab') as binary:
+            binary.write(b'\xff,bad@example.com,x\n')
+        self.addCleanup(os.remove, handle.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_leads', handle.name, source='other', stdout=out, stderr=err)
+
+        self.assertIn('Imported 1 lead(s), 2 failed', out.getvalue())
+        self.assertIn('Line 3', err.getvalue())
+        self.assertIn('Line 4', err.getvalue())
+        self.assertEqual(Lead.objects.get().source, 'other')
+
+
+@override_settings(LEAD_IMPORT_BATCH_SIZE=2)
+class LeadImportAPITest(APITestCase):
+    """Test the bulk import endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.url = reverse('leads:lead_import')
+        self.admin_user = baker.make(User, is_staff=True, is_superuser=True)
+
+    def test_import_requires_admin(self):
+        """Test that importing leads requires admin permission."""
+        response = self.client.post(self.url, 'x', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_ndjson(self):
+        """Test importing an NDJSON body."""
+        self.client.force_authenticate(user=self.admin_user)
+        body = ndjson(*[
+            {'name': f'Lead {index}', 'email': f'lead{index}@example.com',
+             'message': VALID_MESSAGE}
+            for index in range(5)
+        ], {'name': 'Lead', 'email': 'lead@example.com'})
+
+        response = self.client.post(
+            f'{self.url}?source=landing_page', body, content_type='application/x-ndjson'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['created'], 5)
+        self.assertEqual(data['failed'], 1)
+        self.assertEqual(data['errors'][0]['line'], 6)
+        self.assertIn('message', data['errors'][0]['errors'])
+        self.assertEqual(Lead.objects.filter(source='landing_page').count(), 5)
+
+    def test_import_invalid_utf8(self):
+        """Test that a body with undecodable lines still imports the valid rows."""
+        self.client.force_authenticate(user=self.admin_user)
+        body = ndjson(
+            {'name': 'Ada Lovelace', 'email': 'ada@example.com', 'message': VALID_MESSAGE},
+        ).encode() + b'{"name": "\xff"}\n'
+
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['created'], 1)
+        self.assertEqual(data['errors'][0]['line'], 2)
+
+    def test_import_csv(self):
+        """Test importing a CSV body."""
+        self.client.force_authenticate(user=self.admin_user)
+        body = f'name,email,message\nAda Lovelace,ada@example.com,"{VALID_MESSAGE}"\n'
+
+        response = self.client.post(self.url, body, content_type='text/csv')
+
+        self.assertEqual(response.json()['created'], 1)
+        self.assertTrue(Lead.objects.filter(email='ada@example.com').exists())
+
+    def test_import_csv_with_charset(self):
+        """Test that media type parameters don't change the format."""
+        self.client.force_authenticate(user=self.admin_user)
+        body = f'name,email,message\nAda Lovelace,ada@example.com,"{VALID_MESSAGE}"\n'
+
+        response = self.client.post(
+            self.url, body, content_type='Text/CSV; charset=utf-8'
+        )
+
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(response.json()['failed'], 0)
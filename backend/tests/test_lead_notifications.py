@@ -0,0 +1,184 @@
+"""Tests for the lead notification outbox."""
+import json
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.models import Lead, LeadNotification
+from leads.notifications import (
+    claim_due,
+    deliver_pending,
+    queue_notification,
+    queue_stats,
+)
+
+User = get_user_model()
+
+
+@override_settings(LEAD_NOTIFICATION_ASYNC=True)
+class LeadNotificationQueueTest(APITestCase):
+    """Test that lead creation queues notifications instead of sending them."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.url = reverse('leads:create_lead')
+        self.payload = {
+            'name': 'Jane Smith',
+            'email': 'jane@example.com',
+            'message': 'I am interested in your services. Please contact me.',
+            'source': 'website'
+        }
+
+    def test_create_lead_queues_notification(self):
+        """Test that the request only queues the notification."""
+        response = self.client.post(
+            self.url, data=json.dumps(self.payload), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+
+        notification = LeadNotification.objects.get()
+        self.assertEqual(notification.lead_id, response.json()['id'])
+        self.assertEqual(notification.status, LeadNotification.STATUS_PENDING)
+
+    @override_settings(LEAD_NOTIFICATION_ASYNC=False)
+    def test_create_lead_sends_immediately_when_sync(self):
+        """Test that synchronous mode still sends during the request."""
+        self.client.post(
+            self.url, data=json.dumps(self.payload), content_type='application/json'
+        )
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'New Lead: Jane Smith')
+        self.assertEqual(
+            LeadNotification.objects.get().status, LeadNotification.STATUS_SENT
+        )
+
+
+@override_settings(
+    LEAD_NOTIFICATION_MAX_ATTEMPTS=3,
+    LEAD_NOTIFICATION_RETRY_DELAY=60,
+    LEAD_NOTIFICATION_MAX_RETRY_DELAY=90,
+)
+class LeadNotificationDeliveryTest(TestCase):
+    """Test the notification worker."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.notifications = [
+            queue_notification(baker.make(Lead, name=f'Lead {index}'))
+            for index in range(3)
+        ]
+
+    def test_batch_shares_one_connection(self):
+        """Test that a batch is sent over a single connection."""
+        with mock.patch(
+            'leads.notifications.get_connection', wraps=get_connection
+        ) as connect:
+            sent, failed = deliver_pending(batch_size=10)
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(
+            LeadNotification.objects.exclude(status=LeadNotification.STATUS_SENT).exists()
+        )
+
+    def test_batch_size(self):
+        """Test that only one batch is claimed per call."""
+        self.assertEqual(deliver_pending(batch_size=2), (2, 0))
+        self.assertEqual(deliver_pending(batch_size=2), (1, 0))
+        self.assertEqual(deliver_pending(batch_size=2), (0, 0))
+
+    @override_settings(LEAD_NOTIFICATION_LEASE=300)
+    def test_claimed_batch_leased(self):
+        """Test that a claimed batch is not due for other workers until the lease ends."""
+        now = timezone.now()
+
+        self.assertEqual(len(claim_due(2, now)), 2)
+        self.assertEqual(len(claim_due(10, now)), 1)
+        self.assertEqual(claim_due(10, now + timedelta(seconds=299)), [])
+
+        # A worker that died mid-batch leaves its notifications to others
+        self.assertEqual(deliver_pending(now=now + timedelta(seconds=300)), (3, 0))
+
+    def test_failures_back_off_until_given_up(self):
+        """Test that failed deliveries are retried with exponential backoff."""
+        now = timezone.now()
+
+        with mock.patch.object(EmailMessage, 'send', side_effect=SMTPException('down')):
+            self.assertEqual(deliver_pending(now=now), (0, 3))
+
+            notification = LeadNotification.objects.get(pk=self.notifications[0].pk)
+            self.assertEqual(notification.attempts, 1)
+            self.assertEqual(notification.last_error, 'down')
+            self.assertEqual(notification.next_attempt_at, now + timedelta(seconds=60))
+
+            # Not due again until the backoff has passed
+            self.assertEqual(deliver_pending(now=now), (0, 0))
+
+            later = now + timedelta(seconds=60)
+            deliver_pending(now=later)
+            notification.refresh_from_db()
+            self.assertEqual(notification.next_attempt_at, later + timedelta(seconds=90))
+
+            deliver_pending(now=later + timedelta(seconds=90))
+            notification.refresh_from_db()
+            self.assertEqual(notification.status, LeadNotification.STATUS_FAILED)
+
+        self.assertEqual(queue_stats()['failed'], 3)
+
+    def test_command_drains_queue(self):
+        """Test the send_lead_notifications management command."""
+        out = StringIO()
+        call_command('send_lead_notifications', batch_size=2, stdout=out)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('Sent 3 notification(s)', out.getvalue())
+        self.assertIn('Queue: 0 pending', out.getvalue())
+
+
+class LeadNotificationQueueAPITest(APITestCase):
+    """Test the notification queue depth endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.url = reverse('leads:lead_notification_queue')
+        self.admin_user = baker.make(User, is_staff=True, is_superuser=True)
+        queue_notification(baker.make(Lead))
+        LeadNotification.objects.create(
+            lead=baker.make(Lead),
+            attempts=1,
+            next_attempt_at=timezone.now() + timedelta(minutes=5),
+        )
+
+    def test_queue_depth_requires_admin(self):
+        """Test that the queue depth is not public."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_queue_depth(self):
+        """Test the reported queue depth."""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['pending'], 2)
+        self.assertEqual(data['due'], 1)
+        self.assertEqual(data['retrying'], 1)
+        self.assertEqual(data['failed'], 0)
+        self.assertIsNotNone(data['oldest_pending_age'])
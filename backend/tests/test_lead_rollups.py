@@ -0,0 +1,177 @@
+"""Tests for the daily lead rollups."""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.ingest import import_leads
+from leads.models import Lead, LeadDailyRollup
+from leads.rollups import rebuild_rollups, update_processed
+
+User = get_user_model()
+
+
+def rollup_counts():
+    return {
+        (rollup.date, rollup.source): (
+            rollup.total, rollup.processed, rollup.processing_seconds
+        )
+        for rollup in LeadDailyRollup.objects.all()
+    }
+
+
+class LeadRollupMaintenanceTest(TestCase):
+    """Test that rollups follow lead changes."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+
+    def test_created_and_processed(self):
+        """Test that creation and processing are counted."""
+        lead = baker.make(Lead, source='website', created_at=self.now - timedelta(hours=2))
+        baker.make(Lead, source='website', created_at=self.now)
+
+        lead.mark_as_processed()
+
+        rollup = LeadDailyRollup.objects.get(source='website')
+        self.assertEqual(rollup.total, 2)
+        self.assertEqual(rollup.processed, 1)
+        self.assertAlmostEqual(rollup.processing_seconds, 2 * 3600, delta=5)
+
+    def test_changed_source_and_delete(self):
+        """Test that leads move between rollups and are removed on delete."""
+        lead = baker.make(Lead, source='website')
+
+        lead.source = 'newsletter'
+        lead.save()
+        self.assertEqual(
+            rollup_counts(),
+            {(self.today, 'website'): (0, 0, 0), (self.today, 'newsletter'): (1, 0, 0)},
+        )
+
+        lead.delete()
+        self.assertEqual(rollup_counts()[(self.today, 'newsletter')], (0, 0, 0))
+
+    def test_update_processed(self):
+        """Test the queryset transition used by the admin actions."""
+        baker.make(Lead, source='website', _quantity=3)
+
+        self.assertEqual(update_processed(Lead.objects.all(), True), 3)
+        self.assertEqual(update_processed(Lead.objects.all(), True), 0)
+        self.assertEqual(rollup_counts()[(self.today, 'website')][:2], (3, 3))
+
+        update_processed(Lead.objects.filter(pk=Lead.objects.first().pk), False)
+        self.assertEqual(rollup_counts()[(self.today, 'website')][:2], (3, 2))
+
+    def test_bulk_import_is_counted(self):
+        """Test that leads inserted with bulk_create are counted."""
+        rows = [
+            (index, {'name': f'Lead {index}', 'email': f'lead{index}@example.com',
+                     'message': 'Interested in a demo for our team.'})
+            for index in range(3)
+        ]
+
+        import_leads(rows, source='landing_page')
+
+        self.assertEqual(rollup_counts()[(self.today, 'landing_page')], (3, 0, 0))
+
+    def test_rebuild_matches_incremental(self):
+        """Test that a rebuild reproduces the incrementally kept rollups."""
+        for days in range(3):
+            created_at = self.now - timedelta(days=days, hours=1)
+            baker.make(Lead, source='website', created_at=created_at, _quantity=days + 1)
+            baker.make(Lead, source='demo_request', created_at=created_at)
+        update_processed(Lead.objects.filter(source='demo_request'), True)
+        expected = rollup_counts()
+
+        LeadDailyRollup.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_lead_rollups', stdout=out)
+
+        self.assertIn('Rebuilt 6 rollup row(s)', out.getvalue())
+        rebuilt = rollup_counts()
+        self.assertEqual(rebuilt.keys(), expected.keys())
+        for key, (total, processed, seconds) in expected.items():
+            self.assertEqual(rebuilt[key][:2], (total, processed))
+            self.assertAlmostEqual(rebuilt[key][2], seconds, delta=2)
+
+    def test_rebuild_since(self):
+        """Test that a partial rebuild keeps older rollups."""
+        baker.make(Lead, created_at=self.now - timedelta(days=5))
+        baker.make(Lead, created_at=self.now)
+        LeadDailyRollup.objects.update(total=99)
+
+        self.assertEqual(rebuild_rollups(since=self.today), 1)
+        totals = {rollup.date: rollup.total for rollup in LeadDailyRollup.objects.all()}
+        self.assertEqual(totals[self.today], 1)
+        self.assertEqual(totals[self.today - timedelta(days=5)], 99)
+
+
+class LeadAnalyticsAPITest(APITestCase):
+    """Test the analytics endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.url = reverse('leads:lead_analytics')
+        self.admin_user = baker.make(User, is_staff=True, is_superuser=True)
+        now = timezone.now()
+        baker.make(Lead, source='website', created_at=now, _quantity=2)
+        baker.make(Lead, source='newsletter', created_at=now - timedelta(days=40))
+        processed = baker.make(Lead, source='newsletter', created_at=now - timedelta(hours=3))
+        processed.mark_as_processed()
+
+    def test_analytics_requires_admin(self):
+        """Test that analytics are not public."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_analytics_reads_only_rollups(self):
+        """Test the summary of the last 30 days."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['totals']['total'], 3)
+        self.assertEqual(data['totals']['processed'], 1)
+        self.assertEqual(data['by_source']['website']['unprocessed'], 2)
+        self.assertAlmostEqual(
+            data['by_source']['newsletter']['avg_processing_seconds'], 3 * 3600, delta=5
+        )
+        self.assertEqual(len(data['daily']), 2)
+
+    def test_analytics_period_and_source(self):
+        """Test the days and source parameters."""
+        self.client.force_authenticate(user=self.admin_user)
+
+        data = self.client.get(self.url, {'days': 60, 'source': 'newsletter'}).json()
+        self.assertEqual(data['totals']['total'], 2)
+        self.assertEqual(list(data['by_source']), ['newsletter'])
+
+        response = self.client.get(self.url, {'days': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LeadRollupPanelTest(TestCase):
+    """Test the Wagtail dashboard panel."""
+
+    def test_panel_on_dashboard(self):
+        """Test that the dashboard shows the rollup panel."""
+        baker.make(Lead, source='website', _quantity=2)
+        self.client.force_login(baker.make(User, is_staff=True, is_superuser=True))
+
+        response = self.client.get(reverse('wagtailadmin_home'))
+
+        self.assertContains(response, 'Leads in the last 30 days')
+        self.assertContains(response, '<td>website</td>', html=False)
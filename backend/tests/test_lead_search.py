@@ -0,0 +1,156 @@
+"""Tests for the lead search index."""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.archive import archivable_leads, archive_batch
+from leads.ingest import import_leads
+from leads.models import Lead, LeadSearchIndex
+from leads.search import search_leads
+
+User = get_user_model()
+
+
+class LeadSearchTestMixin:
+    """Create leads with distinct names, emails and messages."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.jane = baker.make(
+            Lead, name='Jane Smith', email='jane.smith@example.com',
+            message='Interested in the enterprise plan',
+        )
+        self.john = baker.make(
+            Lead, name='John Doe', email='john@acme.test',
+            message='Please call me about pricing',
+        )
+
+
+class LeadSearchIndexTest(LeadSearchTestMixin, TestCase):
+    """Test maintenance and querying of the search index."""
+
+    def search(self, query):
+        return set(search_leads(Lead.objects.all(), query).values_list('pk', flat=True))
+
+    def test_index_created_on_save(self):
+        """Test that saving a lead writes its search document."""
+        document = LeadSearchIndex.objects.get(lead=self.jane).document
+        self.assertIn('Jane Smith', document)
+        self.assertIn('jane.smith@example.com', document)
+        self.assertIn('enterprise plan', document)
+
+    def test_search_by_name_email_and_message(self):
+        """Test that every indexed field can be searched."""
+        self.assertEqual(self.search('smith'), {self.jane.pk})
+        self.assertEqual(self.search('acme'), {self.john.pk})
+        self.assertEqual(self.search('pricing'), {self.john.pk})
+
+    def test_search_matches_word_prefixes_of_all_words(self):
+        """Test that every word must match as a prefix."""
+        self.assertEqual(self.search('ent pla'), {self.jane.pk})
+        self.assertEqual(self.search('jane pricing'), set())
+
+    def test_search_is_case_insensitive(self):
+        """Test that case does not matter."""
+        self.assertEqual(self.search('JOHN'), {self.john.pk})
+
+    def test_blank_or_punctuation_query_matches_nothing(self):
+        """Test that queries without words match no leads."""
+        self.assertEqual(self.search('  '), set())
+        self.assertEqual(self.search('"*'), set())
+
+    def test_index_refreshed_on_change(self):
+        """Test that edited leads are found by their new text."""
+        self.jane.message = 'Looking for a consulting partner'
+        self.jane.save()
+
+        self.assertEqual(self.search('consulting'), {self.jane.pk})
+        self.assertEqual(self.search('enterprise'), set())
+
+    def test_save_without_text_changes_skips_index(self):
+        """Test that saving unrelated fields does not touch the index."""
+        with self.assertNumQueries(3):
+            # Rollup state lookup, the update and the rollup deltas
+            self.jane.is_processed = True
+            self.jane.save(update_fields=['is_processed'])
+
+    def test_raw_saves_skip_index(self):
+        """Test that fixture loads do not write search documents."""
+        lead = baker.prepare(Lead, name='Fixture Lead', email='fixture@example.com')
+        lead.save_base(raw=True)
+
+        self.assertFalse(LeadSearchIndex.objects.filter(lead_id=lead.pk).exists())
+
+    def test_index_removed_with_lead(self):
+        """Test that deleting a lead drops its search document."""
+        self.john.delete()
+
+        self.assertFalse(LeadSearchIndex.objects.filter(lead_id=self.john.pk).exists())
+        self.assertEqual(self.search('john'), set())
+
+    def test_import_indexes_leads(self):
+        """Test that bulk imported leads are searchable."""
+        rows = [
+            (1, {'name': 'Ada Lovelace', 'email': 'ada@example.com',
+                 'message': 'Analytical engine'}),
+        ]
+        import_leads(rows)
+
+        lead = Lead.objects.get(email='ada@example.com')
+        self.assertEqual(self.search('analytical'), {lead.pk})
+
+    def test_archive_removes_index(self):
+        """Test that archived leads leave the search index."""
+        old = timezone.now() - timedelta(days=400)
+        Lead.objects.filter(pk=self.jane.pk).update(is_processed=True, created_at=old)
+
+        archive_batch(archivable_leads(365), 100)
+
+        self.assertFalse(LeadSearchIndex.objects.filter(lead_id=self.jane.pk).exists())
+        self.assertEqual(self.search('jane'), set())
+
+
+class LeadSearchAPITest(LeadSearchTestMixin, APITestCase):
+    """Test searching leads through the admin API and the Django admin."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='adminpass123'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_list_filtered_by_query(self):
+        """Test that ``q`` narrows the lead list."""
+        response = self.client.get(reverse('leads:lead_list'), {'q': 'enterprise'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [lead['id'] for lead in response.data['results']], [self.jane.pk]
+        )
+
+    def test_blank_query_lists_all(self):
+        """Test that an empty ``q`` does not filter."""
+        response = self.client.get(reverse('leads:lead_list'), {'q': ' '})
+
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_admin_search(self):
+        """Test that the admin changelist searches through the index."""
+        self.client.force_login(self.admin_user)
+        response = self.client.get(
+            reverse('admin:leads_lead_changelist'), {'q': 'acme'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [lead.pk for lead in response.context['cl'].result_list], [self.john.pk]
+        )
@@ -0,0 +1,128 @@
+"""Tests for the lead submission throttle."""
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from leads.throttling import LeadSubmitThrottle, SlidingWindowThrottle, get_client_ip
+
+
+class FakeClock:
+    """Controllable replacement for ``time.time``."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ClientIPTest(TestCase):
+    """Test client IP resolution behind proxies."""
+
+    def request(self, xff=None):
+        headers = {'HTTP_X_FORWARDED_FOR': xff} if xff else {}
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', **headers)
+
+    def test_trusts_only_configured_proxy_hops(self):
+        """Test that forged X-Forwarded-For entries are ignored."""
+        xff = '6.6.6.6, 203.0.113.7, 10.0.0.2'
+        cases = [(0, '10.0.0.1'), (1, '10.0.0.2'), (2, '203.0.113.7'), (5, '6.6.6.6')]
+
+        for num_proxies, expected in cases:
+            with self.subTest(num_proxies=num_proxies), override_settings(
+                LEAD_NUM_PROXIES=num_proxies
+            ):
+                self.assertEqual(get_client_ip(self.request(xff)), expected)
+
+    def test_without_forwarded_header(self):
+        """Test that REMOTE_ADDR is used without X-Forwarded-For."""
+        self.assertEqual(get_client_ip(self.request()), '10.0.0.1')
+
+
+class SlidingWindowThrottleTest(TestCase):
+    """Test the two-bucket sliding window."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        SlidingWindowThrottle.blocklist.clear()
+        self.addCleanup(SlidingWindowThrottle.blocklist.clear)
+        self.clock = FakeClock(60 * 1000)
+        self.request = RequestFactory().get('/', REMOTE_ADDR='203.0.113.7')
+
+    def allow(self):
+        throttle = type(
+            'MinuteThrottle', (SlidingWindowThrottle,),
+            {'scope': 'test', 'rate': '3/min', 'timer': self.clock},
+        )()
+        return throttle.allow_request(self.request, None), throttle.wait()
+
+    def test_limit_within_window(self):
+        """Test that requests over the rate are rejected."""
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True, True, True, False])
+
+    def test_previous_bucket_is_weighted(self):
+        """Test that the previous bucket counts by its overlap with the window."""
+        for _ in range(3):
+            self.allow()
+
+        # The whole previous minute still overlaps the window
+        self.clock.now += 60
+        allowed, wait = self.allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 20)
+
+        self.clock.now += 20
+        self.assertTrue(self.allow()[0])
+
+    def test_rejected_clients_skip_the_cache(self):
+        """Test that blocked clients are rejected from process memory."""
+        for _ in range(4):
+            self.allow()
+
+        with mock.patch.object(cache, 'get_many') as get_many:
+            self.assertFalse(self.allow()[0])
+        get_many.assert_not_called()
+
+    def test_counter_is_an_integer(self):
+        """Test that the cache holds a counter instead of a timestamp list."""
+        self.allow()
+        self.allow()
+
+        self.assertEqual(cache.get(f'throttle:test:203.0.113.7:{1000}'), 2)
+
+
+class LeadSubmitThrottleAPITest(APITestCase):
+    """Test throttling of the public lead endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        SlidingWindowThrottle.blocklist.clear()
+        self.addCleanup(SlidingWindowThrottle.blocklist.clear)
+        self.url = reverse('leads:create_lead')
+        self.payload = json.dumps({
+            'name': 'Jane Smith',
+            'email': 'jane@example.com',
+            'message': 'I am interested in your services. Please contact me.',
+        })
+
+    def test_create_lead_is_throttled(self):
+        """Test that floods get 429 with a Retry-After header."""
+        with mock.patch.object(LeadSubmitThrottle, 'rate', '2/min', create=True):
+            responses = [
+                self.client.post(self.url, self.payload, content_type='application/json')
+                for _ in range(3)
+            ]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED,
+             status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertIn('Retry-After', responses[2])
@@ -1,8 +1,13 @@
 """Tests for the leads API."""
 import json
+from datetime import timedelta
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 from model_bakery import baker
@@ -257,6 +262,86 @@ class LeadAdminAPITest(APITestCase):
         self.assertFalse(Lead.objects.filter(pk=self.lead1.pk).exists())
 
 
+class LeadCursorPaginationTest(APITestCase):
+    """Test keyset pagination of the lead management API."""
+    
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.admin_user = baker.make(User, is_staff=True, is_superuser=True)
+        created_at = timezone.now()
+        # Leads sharing a timestamp are ordered by id
+        self.leads = baker.make(Lead, created_at=created_at, _quantity=5)
+        self.list_url = reverse('leads:lead_list')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def test_walk_all_pages(self):
+        """Test that following next links returns every lead exactly once."""
+        ids = []
+        url = f'{self.list_url}?page_size=2'
+        while url:
+            with self.assertNumQueries(1):
+                data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            ids.extend(lead['id'] for lead in data['results'])
+            url = data['next']
+        
+        self.assertEqual(ids, sorted((lead.pk for lead in self.leads), reverse=True))
+    
+    def test_walk_back_through_pages(self):
+        """Test that previous links return the same pages in reverse."""
+        url = f'{self.list_url}?page_size=2'
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append([lead['id'] for lead in data['results']])
+            last, url = data, data['next']
+        
+        url = last['previous']
+        for expected in reversed(pages[:-1]):
+            data = self.client.get(url).json()
+            self.assertEqual([lead['id'] for lead in data['results']], expected)
+            url = data['previous']
+        self.assertIsNone(url)
+    
+    def test_cursor_compares_created_at_and_id(self):
+        """Test that the cursor continues strictly after its (created_at, id) tuple."""
+        older = baker.make(Lead, created_at=self.leads[0].created_at - timedelta(seconds=1))
+        
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.list_url, {'page_size': 5}).json()
+        self.assertNotIn('OFFSET', queries[0]['sql'].upper())
+        
+        data = self.client.get(data['next']).json()
+        self.assertEqual([lead['id'] for lead in data['results']], [older.pk])
+        self.assertIsNone(data['next'])
+    
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        response = self.client.get(self.list_url, {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_estimated_count(self):
+        """Test that the optional count is served from the cache."""
+        response = self.client.get(self.list_url, {'count': 'true'})
+        self.assertEqual(response.json()['count'], 5)
+        
+        baker.make(Lead)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {'count': 'true'})
+        self.assertEqual(response.json()['count'], 5)
+    
+    def test_estimated_count_follows_filters(self):
+        """Test that the count covers only the filtered leads."""
+        baker.make(Lead, name='Zebediah Quill', message='Needs a quote')
+        
+        response = self.client.get(self.list_url, {'count': 'true', 'q': 'zebediah'})
+        self.assertEqual(response.json()['count'], 1)
+        
+        response = self.client.get(self.list_url, {'count': 'true', 'archived': 'true'})
+        self.assertEqual(response.json()['count'], 0)
+
+
 class LeadSerializerTest(TestCase):
     """Test lead serializers."""
     
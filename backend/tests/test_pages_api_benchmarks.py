@@ -0,0 +1,155 @@
+"""Latency and query-count benchmarks for blog responses of the pages API.
+
+The dedicated blog listing is measured against Wagtail's generic listing
+for 5, 10 and 20 posts requested with their images, and the blog index
+detail for the same numbers of posts. The tests fail when the blog listing
+issues more queries than the generic path or when the query count of either
+grows with the number of posts; latencies are reported with
+``BENCHMARK_REPORT=1 pytest -s``.
+"""
+import time
+from unittest import mock
+
+from benchmarks import BenchmarkMixin
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from media import TemporaryMediaMixin
+from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.images.models import Filter, Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from pages.api import CustomPagesAPIViewSet
+from pages.models import BlogIndexPage, BlogPage
+
+SIZES = (5, 10, 20)
+REQUESTS = 5
+PARAMS = {
+    'type': 'pages.BlogPage',
+    'fields': (
+        'date,intro,featured_image,og_image,'
+        'featured_image_renditions,og_image_renditions'
+    ),
+    'limit': 20,
+}
+
+
+@override_settings(PAGES_API_CACHE_TIMEOUT=0)
+class BlogBenchmarkTestCase(BenchmarkMixin, TemporaryMediaMixin, TestCase):
+    """Blog index with posts and images, reporting measurements at the end."""
+
+    report_columns = (
+        ('path', '<10', ''),
+        ('posts', '>7', ''),
+        ('ms', '>10', '.2f'),
+        ('queries', '>10', ''),
+    )
+
+    def setUp(self):
+        """Set up a blog index with images to attach to posts."""
+        root = Site.objects.get(is_default_site=True).root_page
+        self.blog_index = root.add_child(instance=BlogIndexPage(title='Blog', slug='blog'))
+        self.images = [
+            Image.objects.create(title=f'Image {index}', file=get_test_image_file())
+            for index in range(2)
+        ]
+        self.posts = 0
+
+    def add_posts(self, count):
+        """Add blog posts up to ``count``, each with both images."""
+        while self.posts < count:
+            self.posts += 1
+            self.blog_index.add_child(instance=BlogPage(
+                title=f'Post {self.posts}',
+                slug=f'post-{self.posts}',
+                intro='Benchmark post',
+                content=[('text', {'content': '<p>Body</p>'})],
+                featured_image=self.images[0],
+                og_image=self.images[1],
+            ))
+
+    def measure(self, path, size, url, params=None):
+        """Request ``url`` and return the response and its query count."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            responses = [self.client.get(url, params) for _ in range(REQUESTS)]
+            elapsed = (time.perf_counter() - start) / REQUESTS
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+
+        count = len(queries) // REQUESTS
+        self.record(path, size, elapsed * 1000, count)
+        return response, count
+
+
+class BlogListingBenchmarkTest(BlogBenchmarkTestCase):
+    """Benchmark the blog listing against the generic listing path."""
+
+    def measure_listing(self, path, size):
+        """Request the blog listing and return its query count."""
+        response, count = self.measure(path, size, reverse('wagtailapi:pages:listing'), PARAMS)
+        self.assertEqual(len(response.json()['items']), size)
+        return count
+
+    def test_blog_listing_queries(self):
+        """Benchmark both paths and check the query counts."""
+        blog_counts = []
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.add_posts(size)
+                blog = self.measure_listing('blog', size)
+                with mock.patch.object(
+                    CustomPagesAPIViewSet, 'listing_view', PagesAPIViewSet.listing_view
+                ):
+                    generic = self.measure_listing('generic', size)
+                self.assertLess(blog, generic)
+                blog_counts.append(blog)
+        self.assertEqual(len(set(blog_counts)), 1, blog_counts)
+
+    def test_blog_listing_order_and_images(self):
+        """Test that posts come newest first with their images."""
+        self.add_posts(3)
+
+        response = self.client.get(reverse('wagtailapi:pages:listing'), PARAMS)
+
+        items = response.json()['items']
+        self.assertEqual([item['title'] for item in items], ['Post 3', 'Post 2', 'Post 1'])
+        self.assertEqual(items[0]['featured_image']['id'], self.images[0].pk)
+        self.assertEqual(items[0]['og_image']['id'], self.images[1].pk)
+
+
+class BlogIndexDetailBenchmarkTest(BlogBenchmarkTestCase):
+    """Benchmark the blog index detail with its latest posts."""
+
+    def test_blog_index_detail_queries(self):
+        """Test that the query count does not grow with the number of posts."""
+        url = reverse('wagtailapi:pages:detail', args=[self.blog_index.pk])
+        counts = []
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.add_posts(size)
+                response, count = self.measure('detail', size, url)
+                self.assertEqual(len(response.json()['blog_posts']), min(size, 10))
+                counts.append(count)
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    @override_settings(PAGES_BLOG_POST_IMAGE_FILTER='fill-80x60')
+    def test_featured_images_from_existing_renditions(self):
+        """Test that precomputed renditions are used and none are generated."""
+        self.add_posts(1)
+        rendition_model = Image.get_rendition_model()
+        url = reverse('wagtailapi:pages:detail', args=[self.blog_index.pk])
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.json()['blog_posts'][0]['featured_image'], self.images[0].file.url
+        )
+        self.assertFalse(rendition_model.objects.exists())
+
+        rendition = self.images[0].get_rendition(Filter('fill-80x60'))
+        response = self.client.get(url)
+
+        self.assertEqual(response.json()['blog_posts'][0]['featured_image'], rendition.url)
@@ -0,0 +1,156 @@
+"""Tests for the publish-aware pages API response cache."""
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from pages.models import BlogIndexPage, BlogPage, StandardPage
+
+
+class PagesAPICacheTest(TestCase):
+    """Test caching and invalidation of pages API responses."""
+
+    def setUp(self):
+        """Set up a small published page tree."""
+        cache.clear()
+        self.root = Site.objects.get(is_default_site=True).root_page
+        self.blog_index = self.root.add_child(
+            instance=BlogIndexPage(title='Blog', slug='blog')
+        )
+        self.post = self.blog_index.add_child(instance=BlogPage(
+            title='First Post',
+            slug='first-post',
+            intro='Cached post',
+            content=[('text', {'content': '<p>Body</p>'})],
+        ))
+        self.about = self.root.add_child(instance=StandardPage(title='About', slug='about'))
+        self.listing_url = reverse('wagtailapi:pages:listing')
+        self.detail_url = reverse('wagtailapi:pages:detail', args=[self.post.pk])
+
+    def titles(self, params=None):
+        response = self.client.get(self.listing_url, params)
+        return [item['title'] for item in response.json()['items']]
+
+    def test_hits_served_without_queries(self):
+        """Test that repeated requests do not touch the database."""
+        first = self.client.get(self.detail_url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+
+    def test_query_parameter_order_ignored(self):
+        """Test that reordered query parameters share one cache entry."""
+        self.client.get(self.listing_url, {'type': 'pages.BlogPage', 'fields': 'intro'})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f'{self.listing_url}?fields=intro&type=pages.BlogPage'
+            )
+        self.assertEqual(response.json()['items'][0]['intro'], 'Cached post')
+
+    def test_different_queries_cached_separately(self):
+        """Test that each query string gets its own response."""
+        self.assertIn('About', self.titles())
+        self.assertEqual(self.titles({'type': 'pages.BlogPage'}), ['First Post'])
+
+    def test_publish_invalidates(self):
+        """Test that publishing a page changes the cached responses."""
+        self.assertIn('First Post', self.titles())
+
+        self.post.title = 'Edited Post'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save_revision().publish()
+
+        self.assertIn('Edited Post', self.titles())
+        self.assertEqual(self.client.get(self.detail_url).json()['title'], 'Edited Post')
+
+    def test_unpublish_invalidates(self):
+        """Test that unpublished pages drop out of cached responses."""
+        self.assertEqual(self.client.get(self.detail_url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.unpublish()
+
+        self.assertEqual(self.client.get(self.detail_url).status_code, 404)
+        self.assertNotIn('First Post', self.titles())
+
+    def test_move_invalidates(self):
+        """Test that moving a page changes its cached parent."""
+        url = reverse('wagtailapi:pages:detail', args=[self.about.pk])
+        self.assertEqual(self.client.get(url).json()['meta']['parent']['id'], self.root.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about.move(self.blog_index, pos='last-child')
+
+        self.assertEqual(
+            self.client.get(url).json()['meta']['parent']['id'], self.blog_index.pk
+        )
+
+    def test_delete_invalidates(self):
+        """Test that deleted pages drop out of cached responses."""
+        self.assertIn('About', self.titles())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about.delete()
+
+        self.assertNotIn('About', self.titles())
+
+    def test_image_changes_invalidate(self):
+        """Test that replacing or deleting an embedded image changes cached responses."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with self.settings(MEDIA_ROOT=media_root):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = Image.objects.create(title='Cover', file=get_test_image_file())
+                self.post.featured_image = image
+                self.post.save_revision().publish()
+            first = self.client.get(self.detail_url).json()['featured_image_renditions']
+
+            image.file = get_test_image_file(filename='replaced.png')
+            with self.captureOnCommitCallbacks(execute=True):
+                image.save()
+            second = self.client.get(self.detail_url).json()['featured_image_renditions']
+            self.assertNotEqual(second['src'], first['src'])
+            self.assertIn('replaced', second['src'])
+
+            with self.captureOnCommitCallbacks(execute=True):
+                image.delete()
+            self.assertIsNone(self.client.get(self.detail_url).json()['featured_image'])
+
+    def test_errors_not_cached(self):
+        """Test that failed requests are not stored."""
+        url = reverse('wagtailapi:pages:detail', args=[self.post.pk + 100])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertTrue(queries)
+
+    def test_session_requests_bypass_cache(self):
+        """Test that requests with a session are always answered fresh."""
+        self.client.get(self.detail_url)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'session'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.detail_url)
+        self.assertTrue(queries)
+
+    @override_settings(PAGES_API_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        """Test that a zero timeout disables the cache."""
+        self.titles()
+
+        self.post.title = 'Edited Post'
+        self.post.save()
+
+        self.assertIn('Edited Post', self.titles())
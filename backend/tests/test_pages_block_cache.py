@@ -0,0 +1,156 @@
+"""Tests for the StreamField block serialization cache."""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from media import TemporaryMediaMixin
+from wagtail import blocks
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from core.renditions import generate_pending
+from pages.block_cache import (
+    local_cache,
+    schema_version,
+    stream_api_representation,
+)
+from pages.blocks import ImageBlock, TextBlock
+from pages.models import StandardPage
+
+
+@override_settings(
+    IMAGE_RENDITION_WIDTHS=[40],
+    IMAGE_RENDITION_FORMATS=['webp'],
+    IMAGE_RENDITION_EXTRA_FILTERS=[],
+    PAGES_API_CACHE_TIMEOUT=0,
+)
+class BlockCacheTest(TemporaryMediaMixin, TestCase):
+    """Test memoizing the API representation of StreamField blocks."""
+
+    def setUp(self):
+        """Set up two pages sharing a block."""
+        cache.clear()
+        local_cache.clear()
+        self.root = Site.objects.get(is_default_site=True).root_page
+        self.about = self.make_page('About', [
+            ('text', {'content': '<p>Shared</p>'}),
+            ('text', {'content': '<p>About</p>'}),
+        ])
+        self.contact = self.make_page('Contact', [
+            ('text', {'content': '<p>Shared</p>'}),
+        ])
+
+    def make_page(self, title, content):
+        return self.root.add_child(instance=StandardPage(
+            title=title, slug=title.lower(), content=content,
+        ))
+
+    def spy(self, block_class):
+        return mock.patch.object(
+            block_class,
+            'get_api_representation',
+            autospec=True,
+            side_effect=block_class.get_api_representation,
+        )
+
+    def test_matches_stream_block(self):
+        """Test that the output matches Wagtail's own serialization."""
+        content = self.about.content
+
+        self.assertEqual(
+            stream_api_representation(content),
+            content.stream_block.get_api_representation(content),
+        )
+
+    def test_hits_not_serialized_again(self):
+        """Test that unchanged blocks are serialized once."""
+        with self.spy(TextBlock) as spy:
+            first = stream_api_representation(self.about.content)
+            second = stream_api_representation(StandardPage.objects.get(pk=self.about.pk).content)
+
+        self.assertEqual(spy.call_count, 2)
+        self.assertEqual(second, first)
+
+    def test_blocks_shared_across_pages(self):
+        """Test that a block reused on another page comes from the cache."""
+        stream_api_representation(self.about.content)
+
+        with self.spy(TextBlock) as spy:
+            data = stream_api_representation(self.contact.content)
+
+        spy.assert_not_called()
+        self.assertEqual(data[0]['value'], {'content': '<p>Shared</p>'})
+        self.assertEqual(data[0]['id'], self.contact.content.raw_data[0]['id'])
+
+    def test_changed_blocks_serialized(self):
+        """Test that only edited blocks of a new revision are serialized."""
+        stream_api_representation(self.about.content)
+        self.about.content = [
+            ('text', {'content': '<p>Shared</p>'}),
+            ('text', {'content': '<p>Edited</p>'}),
+        ]
+        self.about.save_revision().publish()
+
+        with self.spy(TextBlock) as spy:
+            data = stream_api_representation(StandardPage.objects.get(pk=self.about.pk).content)
+
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(data[1]['value'], {'content': '<p>Edited</p>'})
+
+    def test_local_cache_bounded(self):
+        """Test that evicted blocks are read back from the shared cache."""
+        with self.settings(PAGES_BLOCK_CACHE_SIZE=1):
+            stream_api_representation(self.about.content)
+            self.assertEqual(len(local_cache), 1)
+
+            with self.spy(TextBlock) as spy:
+                stream_api_representation(self.about.content)
+
+        spy.assert_not_called()
+        self.assertEqual(len(local_cache), 1)
+
+    def test_schema_version(self):
+        """Test that different block definitions get different versions."""
+        short, same, long = (
+            blocks.CharBlock(max_length=10),
+            blocks.CharBlock(max_length=10),
+            blocks.CharBlock(max_length=20),
+        )
+        for block in (short, same, long):
+            block.set_name('title')
+
+        self.assertEqual(schema_version(short), schema_version(same))
+        self.assertNotEqual(schema_version(short), schema_version(long))
+
+    def test_renditions_invalidate(self):
+        """Test that generating renditions refreshes image blocks."""
+        with self.captureOnCommitCallbacks(execute=True):
+            image = Image.objects.create(title='Image', file=get_test_image_file())
+        page = self.make_page('Gallery', [('image', {'image': image, 'caption': ''})])
+
+        data = stream_api_representation(page.content)
+        self.assertEqual(data[0]['value']['renditions']['srcset'], {})
+
+        with self.spy(ImageBlock) as spy:
+            stream_api_representation(page.content)
+            spy.assert_not_called()
+
+            generate_pending()
+            data = stream_api_representation(page.content)
+
+        spy.assert_called_once()
+        self.assertIn('webp', data[0]['value']['renditions']['srcset'])
+
+    def test_api_uses_cache(self):
+        """Test that the pages API serializes StreamFields through the cache."""
+        url = reverse('wagtailapi:pages:detail', args=[self.about.pk])
+
+        with self.spy(TextBlock) as spy:
+            first = self.client.get(url).json()
+            second = self.client.get(url).json()
+
+        self.assertEqual(spy.call_count, 2)
+        self.assertEqual(second['content'], first['content'])
+        self.assertEqual(first['content'][1]['value'], {'content': '<p>About</p>'})